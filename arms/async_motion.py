@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Asyncio Interface for SO-101 Robot Arms
+Wraps SmoothMotion so one event loop can drive both arms alongside camera
+and voice tasks, without a thread per motion.
+
+Usage:
+    left, right = AsyncSmoothMotion(left_port), AsyncSmoothMotion(right_port)
+    await asyncio.gather(left.connect(), right.connect())
+    await asyncio.gather(left.smooth_move(target), right.smooth_move(target))
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
+
+from motion import (
+    CONTROL_RATE_HZ, DEFAULT_SPEED, MOVE_TIMEOUT, SETTLE_POLL_INTERVAL,
+    SETTLE_TOLERANCE, UNITS_RAW, ArmState, SmoothMotion, joints_settled,
+)
+from scheduler import DeadlineScheduler, TickStats
+from trajectory import Trajectory
+
+# What to leave the arm doing when a motion is cancelled
+ON_CANCEL_HOLD = "hold"        # Torque on, goal = present position
+ON_CANCEL_RELEASE = "release"  # Torque off
+
+class AsyncSmoothMotion:
+    """
+    Awaitable SmoothMotion.
+
+    All bus I/O runs on a single dedicated worker thread per arm, so calls
+    stay serialized on the port while the event loop is free. Waits
+    (tick deadlines, settle polling) are asyncio sleeps.
+
+    Cancelling a motion task stops the trajectory at the next tick and
+    leaves the arm in the on_cancel state: "hold" keeps torque on with the
+    goal set to the present position, "release" disables torque.
+    """
+
+    def __init__(self, port: str, baudrate: int = 1000000, on_cancel: str = ON_CANCEL_HOLD, **kwargs):
+        if on_cancel not in (ON_CANCEL_HOLD, ON_CANCEL_RELEASE):
+            raise ValueError(f"Unknown on_cancel: {on_cancel}")
+        self.arm = SmoothMotion(port, baudrate, **kwargs)
+        self.on_cancel = on_cancel
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"bus-{self.arm.port}")
+
+    async def _run(self, fn, *args, **kwargs):
+        """Run a blocking SmoothMotion call on this arm's bus thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+
+    async def connect(self) -> bool:
+        # disconnect() shuts the bus thread down; a reconnect needs a new one
+        if self._executor is None:
+            self._executor = self._new_executor()
+        return await self._run(self.arm.connect)
+
+    async def disconnect(self):
+        await self._run(self.arm.disconnect)
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    async def read_state(self) -> ArmState:
+        """Latest telemetry sample if running (no bus access), else a bus read"""
+        if self.arm.telemetry is not None and self.arm.telemetry.running:
+            return self.arm.read_state()
+        return await self._run(self.arm.read_bus_state)
+
+    async def set_torque(self, enable: bool, joints: List[str] = None):
+        await self._run(self.arm.set_torque, enable, joints)
+
+    async def move_joints(self, positions: Dict[str, int], speed: int = 300, units: Optional[str] = None):
+        await self._run(self.arm.move_joints, positions, speed, units)
+
+    async def move_to(
+        self,
+        positions: Dict[str, int],
+        speed: int = None,
+        timeout: float = MOVE_TIMEOUT,
+        tolerance: int = SETTLE_TOLERANCE,
+        units: Optional[str] = None,
+    ) -> float:
+        """
+        Move with the servos' native motion control and await completion.
+
+        Returns:
+            Seconds from command to settled
+        """
+        speed = speed if speed is not None else DEFAULT_SPEED
+        positions = self.arm.to_raw(positions, units)
+        await self._run(self.arm.move_joints, positions, speed, UNITS_RAW)
+
+        goals = self.arm.settle_goals(positions)
+        stopped_polls = {j: 0 for j in goals}
+        start = time.perf_counter()
+        try:
+            while True:
+                status = await self._run(self.arm.read_motion_status, list(goals))
+                elapsed = time.perf_counter() - start
+                if joints_settled(goals, status, stopped_polls, tolerance):
+                    return elapsed
+                if elapsed >= timeout:
+                    print(f"move_to: not settled after {timeout:.1f}s")
+                    return elapsed
+                await asyncio.sleep(SETTLE_POLL_INTERVAL)
+        except asyncio.CancelledError:
+            await self._stop_motion()
+            raise
+
+    async def execute_trajectory(
+        self,
+        trajectory: Union[Trajectory, List[Dict[str, int]]],
+        dt: Optional[float] = None,
+        speed: int = 0,
+        units: Optional[str] = None,
+    ) -> TickStats:
+        """Stream a trajectory on absolute deadlines; see SmoothMotion.execute_trajectory"""
+        await self._run(self.arm.set_torque, True)
+        # Validation (and a possible rest-pose read) stays off the event loop
+        dt, tick = await self._run(self.arm.trajectory_ticks, trajectory, dt, speed, units=units)
+
+        async def async_tick(i):
+            await self._run(tick, i)
+
+        try:
+            stats = await DeadlineScheduler(dt).run_async(len(trajectory), async_tick)
+        except asyncio.CancelledError:
+            await self._stop_motion()
+            raise
+        self.arm.last_tick_stats = stats
+        return stats
+
+    async def smooth_move(
+        self,
+        target: Dict[str, int],
+        duration: float = 1.0,
+        profile: str = "cubic",
+        rate: float = CONTROL_RATE_HZ,
+        units: Optional[str] = None,
+    ) -> TickStats:
+        """Plan from the current state and stream; see SmoothMotion.smooth_move"""
+        current = await self.read_state()
+        target = self.arm.to_raw(target, units)
+        # Planning can run IK (profile="cartesian"); keep it off the event loop
+        trajectory = await self._run(self.arm.plan_move, current.positions, target, duration, profile, rate)
+        return await self.execute_trajectory(trajectory, speed=0, units=UNITS_RAW)
+
+    async def _stop_motion(self):
+        """Put the arm in the on_cancel state; shielded so it always completes"""
+        if self.on_cancel == ON_CANCEL_RELEASE:
+            stop = lambda: self.arm.set_torque(False)
+        else:
+            stop = lambda: self.arm.write_goals(self.arm.read_bus_state().positions)
+        await asyncio.shield(self._run(stop))
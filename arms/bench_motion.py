@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Motion-Layer Benchmarks for SO-101 Arms
+---------------------------------------
+Measures the control path in motion.py:
+  - Trajectory generation throughput per profile
+  - Bus calls per second for read_state and move_joints (plus packets
+    per second on the simulated bus, which counts them)
+  - Achieved control-loop rate and jitter
+  - Dual-arm skew
+
+Runs on the simulated bus (sim_bus.py) by default, or on the real arms.
+Results are written as JSON so runs can be compared across changes.
+
+Usage:
+    python3 bench_motion.py                         # Simulated bus -> bench_motion.json next to this script
+    python3 bench_motion.py --latency=0.002         # Slower simulated USB turnaround
+    python3 bench_motion.py --hardware              # Real arms (they WILL move a little)
+    python3 bench_motion.py --output=after.json --compare=before.json
+    python3 bench_motion.py --quick                 # Fewer iterations
+"""
+
+import sys
+import os
+import json
+import time
+import platform
+import subprocess
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Small offsets from the present pose, so hardware runs stay safe
+BENCH_OFFSETS = {"shoulder_pan": 150, "elbow_flex": -120, "wrist_flex": 100, "gripper": 80}
+LOOP_RATES_HZ = [50, 100, 200]
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_motion.json")
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Mean/p50/p99/max of a list of seconds, in microseconds"""
+    from scheduler import percentile_us
+
+    if not samples:
+        return {"mean_us": 0.0, "p50_us": 0.0, "p99_us": 0.0, "max_us": 0.0}
+    return {
+        "mean_us": sum(samples) / len(samples) * 1e6,
+        "p50_us": percentile_us(samples, 50),
+        "p99_us": percentile_us(samples, 99),
+        "max_us": max(samples) * 1e6,
+    }
+
+def time_calls(fn: Callable[[int], None], count: int, packets: Optional[Callable[[], int]] = None) -> Dict[str, float]:
+    """
+    Call fn(i) count times back to back; per-call latency and calls/s.
+
+    packets, if given, reads a bus packet counter, adding packets per
+    call and packets/s (one Python call can be one packet or many).
+    """
+    latencies = []
+    sent = packets() if packets else 0
+    start = time.perf_counter()
+    for i in range(count):
+        t = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - start
+    result = {"calls": count, "calls_per_s": count / elapsed, **percentiles(latencies)}
+    if packets:
+        sent = packets() - sent
+        result.update({"packets_per_call": sent / count, "packets_per_s": sent / elapsed})
+    return result
+
+def packet_counter(arm) -> Optional[Callable[[], int]]:
+    """Packets sent on the arm's bus so far, if it is simulated (hardware has no counter)"""
+    import scservo_sdk
+
+    if not hasattr(scservo_sdk, "get_bus"):
+        return None
+    bus = scservo_sdk.get_bus(arm.port)
+    return lambda: bus.packets
+
+def tick_stats_dict(stats) -> Dict[str, float]:
+    result = {
+        "target_hz": 1.0 / stats.period,
+        "achieved_hz": stats.achieved_hz,
+        "ticks": stats.ticks,
+        "jitter_mean_us": stats.mean_jitter_us,
+        "jitter_p99_us": stats.percentile_jitter_us(99),
+        "jitter_max_us": stats.max_jitter_us,
+        "overruns": stats.overruns,
+        "skipped": stats.skipped,
+    }
+    if hasattr(stats, "skew"):
+        from scheduler import percentile_us
+        result.update({
+            "skew_basis": stats.skew_basis,
+            "skew_mean_us": stats.mean_skew_us,
+            "skew_p99_us": percentile_us([abs(s) for s in stats.skew], 99),
+            "skew_max_us": stats.max_skew_us,
+        })
+    return result
+
+def offset_pose(pose: Dict[str, int], sign: int = 1) -> Dict[str, int]:
+    return {j: pose[j] + sign * BENCH_OFFSETS.get(j, 0) for j in pose}
+
+# ==================== BENCHMARKS ====================
+
+def bench_trajectory_generation(arm, start: Dict[str, int], iterations: int) -> Dict:
+    """Plans per second and waypoints per second for each profile"""
+    from motion import JOINTS
+    from planner import plan_spline
+
+    target = offset_pose(start)
+    results = {}
+    for profile in ("linear", "cubic", "trapezoidal", "optimal"):
+        points = len(arm.plan_move(start, target, 2.0, profile))
+        timing = time_calls(lambda _i: arm.plan_move(start, target, 2.0, profile), iterations)
+        results[profile] = {"waypoints": points, "waypoints_per_s": timing["calls_per_s"] * points, **timing}
+
+    poses = [start, target, offset_pose(start, -1), start]
+    points = len(plan_spline(poses, 0.02, JOINTS, arm.motion_limits))
+    timing = time_calls(lambda _i: plan_spline(poses, 0.02, JOINTS, arm.motion_limits), iterations)
+    results["spline"] = {"waypoints": points, "waypoints_per_s": timing["calls_per_s"] * points, **timing}
+    return results
+
+def bench_bus(arm, start: Dict[str, int], iterations: int) -> Dict:
+    """Back-to-back bus calls: state reads (sync and per-joint) and goal writes"""
+    packets = packet_counter(arm)
+    results = {"read_state_sync": time_calls(lambda _i: arm.read_bus_state(), iterations, packets)}
+
+    arm.use_sync_read = False
+    results["read_state_per_joint"] = time_calls(lambda _i: arm.read_bus_state(), max(iterations // 4, 1), packets)
+    arm.use_sync_read = True
+
+    # Alternate by one unit so the register cache can't skip the writes
+    poses = [start, {j: p + 1 for j, p in start.items()}]
+    results["move_joints_sync"] = time_calls(lambda i: arm.move_joints(poses[i % 2], speed=0), iterations, packets)
+
+    arm.use_sync_write = False
+    results["move_joints_per_joint"] = time_calls(
+        lambda i: arm.move_joints(poses[i % 2], speed=0), max(iterations // 4, 1), packets
+    )
+    arm.use_sync_write = True
+    arm.move_joints(start, speed=0)
+    return results
+
+def bench_control_loop(arm, start: Dict[str, int], duration: float) -> Dict:
+    """execute_trajectory out and back at each loop rate"""
+    target = offset_pose(start)
+    results = {}
+    for rate in LOOP_RATES_HZ:
+        out = arm.plan_move(start, target, duration, "cubic", rate)
+        back = arm.plan_move(target, start, duration, "cubic", rate)
+        t = time.perf_counter()
+        stats = arm.execute_trajectory(out)
+        results[f"{rate}hz"] = tick_stats_dict(stats)
+        results[f"{rate}hz"]["waypoints_per_s"] = len(out) / (time.perf_counter() - t)
+        arm.execute_trajectory(back)
+    return results
+
+def bench_dual_arm(dual, duration: float) -> Dict:
+    """mirror_move skew, serial writes vs one thread per arm"""
+    start = dual.leader.read_state().positions
+    results = {}
+    for parallel in (False, True):
+        name = "parallel" if parallel else "serial"
+        results[name] = tick_stats_dict(dual.mirror_move(offset_pose(start), duration, parallel=parallel))
+        dual.mirror_move(start, duration, parallel=parallel)
+    return results
+
+# ==================== REPORTING ====================
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+def flatten(results: Dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+def compare(current: Dict, previous_path: str):
+    """Print metrics that moved more than 10% against a previous run"""
+    with open(previous_path) as f:
+        previous = flatten(json.load(f)["results"])
+    print(f"\n📈 Changes vs {previous_path} (>10%):")
+    changed = 0
+    for name, value in flatten(current).items():
+        old = previous.get(name)
+        if not old or name.endswith(("calls", "ticks", "waypoints")):
+            continue
+        delta = (value - old) / abs(old) * 100
+        if abs(delta) > 10:
+            print(f"   {name}: {old:.1f} -> {value:.1f} ({delta:+.0f}%)")
+            changed += 1
+    if not changed:
+        print("   No significant changes")
+
+def main():
+    hardware = False
+    quick = False
+    output = DEFAULT_OUTPUT
+    previous = None
+    sim_options = {}
+    for arg in sys.argv[1:]:
+        if arg == "--hardware":
+            hardware = True
+        elif arg == "--quick":
+            quick = True
+        elif arg.startswith("--output="):
+            output = arg.split("=", 1)[1]
+        elif arg.startswith("--compare="):
+            previous = arg.split("=", 1)[1]
+        elif arg.startswith("--latency="):
+            sim_options["latency"] = float(arg.split("=")[1])
+        elif arg in ("-h", "--help"):
+            print(__doc__)
+            return
+
+    # The simulator has to replace scservo_sdk before motion imports it
+    if not hardware:
+        import sim_bus
+        sim_bus.install(**sim_options)
+
+    from careful_grab import ARM_PORTS
+    from motion import SmoothMotion, DualArmController
+
+    iterations = 50 if quick else 500
+    duration = 0.5 if quick else 2.0
+
+    # One handle per serial device: the single-arm benchmarks use the follower
+    dual = DualArmController(ARM_PORTS["leader"], ARM_PORTS["follower"])
+    if not dual.connect():
+        print("❌ Failed to connect to both arms")
+        return
+    arm = dual.follower
+
+    print(f"⏱️  Benchmarking on {'HARDWARE' if hardware else 'simulated bus'}...")
+    arm.set_torque(True)
+    start = arm.read_bus_state().positions
+
+    results = {}
+    print("   trajectory generation")
+    results["trajectory_generation"] = bench_trajectory_generation(arm, start, iterations)
+    print("   bus calls")
+    results["bus"] = bench_bus(arm, start, iterations)
+    print("   control loop")
+    results["control_loop"] = bench_control_loop(arm, start, duration)
+    print("   dual arm")
+    dual.leader.set_torque(True)
+    results["dual_arm"] = bench_dual_arm(dual, duration)
+
+    dual.disconnect()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "bus": "hardware" if hardware else "simulated",
+        "sim_options": sim_options,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    gen = results["trajectory_generation"]
+    print(f"\n📊 Results ({output}):")
+    for profile, r in gen.items():
+        print(f"   plan {profile:12s} {r['calls_per_s']:8.0f} plans/s  {r['waypoints_per_s']:10.0f} waypoints/s")
+    for name, r in results["bus"].items():
+        packets = f"  {r['packets_per_s']:8.0f} packets/s" if "packets_per_s" in r else ""
+        print(f"   {name:24s} {r['calls_per_s']:8.0f} calls/s{packets}  p99 {r['p99_us']:.0f}us")
+    for name, r in results["control_loop"].items():
+        print(f"   loop {name:8s} {r['achieved_hz']:6.1f} Hz  jitter p99 {r['jitter_p99_us']:.0f}us  {r['overruns']} overruns")
+    for name, r in results["dual_arm"].items():
+        print(f"   dual {name:8s} skew mean {r['skew_mean_us']:.0f}us  p99 {r['skew_p99_us']:.0f}us")
+
+    if previous:
+        compare(results, previous)
+
+if __name__ == "__main__":
+    main()
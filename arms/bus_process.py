@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Per-Bus Worker Processes for SO-101 Robot Arms
+Runs each arm's bus loop in its own process, so camera, speech or other
+CPU work in the main interpreter can't stall servo writes through the GIL.
+
+The worker owns the serial port. Commanded setpoints flow parent -> worker
+and sampled states flow worker -> parent through shared-memory rings; the
+parent keeps the SmoothMotion API as a thin proxy.
+
+Usage:
+    arm = ProcessSmoothMotion("/dev/cu.usbmodem5AAF2638141")
+    arm.connect()                    # Spawns the worker
+    arm.smooth_move({"shoulder_pan": 2600}, duration=1.0)
+    arm.read_state()                 # Latest worker sample, no IPC round trip
+    arm.disconnect()
+
+    dual = DualArmController(leader_port, follower_port, processes=True)
+"""
+
+import multiprocessing
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from motion import JOINTS, ArmState, SmoothMotion
+from scheduler import SPIN_MARGIN, TickStats
+from state import ROW_LOAD, ROW_POSITION, ROW_VELOCITY, StateWindow
+from telemetry import TELEMETRY_CAPACITY, TELEMETRY_RATE_HZ
+from trajectory import Trajectory
+
+# Setpoints queued ahead of the worker (~10 s at 100 Hz)
+SETPOINT_CAPACITY = 1024
+
+# Longest the worker sleeps before checking the setpoint ring again (seconds)
+WORKER_POLL_INTERVAL = 0.0005
+
+# First streamed waypoint is due this far after streaming starts, so the
+# worker sees it before its deadline (seconds)
+STREAM_LEAD = 0.02
+
+# How long connect() waits for the worker to come up (seconds)
+WORKER_START_TIMEOUT = 10.0
+
+# Slack past a streamed trajectory's last deadline before giving up on it (seconds)
+STREAM_TIMEOUT_MARGIN = 1.0
+
+# Row layouts (float64): missing joints are NaN
+_N = len(JOINTS)
+STATE_ROW = 4 + 3 * _N      # timestamp, transactions, read_us, spare, then ArmState.data
+SETPOINT_ROW = 2 + _N       # deadline, speed, positions
+
+class SharedRing:
+    """
+    Fixed-size ring of float64 rows in shared memory.
+
+    Single writer, single reader per ring, no locks. Each slot carries the
+    sequence number it was written for, stored after the row itself, so a
+    reader can tell a completed slot from one being overwritten. The header
+    holds the write count, the reader's cursor and a spare counter.
+    """
+
+    HEADER = 3  # write count, read cursor, spare (int64)
+
+    def __init__(self, width: int, capacity: int, name: Optional[str] = None):
+        self.width = width
+        self.capacity = capacity
+        size = 8 * (self.HEADER + capacity * (width + 1))
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.header = np.ndarray((self.HEADER,), dtype=np.int64, buffer=self.shm.buf)
+        self.slots = np.ndarray(
+            (capacity, width + 1), dtype=np.float64, buffer=self.shm.buf, offset=8 * self.HEADER
+        )
+        if self.owner:
+            self.header[:] = 0
+            self.slots[:, 0] = -1
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def count(self) -> int:
+        return int(self.header[0])
+
+    def append(self, row: Sequence[float]):
+        seq = int(self.header[0])
+        slot = self.slots[seq % self.capacity]
+        slot[0] = -1
+        slot[1:] = row
+        slot[0] = seq
+        self.header[0] = seq + 1
+
+    def get(self, seq: int) -> Optional[np.ndarray]:
+        """Copy of row seq, or None if it was overwritten or isn't written yet"""
+        slot = self.slots[seq % self.capacity]
+        row = slot[1:].copy()
+        return row if slot[0] == seq else None
+
+    def last(self, n: int) -> np.ndarray:
+        """Up to n most recent rows, oldest first"""
+        count = self.count
+        n = min(n, count, self.capacity)
+        rows = [self.get(seq) for seq in range(count - n, count)]
+        rows = [row for row in rows if row is not None]
+        return np.array(rows).reshape(len(rows), self.width)
+
+    def close(self):
+        # Drop the numpy views before the buffer they point into
+        self.header = self.slots = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def _state_row(state: ArmState) -> np.ndarray:
+    row = np.empty(STATE_ROW)
+    row[:4] = state.timestamp, state.transactions, state.read_us, 0.0
+    values = np.where(state.valid, state.data, np.nan)
+    row[4:] = values.ravel()
+    return row
+
+def _row_state(row: np.ndarray) -> ArmState:
+    state = ArmState(timestamp=float(row[0]), transactions=int(row[1]), read_us=float(row[2]))
+    values = row[4:].reshape(3, _N)
+    state.valid = ~np.isnan(values)
+    state.data = np.where(state.valid, values, 0).astype(np.int16)
+    return state
+
+def _simulator_options() -> Optional[Dict]:
+    """Simulated-bus settings to replay in the worker, if sim_bus is installed"""
+    sdk = sys.modules.get("scservo_sdk")
+    if getattr(sdk, "__name__", None) == "sim_bus":
+        return sdk.bus_defaults()
+    return None
+
+# ==================== WORKER ====================
+
+class _BusWorker:
+    """The loop running in the worker process (owns the SmoothMotion)"""
+
+    def __init__(self, arm: SmoothMotion, conn, states: SharedRing, setpoints: SharedRing, rate: float):
+        self.arm = arm
+        self.conn = conn
+        self.states = states
+        self.setpoints = setpoints
+        self.period = 1.0 / rate
+        self.stream: Optional[TickStats] = None
+        self._stream_start = 0.0
+        self._read_time = 0.0  # Duration of the last state read
+        self._running = True
+        self.grip = None  # motion.GripSession in progress, ticked by run()
+        self._grip_deadline = 0.0
+
+    def run(self):
+        next_sample = time.monotonic()
+        while self._running:
+            now = time.monotonic()
+            self._write_due_setpoint(now)
+            self._step_grip(now)
+
+            # A sample must not hold the bus when a setpoint or grip tick falls due
+            deadline = self._next_deadline()
+            if self.grip is not None:
+                deadline = self._grip_deadline if deadline is None else min(deadline, self._grip_deadline)
+            clear = deadline is None or deadline - now > self._read_time
+            if self.arm.connected and now >= next_sample and clear:
+                try:
+                    started = time.monotonic()
+                    self.states.append(_state_row(self.arm.read_bus_state()))
+                    self._read_time = time.monotonic() - started
+                except Exception:
+                    pass
+                next_sample += self.period
+                if next_sample < now:
+                    next_sample = now + self.period
+
+            wake = min(next_sample, time.monotonic() + WORKER_POLL_INTERVAL)
+            if deadline is not None:
+                wake = min(wake, deadline)
+            # Sleep in poll() so RPCs wake us; spin the last stretch
+            timeout = wake - time.monotonic() - SPIN_MARGIN
+            if self.conn.poll(max(timeout, 0.0)):
+                self._handle_call()
+
+    def _next_deadline(self) -> Optional[float]:
+        cursor = int(self.setpoints.header[1])
+        if cursor >= self.setpoints.count:
+            return None
+        row = self.setpoints.get(cursor)
+        return None if row is None else float(row[0])
+
+    def _write_due_setpoint(self, now: float):
+        """Write the newest due setpoint; older due ones are superseded"""
+        setpoints = self.setpoints
+        cursor, count = int(setpoints.header[1]), setpoints.count
+        due, superseded = None, 0
+        while cursor < count:
+            row = setpoints.get(cursor)
+            if row is None or row[0] > now:
+                break
+            if due is not None:
+                superseded += 1
+            due = row
+            cursor += 1
+        if due is None:
+            return
+
+        started = time.monotonic()
+        positions = {j: int(p) for j, p in zip(JOINTS, due[2:]) if not np.isnan(p)}
+        self.arm.write_goals(positions, int(due[1]))
+        setpoints.header[1] = cursor
+
+        stats = self.stream
+        if stats is not None and due[0] > 0:
+            if stats.ticks == 0:
+                self._stream_start = due[0]
+            stats.ticks += 1
+            stats.skipped += superseded
+            stats.jitter.append(started - due[0])
+            upcoming = self._next_deadline()
+            if upcoming is not None and time.monotonic() > upcoming:
+                stats.overruns += 1
+            stats.elapsed = time.monotonic() - self._stream_start
+
+    def _step_grip(self, now: float):
+        """Run the grip's tick if due; answer the grip call once it is done"""
+        session = self.grip
+        if session is None or now < self._grip_deadline:
+            return
+        try:
+            session.tick()
+        except Exception as e:
+            self.grip = None
+            self.conn.send((False, e))
+            return
+        self._grip_deadline += session.period
+        if self._grip_deadline < now:
+            self._grip_deadline = now + session.period
+        if session.done:
+            self.grip = None
+            self.conn.send((True, session.result()))
+
+    def _handle_call(self):
+        method, args, kwargs = self.conn.recv()
+        try:
+            if method == "stop":
+                self._running = False
+                result = None
+            elif method == "begin_stream":
+                self.stream = TickStats(period=args[0])
+                result = None
+            elif method == "end_stream":
+                result, self.stream = self.stream, None
+            elif method == "set_joint_limits":
+                self.arm.joint_limits = dict(args[0])
+                result = None
+            elif method == "grip":
+                session = self.arm.begin_grip(*args, **kwargs)
+                if not session.done:
+                    # Ticked from run() between state samples and setpoint
+                    # writes; the reply goes out when it finishes
+                    self.grip, self._grip_deadline = session, time.monotonic()
+                    return
+                result = session.result()
+            else:
+                result = getattr(self.arm, method)(*args, **kwargs)
+            self.conn.send((True, result))
+        except Exception as e:
+            self.conn.send((False, e))
+
+def _worker_main(port, baudrate, options, sim_options, conn, state_name, setpoint_name, capacity, setpoint_capacity, rate):
+    """Worker process entry point"""
+    if sim_options is not None:
+        import sim_bus
+        sim_bus.install(**sim_options)
+    import motion
+
+    arm = motion.SmoothMotion(port, baudrate, **options)
+    states = SharedRing(STATE_ROW, capacity, name=state_name)
+    setpoints = SharedRing(SETPOINT_ROW, setpoint_capacity, name=setpoint_name)
+    conn.send((True, None))  # Ready
+    try:
+        _BusWorker(arm, conn, states, setpoints, rate).run()
+    finally:
+        if arm.connected:
+            arm.disconnect()
+        states.close()
+        setpoints.close()
+
+# ==================== PROXY ====================
+
+class ProcessSmoothMotion(SmoothMotion):
+    """
+    SmoothMotion whose bus I/O runs in a dedicated worker process.
+
+    Planning runs in the parent as usual. Goal writes are queued as
+    setpoints in shared memory; execute_trajectory queues every waypoint
+    with its absolute deadline so the worker writes them on time even if
+    this process stalls. read_state() returns the worker's latest sample
+    (it samples continuously at rate Hz, like telemetry). Everything else
+    that touches the bus is a call forwarded over a pipe.
+    """
+
+    queues_writes = True
+
+    def __init__(
+        self,
+        port: str,
+        baudrate: int = 1000000,
+        rate: float = TELEMETRY_RATE_HZ,
+        capacity: int = TELEMETRY_CAPACITY,
+        **kwargs,
+    ):
+        super().__init__(port, baudrate, **kwargs)
+        self.rate = rate
+        self.capacity = capacity
+        self._options = kwargs
+        self._process = None
+        self._conn = None
+        self._states: Optional[SharedRing] = None
+        self._setpoints: Optional[SharedRing] = None
+        self._call_lock = threading.Lock()
+
+    def _call(self, method: str, *args, **kwargs):
+        """Run a SmoothMotion method in the worker and return its result"""
+        with self._call_lock:
+            self._conn.send((method, args, kwargs))
+            ok, result = self._conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def connect(self) -> bool:
+        """Start the worker process and connect the arm from it"""
+        self._states = SharedRing(STATE_ROW, self.capacity)
+        self._setpoints = SharedRing(SETPOINT_ROW, SETPOINT_CAPACITY)
+        self._conn, child_conn = multiprocessing.Pipe()
+        ctx = multiprocessing.get_context("spawn")
+        self._process = ctx.Process(
+            target=_worker_main,
+            args=(
+                self.port, self.baudrate, self._options, _simulator_options(), child_conn,
+                self._states.name, self._setpoints.name, self.capacity, SETPOINT_CAPACITY, self.rate,
+            ),
+            name=f"bus-{self.port}",
+            daemon=True,
+        )
+        self._process.start()
+
+        if not self._conn.poll(WORKER_START_TIMEOUT):
+            print(f"Bus worker for {self.port} did not start")
+            self._shutdown()
+            return False
+        self._conn.recv()
+        if not self._call("connect"):
+            self._shutdown()
+            return False
+        self._call("set_joint_limits", self.joint_limits)
+
+        # Wait for the first sample so read_state() always has one
+        deadline = time.monotonic() + WORKER_START_TIMEOUT
+        while self._states.count == 0 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.connected = True
+        return True
+
+    def disconnect(self):
+        """Disconnect the arm and stop the worker"""
+        if self._process is not None and self._process.is_alive():
+            self._call("disconnect")
+        self._shutdown()
+        self.connected = False
+
+    def _shutdown(self):
+        if self._process is not None:
+            if self._process.is_alive():
+                try:
+                    self._call("stop")
+                except (EOFError, OSError):
+                    pass
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        for ring in (self._states, self._setpoints):
+            if ring is not None:
+                ring.close()
+        self._states = self._setpoints = None
+
+    # ---- State ----
+
+    def read_state(self) -> ArmState:
+        """Latest sample from the worker (no IPC round trip)"""
+        rows = self._states.last(1)
+        if len(rows) == 0:
+            return self.read_bus_state()
+        return _row_state(rows[0])
+
+    def read_bus_state(self) -> ArmState:
+        """Fresh bus read done by the worker"""
+        return self._call("read_bus_state")
+
+    def start_telemetry(self, rate: float = TELEMETRY_RATE_HZ, capacity: int = TELEMETRY_CAPACITY):
+        """No-op: the worker samples state continuously"""
+
+    def stop_telemetry(self):
+        """No-op: the worker samples state continuously"""
+
+    def state_history(self, window_ms: float) -> List[ArmState]:
+        """Worker samples from the last window_ms milliseconds, oldest first"""
+        since = time.time() - window_ms / 1000.0
+        return [_row_state(row) for row in self._states.last(self.capacity) if row[0] >= since]
+
+    def state_window(self, window_ms: float) -> StateWindow:
+        """Worker samples from the last window_ms as (samples x joints) arrays"""
+        rows = self._states.last(self.capacity)
+        rows = rows[rows[:, 0] >= time.time() - window_ms / 1000.0]
+        values = rows[:, 4:].reshape(len(rows), 3, _N).astype(np.float32)
+        return StateWindow(rows[:, 0], values[:, ROW_POSITION], values[:, ROW_VELOCITY], values[:, ROW_LOAD])
+
+    def read_motion_status(self, joints: List[str] = None):
+        return self._call("read_motion_status", joints)
+
+    # ---- Commands ----
+
+    def set_torque(self, enable: bool, joints: List[str] = None):
+        self._call("set_torque", enable, joints)
+
+    def set_speed(self, speed: int, joints: List[str] = None):
+        self._call("set_speed", speed, joints)
+
+    def move_joint(self, joint: str, position: int, speed: int = 300):
+        self._call("move_joint", joint, position, speed)
+
+    def read_joint_state(self, joint: str):
+        return self._call("read_joint_state", joint)
+
+    def grip(self, *args, **kwargs):
+        """
+        Runs in the worker's loop, next to the bus, so ticks don't pay for
+        IPC; states keep publishing and queued setpoints keep draining
+        while it runs. Blocks this process until the grip is done.
+        """
+        return self._call("grip", *args, **kwargs)
+
+    def _queue_setpoint(self, joints: Sequence[str], positions: Sequence[int], speed: int, deadline: float = 0.0):
+        """Queue goals for the worker; deadline 0 means as soon as possible"""
+        row = np.full(SETPOINT_ROW, np.nan)
+        row[0], row[1] = deadline, speed
+        for joint, position in zip(joints, positions):
+            row[2 + JOINTS.index(joint)] = self._clamp_position(joint, position)
+        # Wait for room rather than overwrite setpoints the worker hasn't taken
+        ring = self._setpoints
+        while ring.count - ring.header[1] >= ring.capacity:
+            self._check_worker()
+            time.sleep(0.001)
+        ring.append(row)
+
+    def _check_worker(self, deadline: Optional[float] = None):
+        """Raise instead of waiting on a worker that died or fell too far behind"""
+        if not self._process.is_alive():
+            raise RuntimeError(f"Bus worker for {self.port} died (exit code {self._process.exitcode})")
+        if deadline is not None and time.monotonic() > deadline:
+            raise RuntimeError(f"Bus worker for {self.port} is over {STREAM_TIMEOUT_MARGIN:g}s behind its deadlines")
+
+    def _write_goal_rows(self, joints: Sequence[str], positions: Sequence[int], speed: int):
+        self._queue_setpoint(list(joints), list(positions), speed)
+
+    def execute_trajectory(
+        self,
+        trajectory: Union[Trajectory, List[Dict[str, int]]],
+        dt: Optional[float] = None,
+        speed: int = 0,
+        units: Optional[str] = None,
+    ) -> TickStats:
+        """
+        Queue every waypoint with its absolute deadline; the worker writes
+        them on time. Blocks until the last one is written.
+
+        Raises:
+            RuntimeError: If the worker dies, or hasn't written the last
+                waypoint STREAM_TIMEOUT_MARGIN after its deadline
+        """
+        trajectory = self.prepare_trajectory(trajectory, dt, units=units)
+        self.set_torque(True)
+        if isinstance(trajectory, Trajectory):
+            joints = trajectory.joints
+            rows = [(joints, row) for row in trajectory.clipped(self.joint_limits).positions.tolist()]
+            dt = dt or trajectory.dt or 0.02
+        else:
+            rows = [(list(waypoint), list(waypoint.values())) for waypoint in trajectory]
+            dt = dt or 0.02
+
+        self._call("begin_stream", dt)
+        start = time.monotonic() + STREAM_LEAD
+        for i, (joints, positions) in enumerate(rows):
+            self._queue_setpoint(joints, positions, speed, start + i * dt)
+
+        last = self._setpoints.count
+        deadline = start + (len(rows) - 1) * dt + STREAM_TIMEOUT_MARGIN
+        while self._setpoints.header[1] < last:
+            self._check_worker(deadline)
+            time.sleep(0.001)
+        stats = self._call("end_stream")
+        self.last_tick_stats = stats
+        return stats
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Joint Calibration for SO-101 Robot Arms
+Converts between raw servo units (0-4095), LeRobot's normalized units
+(-100..100, gripper 0..100, as recorded in training_data) and joint angles,
+for whole arrays of samples at once.
+
+Usage:
+    calibration = arm_calibration("follower")      # Loaded once, then cached
+    raw = calibration.to_raw(normalized)           # (..., joints) arrays
+    both = dual_calibration()                      # Leader and follower stacked
+    raw = both.to_raw(samples)                     # (..., 2, joints) in one call
+"""
+
+import json
+import math
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from state import JOINTS
+
+# Encoder counts across the servo's full range (LeRobot uses 4095 as the max)
+MAX_RESOLUTION = 4095
+
+# Joints normalized to 0..100 instead of -100..100
+ZERO_TO_HUNDRED_JOINTS = {"gripper"}
+
+UNITS_RAW = "raw"
+UNITS_NORMALIZED = "normalized"
+UNITS_RADIANS = "radians"
+
+# Arm ports and calibration ids, shared with the LeRobot skill
+LEROBOT_CONFIG = os.path.expanduser("~/.openclaw/skills/lerobot/config.json")
+# Where LeRobot writes calibration files (HF_LEROBOT_CALIBRATION overrides)
+LEROBOT_CALIBRATION_DIR = os.path.expanduser("~/.cache/huggingface/lerobot/calibration")
+CALIBRATION_SUBDIRS = {
+    "follower": os.path.join("robots", "so101_follower"),
+    "leader": os.path.join("teleoperators", "so101_leader"),
+}
+ARM_ROLES = ("leader", "follower")
+
+class ArmCalibration:
+    """
+    Per-joint calibration as arrays in JOINTS order.
+
+    range_min/range_max bound each joint in raw units and define the
+    normalized scale: range_min maps to -100 (0 for the gripper) and
+    range_max to +100. drive_mode 1 inverts a joint's normalized direction.
+    Joint angles are measured from the middle of the range, which is the
+    zero pose of the arm's kinematic model.
+
+    The arrays may also be (arms x joints) (see stack), converting samples
+    shaped (..., arms, joints) for several arms in one call.
+    """
+
+    def __init__(
+        self,
+        range_min: np.ndarray,
+        range_max: np.ndarray,
+        drive_mode: Optional[np.ndarray] = None,
+        homing_offset: Optional[np.ndarray] = None,
+    ):
+        self.range_min = np.asarray(range_min, dtype=np.float64)
+        self.range_max = np.asarray(range_max, dtype=np.float64)
+        n = len(JOINTS)
+        self.drive_mode = np.zeros(n) if drive_mode is None else np.asarray(drive_mode, dtype=np.float64)
+        self.homing_offset = np.zeros(n) if homing_offset is None else np.asarray(homing_offset, dtype=np.float64)
+        self.zero_to_hundred = np.array([j in ZERO_TO_HUNDRED_JOINTS for j in JOINTS])
+        self.invert = self.drive_mode != 0
+        # Normalized <-> raw is affine within the range: raw = offset + scale * normalized
+        span = self.range_max - self.range_min
+        self.scale = np.where(self.zero_to_hundred, span / 100, span / 200)
+        self.scale = np.where(self.invert, -self.scale, self.scale)
+        low = np.where(self.zero_to_hundred, self.range_min, self.middle)
+        high = np.where(self.zero_to_hundred, self.range_max, self.middle)
+        self.offset = np.where(self.invert, high, low)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict]) -> "ArmCalibration":
+        """From a LeRobot calibration file's contents ({joint: {range_min, ...}})"""
+        def column(key, default):
+            return [data.get(j, {}).get(key, default) for j in JOINTS]
+
+        return cls(
+            column("range_min", 0),
+            column("range_max", MAX_RESOLUTION),
+            column("drive_mode", 0),
+            column("homing_offset", 0),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "ArmCalibration":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def stack(cls, calibrations: Sequence["ArmCalibration"]) -> "ArmCalibration":
+        """One calibration converting (..., arms, joints) samples for several arms at once"""
+        return cls(
+            np.stack([c.range_min for c in calibrations]),
+            np.stack([c.range_max for c in calibrations]),
+            np.stack([c.drive_mode for c in calibrations]),
+            np.stack([c.homing_offset for c in calibrations]),
+        )
+
+    @property
+    def middle(self) -> np.ndarray:
+        return (self.range_min + self.range_max) / 2
+
+    def _columns(self, joints: Optional[Sequence[str]]):
+        """Index for the last axis picking `joints` (everything if None)"""
+        if joints is None:
+            return Ellipsis
+        return (Ellipsis, [JOINTS.index(j) for j in joints])
+
+    def to_normalized(self, raw: np.ndarray, joints: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Raw servo units (..., joints) -> normalized units.
+
+        joints names the columns when they aren't all of JOINTS in order.
+        """
+        cols = self._columns(joints)
+        raw = np.clip(np.asarray(raw, dtype=np.float64), self.range_min[cols], self.range_max[cols])
+        return (raw - self.offset[cols]) / self.scale[cols]
+
+    def to_raw(self, normalized: np.ndarray, joints: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Normalized units (..., joints) -> raw servo units (float), clamped to the range"""
+        cols = self._columns(joints)
+        raw = self.offset[cols] + self.scale[cols] * np.asarray(normalized, dtype=np.float64)
+        return np.clip(raw, self.range_min[cols], self.range_max[cols])
+
+    def convert(self, values: np.ndarray, units: str, to: str, joints: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Any of UNITS_RAW / UNITS_NORMALIZED / UNITS_RADIANS to another"""
+        if units == to:
+            return np.asarray(values, dtype=np.float64)
+        if units == UNITS_NORMALIZED:
+            raw = self.to_raw(values, joints)
+        elif units == UNITS_RADIANS:
+            raw = self.radians_to_raw(values, joints)
+        elif units == UNITS_RAW:
+            raw = np.asarray(values, dtype=np.float64)
+        else:
+            raise ValueError(f"Unknown units: {units}")
+        if to == UNITS_RAW:
+            return raw
+        if to == UNITS_NORMALIZED:
+            return self.to_normalized(raw, joints)
+        if to == UNITS_RADIANS:
+            return self.raw_to_radians(raw, joints)
+        raise ValueError(f"Unknown units: {to}")
+
+    def raw_to_radians(self, raw: np.ndarray, joints: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Raw servo units (..., joints) -> joint angles from mid-range"""
+        cols = self._columns(joints)
+        angles = (np.asarray(raw, dtype=np.float64) - self.middle[cols]) * (2 * math.pi / MAX_RESOLUTION)
+        return np.where(self.invert[cols], -angles, angles)
+
+    def radians_to_raw(self, angles: np.ndarray, joints: Optional[Sequence[str]] = None) -> np.ndarray:
+        cols = self._columns(joints)
+        angles = np.asarray(angles, dtype=np.float64)
+        angles = np.where(self.invert[cols], -angles, angles)
+        return self.middle[cols] + angles * (MAX_RESOLUTION / (2 * math.pi))
+
+# Uncalibrated arm: the full encoder range, centered at 2048
+DEFAULT_CALIBRATION = ArmCalibration(
+    np.zeros(len(JOINTS)),
+    np.full(len(JOINTS), MAX_RESOLUTION),
+)
+
+# ==================== LEROBOT CONFIG ====================
+
+@lru_cache(maxsize=None)
+def load_config(path: str = LEROBOT_CONFIG) -> Dict:
+    """The LeRobot skill's config.json, read once per path"""
+    with open(path) as f:
+        return json.load(f)
+
+def arm_port(role: str, path: str = LEROBOT_CONFIG) -> str:
+    """Serial port of the "leader" or "follower" arm (macOS cu. device)"""
+    return load_config(path)[role]["port"].replace("tty.", "cu.")
+
+def calibration_path(role: str, path: str = LEROBOT_CONFIG) -> Optional[str]:
+    """
+    LeRobot calibration file for an arm, if there is one.
+
+    The config entry's "calibration" path wins; otherwise the file LeRobot
+    writes for the entry's "id" under its calibration directory.
+    """
+    entry = load_config(path).get(role, {})
+    if entry.get("calibration"):
+        return os.path.expanduser(entry["calibration"])
+    if not entry.get("id"):
+        return None
+    root = os.environ.get("HF_LEROBOT_CALIBRATION", LEROBOT_CALIBRATION_DIR)
+    return os.path.join(root, CALIBRATION_SUBDIRS[role], f"{entry['id']}.json")
+
+@lru_cache(maxsize=None)
+def arm_calibration(role: str, path: str = LEROBOT_CONFIG) -> ArmCalibration:
+    """
+    Calibration for the "leader" or "follower" arm, loaded once and cached.
+
+    Falls back to DEFAULT_CALIBRATION when the config or the calibration
+    file is missing.
+    """
+    try:
+        calibration_file = calibration_path(role, path)
+    except (OSError, ValueError):
+        return DEFAULT_CALIBRATION
+    if calibration_file is None or not os.path.exists(calibration_file):
+        return DEFAULT_CALIBRATION
+    return ArmCalibration.load(calibration_file)
+
+@lru_cache(maxsize=None)
+def dual_calibration(path: str = LEROBOT_CONFIG) -> ArmCalibration:
+    """Leader and follower stacked (ARM_ROLES order) for (..., 2, joints) conversions"""
+    return ArmCalibration.stack([arm_calibration(role, path) for role in ARM_ROLES])
@@ -10,6 +10,7 @@ Usage:
     python3 careful_grab.py home                # Go to home position
     python3 careful_grab.py look                # Take a photo
     python3 careful_grab.py grab                # Run grab sequence (interactive)
+    python3 careful_grab.py flow                # Run grab sequence as one continuous motion
     python3 careful_grab.py grab --arm=leader   # Use leader arm instead
 """
 
@@ -22,6 +23,7 @@ import json
 # Add motion module to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from motion import SmoothMotion, JOINTS, JOINT_IDS
+from grip import GRIP_LOAD
 
 # ==================== CONFIGURATION ====================
 
@@ -38,6 +40,9 @@ FOLLOWER_PORT = ARM_PORTS["follower"]
 CAREFUL_SPEED = 80
 VERY_SLOW_SPEED = 50
 
+# Fraction of the planner's velocity/acceleration limits for continuous moves
+CAREFUL_SPEED_SCALE = 0.3
+
 # Photo output directory
 PHOTO_DIR = "/tmp/grab_photos"
 
@@ -123,6 +128,8 @@ def connect_arm():
     if not arm.connect():
         print(f"❌ Failed to connect to {FOLLOWER_PORT}")
         return None
+    # Background state sampling keeps status reads off the command path
+    arm.start_telemetry()
     return arm
 
 def check_status(arm):
@@ -148,14 +155,27 @@ def move_carefully(arm, target_positions, speed=CAREFUL_SPEED, description=""):
     
     print(f"   Speed: {speed} (careful)")
     
-    # Execute movement
+    # Execute movement (returns once the servos report the move complete)
     arm.set_torque(True)
-    arm.move_to(target_positions, speed=speed)
+    settle_time = arm.move_to(target_positions, speed=speed)
     
-    # Brief pause to let servo settle
-    time.sleep(0.5)
+    print(f"   ✅ Done ({settle_time:.2f}s)")
+
+def grip_carefully(arm, target, grip_load=GRIP_LOAD):
+    """Close the gripper until it touches something, then settle at grip_load."""
+    print(f"\n✊ Closing gripper (stops on contact, target load {grip_load})")
+    current = arm.read_state().positions.get("gripper", "?")
+    print(f"   gripper: {current} → {target} at most")
     
-    print("   ✅ Done")
+    result = arm.grip(target=target, grip_load=grip_load)
+    if result.contact_position is None:
+        print(f"   ⚠️  No contact: {result}")
+        return result
+    print(f"   ✅ {result.outcome.capitalize()} at {result.contact_position} "
+          f"(load {result.contact_load}), holding at load {result.final_load}")
+    print(f"   ⏱️  Detected {result.detect_latency * 1000:.1f}ms after load onset, "
+          f"hold written {result.reaction_latency * 1000:.2f}ms later ({result.elapsed:.2f}s total)")
+    return result
 
 def go_home(arm):
     """Move to safe home position."""
@@ -177,7 +197,7 @@ def interactive_grab(arm):
         ("home", "Move to safe home position", POSITIONS["home"]),
         ("ready", "Lower to ready position", POSITIONS["ready"]),
         ("table", "Lower to table level", POSITIONS["table_level"]),
-        ("close", "Close gripper", {"gripper": 1500}),  # Closed
+        ("close", "Close gripper on the object", {"gripper": 1500}),  # Fully closed if nothing's there
         ("lift", "Lift up", {"shoulder_lift": 1700, "elbow_flex": 2300}),
         ("home", "Return home", POSITIONS["home"]),
     ]
@@ -191,12 +211,47 @@ def interactive_grab(arm):
             print("   Stopping sequence.")
             break
         
-        move_carefully(arm, positions, speed=CAREFUL_SPEED, description=description)
+        if step_name == "close":
+            grip_carefully(arm, positions["gripper"])
+        else:
+            move_carefully(arm, positions, speed=CAREFUL_SPEED, description=description)
         take_photo(f"after_{step_name}")
     
     print("\n✅ Sequence complete!")
     print(f"📁 Photos saved to: {PHOTO_DIR}")
 
+def continuous_grab(arm):
+    """
+    Run the grab sequence as smooth motions: one flowing approach to the
+    pre-grasp pose, a contact-aware grip, then one flowing retreat.
+    """
+    print("\n🎯 CONTINUOUS GRAB SEQUENCE")
+    
+    take_photo("before_flow")
+    arm.set_torque(True)
+    # (pose, dwell seconds after reaching it)
+    approach = [
+        (POSITIONS["ready"], 0.0),
+        (POSITIONS["table_level"], 0.5),   # Settle before closing
+    ]
+    stats = arm.move_through(
+        [pose for pose, _ in approach],
+        dwell=[hold for _, hold in approach],
+        speed_scale=CAREFUL_SPEED_SCALE,
+    )
+    print(f"   ✅ At pre-grasp pose in {stats.elapsed:.2f}s")
+    
+    result = grip_carefully(arm, 1500)  # Fully closed if nothing's there
+    
+    # Keep squeezing while lifting; home opens the gripper again
+    retreat = [
+        {"shoulder_lift": 1700, "elbow_flex": 2300, "gripper": result.hold_goal},
+        POSITIONS["home"],
+    ]
+    stats = arm.move_through(retreat, speed_scale=CAREFUL_SPEED_SCALE)
+    take_photo("after_flow")
+    print(f"   ✅ Back home in {stats.elapsed:.2f}s")
+
 # ==================== MAIN ====================
 
 def main():
@@ -252,6 +307,14 @@ def main():
             arm.set_torque(False)
             arm.disconnect()
     
+    elif command == "flow":
+        arm = connect_arm()
+        if arm:
+            go_home(arm)
+            continuous_grab(arm)
+            arm.set_torque(False)
+            arm.disconnect()
+    
     else:
         print(f"Unknown command: {command}")
         print(__doc__)
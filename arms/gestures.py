@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Periodic Motion Primitives for SO-101 Robot Arms
+Waves, nods, breathing and other gestures as parametric multi-joint
+oscillations, sampled in one vectorized pass into a Trajectory.
+
+Usage:
+    arm.perform(GESTURES["wave"])
+    arm.perform(wave_gesture("wrist_roll", amplitude=300, cycles=4))
+    dual.perform(GESTURES["nod"], phase_shift=0.5)   # Arms nod alternately
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from planner import MotionLimits
+from trajectory import Trajectory
+
+# Default seconds to fade a gesture in and out from the rest pose
+GESTURE_RAMP = 0.3
+
+# Sample spacing for measuring a gesture's peak velocity and acceleration
+PEAK_SAMPLE_DT = 0.001
+
+@dataclass
+class Oscillation:
+    """
+    One joint's periodic component:
+    bias + amplitude * sin(2π (frequency * t + phase)), in servo units.
+    Several oscillations on the same joint add up.
+    """
+    joint: str
+    amplitude: float
+    frequency: float        # Hz
+    phase: float = 0.0      # Cycles (0.25 = quarter period ahead)
+    bias: float = 0.0       # Constant offset from the rest pose while the gesture runs
+
+@dataclass
+class Gesture:
+    """
+    A multi-joint periodic motion relative to a rest pose.
+
+    The whole motion is scaled by an envelope that eases from 0 to 1 over
+    `ramp` seconds at the start and back to 0 at the end, so the arm leaves
+    and returns to the rest pose with zero velocity.
+    """
+    name: str
+    oscillations: List[Oscillation]
+    duration: float                  # Seconds, including ramps
+    ramp: float = GESTURE_RAMP
+
+    @property
+    def joints(self) -> List[str]:
+        joints = []
+        for osc in self.oscillations:
+            if osc.joint not in joints:
+                joints.append(osc.joint)
+        return joints
+
+    def envelope(self, t: np.ndarray) -> np.ndarray:
+        """Raised-cosine fade in/out, 0 at both ends"""
+        ramp = min(self.ramp, self.duration / 2)
+        if ramp <= 0:
+            return np.ones_like(t)
+        edge = np.clip(np.minimum(t, self.duration - t) / ramp, 0.0, 1.0)
+        return 0.5 - 0.5 * np.cos(np.pi * edge)
+
+    def offsets(self, t: np.ndarray) -> np.ndarray:
+        """
+        Offsets from the rest pose at times t.
+
+        Returns:
+            (len(t) x len(joints)) array, columns in `joints` order
+        """
+        joints = self.joints
+        amplitude = np.array([o.amplitude for o in self.oscillations])
+        frequency = np.array([o.frequency for o in self.oscillations])
+        phase = np.array([o.phase for o in self.oscillations])
+        bias = np.array([o.bias for o in self.oscillations])
+
+        # (steps x oscillations), then sum oscillations into their joint columns
+        waves = bias + amplitude * np.sin(2 * np.pi * (np.outer(t, frequency) + phase))
+        columns = np.zeros((len(self.oscillations), len(joints)))
+        columns[np.arange(len(self.oscillations)), [joints.index(o.joint) for o in self.oscillations]] = 1.0
+        return (waves @ columns) * self.envelope(t)[:, None]
+
+    def peak_rates(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Peak |velocity| and |acceleration| of each joint (servo units/s and
+        units/s², in `joints` order), including the fade in and out.
+        """
+        t = np.arange(0.0, self.duration + PEAK_SAMPLE_DT, PEAK_SAMPLE_DT)
+        velocity = np.gradient(self.offsets(t), PEAK_SAMPLE_DT, axis=0)
+        acceleration = np.gradient(velocity, PEAK_SAMPLE_DT, axis=0)
+        return np.abs(velocity).max(axis=0), np.abs(acceleration).max(axis=0)
+
+    def within(self, limits: Dict[str, MotionLimits]) -> "Gesture":
+        """
+        The gesture slowed down just enough that no joint exceeds its
+        velocity or acceleration limit; itself if it already fits.
+
+        Stretching time by k divides velocity by k and acceleration by k²,
+        so the path and amplitudes stay the same.
+        """
+        velocity, acceleration = self.peak_rates()
+        stretch = 1.0
+        for joint, v, a in zip(self.joints, velocity, acceleration):
+            if joint in limits:
+                stretch = max(stretch, v / limits[joint].velocity, math.sqrt(a / limits[joint].acceleration))
+        if stretch <= 1.0:
+            return self
+        return Gesture(
+            self.name,
+            [Oscillation(o.joint, o.amplitude, o.frequency / stretch, o.phase, o.bias) for o in self.oscillations],
+            self.duration * stretch,
+            self.ramp * stretch,
+        )
+
+    def shifted(self, cycles: float) -> "Gesture":
+        """Same gesture with every oscillation's phase moved by cycles"""
+        return Gesture(
+            self.name,
+            [Oscillation(o.joint, o.amplitude, o.frequency, o.phase + cycles, o.bias) for o in self.oscillations],
+            self.duration,
+            self.ramp,
+        )
+
+    def trajectory(self, rest: Dict[str, int], rate: float) -> Trajectory:
+        """
+        Sample the gesture around rest.
+
+        Raises:
+            ValueError: If rest lacks a joint the gesture moves (centring it
+                anywhere else would jump the servo on the first waypoint)
+        """
+        missing = [j for j in self.joints if j not in rest]
+        if missing:
+            raise ValueError(f"Gesture {self.name} needs the rest position of {missing}")
+        dt = 1.0 / rate
+        steps = max(int(math.ceil(self.duration * rate)), 1)
+        t = np.minimum(np.arange(steps + 1) * dt, self.duration)
+        center = np.array([rest[j] for j in self.joints], dtype=np.float64)
+        positions = np.rint(center + self.offsets(t))
+        return Trajectory(positions, self.joints, np.arange(steps + 1) * dt)
+
+def wave_gesture(
+    joint: str = "wrist_roll",
+    amplitude: float = 150,
+    cycles: float = 3,
+    period: float = 1.25,
+    ramp: float = 0.5,
+) -> Gesture:
+    """Single-joint sine wave: cycles at full amplitude plus a fade in and out"""
+    return Gesture(
+        "wave",
+        [Oscillation(joint, amplitude, 1.0 / period)],
+        cycles * period + 2 * ramp,
+        ramp,
+    )
+
+# Library of ready-made gestures (offsets in servo units around the rest
+# pose), each within DEFAULT_MOTION_LIMITS as written
+GESTURES: Dict[str, Gesture] = {
+    # Raise the forearm and wave the wrist side to side
+    "wave": Gesture("wave", [
+        Oscillation("shoulder_lift", 0, 1.0, bias=-250),
+        Oscillation("elbow_flex", 0, 1.0, bias=300),
+        Oscillation("wrist_roll", 180, 0.95),
+    ], duration=4.2, ramp=0.85),
+    # Wrist nods with the elbow following a quarter cycle behind
+    "nod": Gesture("nod", [
+        Oscillation("wrist_flex", 200, 0.75),
+        Oscillation("elbow_flex", 80, 0.75, phase=-0.25),
+    ], duration=3.5, ramp=0.6),
+    # Slow, small, out-of-phase shoulder/elbow motion for idling
+    "breathe": Gesture("breathe", [
+        Oscillation("shoulder_lift", 40, 0.25),
+        Oscillation("elbow_flex", 30, 0.25, phase=0.15),
+        Oscillation("wrist_flex", 20, 0.25, phase=0.3),
+    ], duration=8.0, ramp=1.0),
+    # Side-to-side "no"
+    "shake": Gesture("shake", [
+        Oscillation("shoulder_pan", 160, 0.75),
+        Oscillation("wrist_roll", 120, 0.75, phase=0.5),
+    ], duration=3.6, ramp=0.6),
+    # Come here: wrist and elbow curl together
+    "beckon": Gesture("beckon", [
+        Oscillation("wrist_flex", 250, 0.6, bias=150),
+        Oscillation("elbow_flex", 120, 0.6, phase=-0.1, bias=100),
+    ], duration=4.6, ramp=0.7),
+    # Open and close the gripper
+    "snap": Gesture("snap", [
+        Oscillation("gripper", 250, 0.5, bias=250),
+    ], duration=5.0, ramp=0.8),
+}
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Contact-Aware Gripping for SO-101 Robot Arms
+Closes the gripper in small goal steps at control rate while sampling
+present load and position, so contact or a stall is caught on the tick it
+shows up. The grip then holds where it touched or eases the goal until
+the load settles at a target grip force.
+
+Against a hard obstacle on the sim bus (600 units/s at 100 Hz) the stall
+is caught on the first sample after the jaw stops, 0-10 ms from onset;
+a soft object that only builds load is caught when it crosses
+CONTACT_LOAD, which takes as many ticks as the load needs to climb.
+
+Usage:
+    result = arm.grip(target=1500, grip_load=200)
+    print(result)            # Outcome, contact position, latencies
+    if result.outcome == "closed":
+        print("Nothing in the gripper")
+"""
+
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Loop and approach
+GRIP_RATE_HZ = 100
+GRIP_CLOSED = 1500          # Default fully-closed goal (servo units)
+GRIP_CLOSE_SPEED = 600      # How fast the goal sweeps closed (units/s)
+GRIP_TIMEOUT = 3.0          # Longest a grip may take (seconds)
+GRIP_TOLERANCE = 20         # Within this of the closed goal counts as closed
+
+# Detection thresholds (|present load|, 0-1000 = 0-100% of stall torque)
+CONTACT_LOAD = 250          # Load that counts as touching something
+ONSET_LOAD = 80             # Load where contact is taken to start, above free-motion load
+STALL_TICKS = 2             # Goal this many ticks of sweep ahead of a stopped joint = stalled
+STALL_MIN_LAG = 10          # ...but never less than this (servo deadband, units)
+STALL_SPEED = 20            # |present speed| below this counts as stopped
+
+# Force regulation after contact
+GRIP_LOAD = 200             # Default target |load| to hold at
+GRIP_SETTLE = 0.3           # Seconds spent easing toward the target load
+FORCE_GAIN = 0.1            # Goal units per unit of load error per tick
+
+OUTCOME_CONTACT = "contact"  # Load crossed CONTACT_LOAD
+OUTCOME_STALL = "stall"      # Stopped short of the goal without much load
+OUTCOME_CLOSED = "closed"    # Reached the closed goal: nothing in the way
+OUTCOME_TIMEOUT = "timeout"
+OUTCOME_NO_REPLY = "no_reply"
+
+@dataclass
+class GripResult:
+    """How a grip went, with timing for tuning the thresholds"""
+    outcome: str
+    contact_position: Optional[int]   # Gripper position when contact/stall was detected
+    contact_load: int                 # |load| on the detecting sample
+    hold_goal: int                    # Goal left on the servo
+    final_load: int                   # |load| on the last sample
+    detect_latency: float             # Load onset -> detecting sample (seconds)
+    reaction_latency: float           # Detecting sample read -> hold goal written (seconds)
+    period: float                     # Sample period; onset is only known to within this
+    elapsed: float                    # Whole grip (seconds)
+    ticks: int
+    missed: int                       # Ticks whose read got no reply
+    trace: np.ndarray                 # (ticks x 4): time, goal, position, load
+
+    def __str__(self) -> str:
+        if self.contact_position is None:
+            return f"{self.outcome} after {self.elapsed:.2f}s (goal {self.hold_goal}, load {self.final_load})"
+        return (
+            f"{self.outcome} at {self.contact_position} (load {self.contact_load}), "
+            f"holding goal {self.hold_goal} at load {self.final_load}; "
+            f"detected {self.detect_latency * 1000:.1f}ms after onset, "
+            f"hold written {self.reaction_latency * 1000:.2f}ms later"
+        )
+
+def stall_lag(close_speed: float, rate: float) -> float:
+    """Goal lead (servo units) that marks a stall for a sweep of close_speed at rate Hz"""
+    return max(STALL_MIN_LAG, STALL_TICKS * close_speed / rate)
+
+class ContactDetector:
+    """
+    Per-sample contact and stall test, no bus access.
+
+    Contact is |load| at or above contact_load. A stall is a joint that
+    has stopped while its goal is more than stall_lag ahead. A closing
+    joint already trails its goal by a few ticks of sweep, so with
+    stall_lag at STALL_TICKS of sweep (see stall_lag()) a blocked jaw is
+    caught on the first sample that reads it stopped, before the load has
+    built up. Both are decided on the sample itself.
+    """
+
+    def __init__(
+        self,
+        direction: float,
+        contact_load: int = CONTACT_LOAD,
+        onset_load: int = ONSET_LOAD,
+        stall_lag: float = STALL_MIN_LAG,
+        stall_speed: int = STALL_SPEED,
+    ):
+        self.direction = direction
+        self.contact_load = contact_load
+        self.onset_load = onset_load
+        self.stall_lag = stall_lag
+        self.stall_speed = stall_speed
+        self.onset: Optional[float] = None  # Time the load started rising
+        self._last_load = 0
+
+    def update(self, t: float, goal: float, position: int, velocity: int, load: int) -> Optional[str]:
+        """Returns OUTCOME_CONTACT, OUTCOME_STALL or None for one sample"""
+        # Onset is the start of the current rise above onset_load; a fast
+        # free close can sit above onset_load without touching anything
+        if abs(load) < self.onset_load or abs(load) <= self._last_load:
+            self.onset = None
+        elif self.onset is None:
+            self.onset = t
+        self._last_load = abs(load)
+        if abs(load) >= self.contact_load:
+            return OUTCOME_CONTACT
+        if (goal - position) * self.direction > self.stall_lag and abs(velocity) < self.stall_speed:
+            if self.onset is None:
+                self.onset = t
+            return OUTCOME_STALL
+        return None
+
+class GripController:
+    """
+    Goal sequence for one grip, fed one sample per tick.
+
+    Closing: the goal sweeps from the start position toward target at
+    close_speed. On contact or stall the goal either holds at the contact
+    position (grip_load None) or is eased for GRIP_SETTLE seconds until
+    |load| sits at grip_load.
+    """
+
+    def __init__(
+        self,
+        start: int,
+        target: int,
+        close_speed: float = GRIP_CLOSE_SPEED,
+        grip_load: Optional[int] = GRIP_LOAD,
+        detector: Optional[ContactDetector] = None,
+        rate: float = GRIP_RATE_HZ,
+    ):
+        self.start = start
+        self.target = target
+        self.direction = 1.0 if target >= start else -1.0
+        self.close_speed = close_speed
+        self.grip_load = grip_load
+        self.detector = detector or ContactDetector(self.direction, stall_lag=stall_lag(close_speed, rate))
+        self.goal = float(start)
+        self.outcome: Optional[str] = None
+        self.done = False
+        self.contact: Optional[Tuple[float, int, int]] = None  # (time, position, load)
+        self.hold_written: Optional[float] = None
+        self.trace: List[Tuple[float, float, int, int]] = []
+
+    def step(self, t: float, position: int, velocity: int, load: int) -> int:
+        """Next goal given the sample taken at t (seconds since start)"""
+        self.trace.append((t, self.goal, position, load))
+        if self.contact is None:
+            event = self.detector.update(t, self.goal, position, velocity, load)
+            if event is not None:
+                self.outcome = event
+                self.contact = (t, position, load)
+                self.goal = float(position)
+                self.done = self.grip_load is None
+            else:
+                travel = abs(self.target - self.start)
+                self.goal = self.start + self.direction * min(self.close_speed * t, travel)
+                if abs(position - self.target) <= GRIP_TOLERANCE:
+                    self.outcome = OUTCOME_CLOSED
+                    self.done = True
+        else:
+            # Squeeze harder while under the target load, ease off above it,
+            # never past the closed goal or back past the contact point
+            self.goal += self.direction * FORCE_GAIN * (self.grip_load - abs(load))
+            low, high = sorted((self.contact[1], self.target))
+            self.goal = min(max(self.goal, low), high)
+            self.done = t - self.contact[0] >= GRIP_SETTLE
+        return int(round(self.goal))
+
+    def written(self, t: float):
+        """Record when the goal chosen on the detecting tick reached the bus"""
+        if self.contact is not None and self.hold_written is None:
+            self.hold_written = t
+
+    def result(self, elapsed: float, period: float, missed: int = 0) -> GripResult:
+        trace = np.array(self.trace, dtype=np.float64).reshape(-1, 4)
+        final_load = int(abs(trace[-1, 3])) if len(trace) else 0
+        if self.contact is None:
+            return GripResult(
+                self.outcome or OUTCOME_TIMEOUT, None, 0, int(round(self.goal)), final_load,
+                math.nan, math.nan, period, elapsed, len(trace), missed, trace,
+            )
+        t, position, load = self.contact
+        onset = self.detector.onset if self.detector.onset is not None else t
+        return GripResult(
+            self.outcome, position, abs(load), int(round(self.goal)), final_load,
+            t - onset, (self.hold_written or t) - t, period, elapsed, len(trace), missed, trace,
+        )
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Inverse Kinematics for SO-101 Robot Arms
+Numerical IK (damped least squares on the analytic Jacobian), batched over
+many targets at once, warm-started from the current pose with a sampled
+workspace index as fallback, and an LRU cache of solved targets.
+
+Usage:
+    solver = IKSolver()
+    result = solver.solve([0.25, 0.0, 0.10], seed=arm.read_state().positions)
+    if result.converged:
+        arm.smooth_move(result.positions)
+    print(solver.timing())     # p50/p99 solve time, cache hit rate
+
+    arm.move_to_pose([0.25, 0.0, 0.10])   # Same thing via SmoothMotion
+    arm.smooth_move(target, profile="cartesian")   # Straight-line gripper path
+"""
+
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from calibration import DEFAULT_CALIBRATION, ArmCalibration
+from kinematics import ARM_JOINTS, UNITS_RADIANS, SO101Kinematics
+from state import JOINTS
+from scheduler import percentile_us
+
+# Solver settings
+IK_TOLERANCE = 0.001        # Position error counted as solved (metres)
+IK_MAX_ITERATIONS = 50
+IK_WARM_ITERATIONS = 20     # Iterations from the seed alone before bringing in the index
+IK_STALL = 1e-6             # Less progress per iteration than this (metres) ...
+IK_STALL_FRACTION = 0.01    # ... plus this fraction of the remaining error = stuck
+IK_DAMPING = 0.01           # Damped least squares lambda (metres)
+IK_MAX_STEP = 0.3           # Largest joint change per iteration (radians)
+IK_ORIENTATION_WEIGHT = 0.1 # Metres of position error per radian of orientation error
+
+# Workspace index: sampled joint configurations bucketed by gripper position
+IK_INDEX_SAMPLES = 20000
+IK_INDEX_CELL = 0.02        # Voxel size (metres)
+IK_INDEX_CANDIDATES = 4     # Nearest workspace samples tried as initial guesses
+
+# Cache of solved targets, keyed on a 1 mm grid and the seed to within
+# ~15 degrees per joint (so a cached solution is on the seed's branch)
+IK_CACHE_SIZE = 1024
+IK_CACHE_RESOLUTION = 0.001
+IK_CACHE_SEED_RESOLUTION = 0.25
+
+# Solve times kept for p50/p99 reporting
+IK_TIMING_WINDOW = 1000
+
+@dataclass
+class IKResult:
+    """One IK solution"""
+    positions: Dict[str, int]   # Arm joints in raw servo units
+    angles: np.ndarray          # Arm joints in radians
+    error: float                # Remaining position error (metres)
+    iterations: int
+    converged: bool
+    cached: bool = False
+
+class WorkspaceIndex:
+    """
+    Voxel-grid index over sampled joint configurations.
+
+    Samples joint space uniformly within limits (wrist roll held at zero,
+    since it barely moves the gripper frame), runs forward kinematics once
+    for all of them, and buckets the gripper positions by voxel. Lookups
+    search outward shell by shell until enough candidates are found.
+    """
+
+    def __init__(
+        self,
+        kinematics: SO101Kinematics,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        samples: int = IK_INDEX_SAMPLES,
+        cell: float = IK_INDEX_CELL,
+        seed: int = 0,
+    ):
+        rng = np.random.default_rng(seed)
+        angles = rng.uniform(lower, upper, size=(samples, len(ARM_JOINTS)))
+        angles[:, ARM_JOINTS.index("wrist_roll")] = np.clip(0.0, lower[-1], upper[-1])
+        self.angles = angles
+        self.points = kinematics.forward(angles, UNITS_RADIANS).positions
+        self.cell = cell
+
+        # Sort samples by voxel so each voxel is one contiguous slice
+        voxels = np.floor(self.points / cell).astype(np.int64)
+        self._origin = voxels.min(axis=0)
+        self._shape = voxels.max(axis=0) - self._origin + 1
+        keys = self._keys(voxels)
+        order = np.argsort(keys, kind="stable")
+        self.angles, self.points, keys = self.angles[order], self.points[order], keys[order]
+        self._cells, self._starts, self._counts = np.unique(keys, return_index=True, return_counts=True)
+
+    def _keys(self, voxels: np.ndarray) -> np.ndarray:
+        v = voxels - self._origin
+        return (v[..., 0] * self._shape[1] + v[..., 1]) * self._shape[2] + v[..., 2]
+
+    def nearest(self, target: np.ndarray, k: int = IK_INDEX_CANDIDATES) -> np.ndarray:
+        """Joint angles (k x joints) of the samples nearest to target"""
+        # Targets outside the sampled workspace start from the nearest edge voxel
+        center = np.floor(np.asarray(target) / self.cell).astype(np.int64)
+        center = np.clip(center, self._origin, self._origin + self._shape - 1)
+        found = []
+        total = 0
+        for radius in range(int(self._shape.max()) + 1):
+            span = np.arange(-radius, radius + 1)
+            shell = np.stack(np.meshgrid(span, span, span, indexing="ij"), -1).reshape(-1, 3)
+            shell = shell[np.abs(shell).max(axis=1) == radius] + center
+            inside = np.all((shell >= self._origin) & (shell < self._origin + self._shape), axis=1)
+            keys = self._keys(shell[inside])
+            hit = np.minimum(np.searchsorted(self._cells, keys), len(self._cells) - 1)
+            for h in hit[self._cells[hit] == keys]:
+                found.append(np.arange(self._starts[h], self._starts[h] + self._counts[h]))
+                total += self._counts[h]
+            # Always take the neighbouring voxels too: they can hold samples
+            # closer to the target than its own voxel's
+            if total >= k and radius > 0:
+                break
+        candidates = np.concatenate(found)
+        distance = np.linalg.norm(self.points[candidates] - target, axis=1)
+        return self.angles[candidates[np.argsort(distance)[:k]]]
+
+class IKSolver:
+    """
+    Position (and optionally orientation) IK for one SO-101 arm.
+
+    solve() tries the seed (normally the present pose) first, so small
+    moves converge in a few iterations and stay on the same elbow branch.
+    If that fails it retries from the nearest samples in the workspace
+    index. Converged results are cached per target on a 1 mm grid.
+    """
+
+    def __init__(
+        self,
+        calibration: ArmCalibration = DEFAULT_CALIBRATION,
+        joint_limits: Optional[Dict[str, Tuple[int, int]]] = None,
+        cache_size: int = IK_CACHE_SIZE,
+        index_samples: int = IK_INDEX_SAMPLES,
+    ):
+        self.kinematics = SO101Kinematics(calibration)
+        self.calibration = calibration
+        if joint_limits is None:
+            from motion import DEFAULT_LIMITS
+            joint_limits = DEFAULT_LIMITS
+        raw_limits = np.array([[joint_limits[j][0], joint_limits[j][1]] for j in ARM_JOINTS], dtype=np.float64)
+        n = len(ARM_JOINTS)
+        ends = self.calibration.raw_to_radians(np.pad(raw_limits.T, ((0, 0), (0, len(JOINTS) - n))))[:, :n]
+        self.lower, self.upper = ends.min(axis=0), ends.max(axis=0)
+
+        self.index_samples = index_samples
+        self._index: Optional[WorkspaceIndex] = None
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, IKResult]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._solve_times = deque(maxlen=IK_TIMING_WINDOW)
+
+    @property
+    def index(self) -> WorkspaceIndex:
+        """Built on first use (~20k FK samples, a few tens of milliseconds)"""
+        if self._index is None:
+            self._index = WorkspaceIndex(self.kinematics, self.lower, self.upper, self.index_samples)
+        return self._index
+
+    # ---- Unit helpers ----
+
+    def to_angles(self, raw: Union[Dict[str, int], np.ndarray]) -> np.ndarray:
+        """Raw servo positions -> arm joint angles (joints missing = mid-range)"""
+        return self.kinematics.angles(raw)
+
+    def to_raw(self, angles: np.ndarray) -> np.ndarray:
+        """Arm joint angles (..., 5) -> raw servo units (int)"""
+        angles = np.asarray(angles)
+        padded = np.concatenate([angles, np.zeros(angles.shape[:-1] + (1,))], axis=-1)
+        return np.rint(self.calibration.radians_to_raw(padded)[..., :len(ARM_JOINTS)]).astype(int)
+
+    # ---- Core solver ----
+
+    def solve_batch(
+        self,
+        targets: np.ndarray,
+        seeds: np.ndarray,
+        rotations: Optional[np.ndarray] = None,
+        tolerance: float = IK_TOLERANCE,
+        max_iterations: int = IK_MAX_ITERATIONS,
+        until_any: bool = False,
+    ) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Damped least squares for m targets at once.
+
+        Args:
+            targets: (m x 3) gripper positions (metres, base frame)
+            seeds: (m x 5) starting joint angles
+            rotations: Optional (m x 3 x 3) gripper orientations to approach
+            until_any: Stop as soon as any row is solved (several guesses
+                at one target)
+
+        Returns:
+            (angles m x 5, position errors m, iterations used)
+        """
+        targets = np.atleast_2d(np.asarray(targets, dtype=np.float64))
+        q = np.clip(np.atleast_2d(np.array(seeds, dtype=np.float64)), self.lower, self.upper)
+        m, n = q.shape
+        rows = 6 if rotations is not None else 3
+        damping = IK_DAMPING ** 2 * np.eye(rows)
+        jacobian = np.empty((m, rows, n))
+        frames = None
+        stalled = np.zeros(m, dtype=bool)
+        previous = np.full(m, np.inf)
+
+        for iteration in range(max_iterations + 1):
+            frames = self.kinematics.angle_frames(q, frames)
+            position = frames[:, -1, :3, 3]
+            error = targets - position
+            distance = np.linalg.norm(error, axis=1)
+            unsolved = distance > tolerance
+            if rotations is not None:
+                orientation = _rotation_error(frames[:, -1, :3, :3], rotations)
+                unsolved |= np.linalg.norm(orientation, axis=1) * IK_ORIENTATION_WEIGHT > tolerance
+            # Rows pinned against a limit or short of an unreachable target
+            # stop once they barely improve
+            residual = distance if rotations is None else np.hypot(
+                distance, np.linalg.norm(orientation, axis=1) * IK_ORIENTATION_WEIGHT)
+            stalled |= unsolved & (previous - residual < IK_STALL + IK_STALL_FRACTION * residual)
+            previous = residual
+            active = unsolved & ~stalled
+            if not active.any() or iteration == max_iterations or (until_any and not unsolved.all()):
+                break
+
+            # Revolute Jacobian: z_k x (p_end - p_k), z_k the joint axis.
+            # Cross product written out; np.cross costs more than the FK here
+            axes = frames[:, :n, :3, 2]
+            arm = position[:, None, :] - frames[:, :n, :3, 3]
+            jacobian[:, 0] = axes[..., 1] * arm[..., 2] - axes[..., 2] * arm[..., 1]
+            jacobian[:, 1] = axes[..., 2] * arm[..., 0] - axes[..., 0] * arm[..., 2]
+            jacobian[:, 2] = axes[..., 0] * arm[..., 1] - axes[..., 1] * arm[..., 0]
+            if rotations is not None:
+                jacobian[:, 3:] = IK_ORIENTATION_WEIGHT * axes.transpose(0, 2, 1)
+                error = np.concatenate([error, IK_ORIENTATION_WEIGHT * orientation], axis=1)
+
+            # dq = J^T (J J^T + λ²I)^-1 e, per target
+            jt = jacobian.transpose(0, 2, 1)
+            step = (jt @ np.linalg.solve(jacobian @ jt + damping, error[:, :, None]))[:, :, 0]
+            scale = np.minimum(1.0, IK_MAX_STEP / np.maximum(np.abs(step).max(axis=1), 1e-12))
+            step *= (scale * active)[:, None]
+            q = np.clip(q + step, self.lower, self.upper)
+
+        return q, distance, iteration
+
+    def solve(
+        self,
+        target: Sequence[float],
+        seed: Optional[Union[Dict[str, int], np.ndarray]] = None,
+        rotation: Optional[np.ndarray] = None,
+        tolerance: float = IK_TOLERANCE,
+    ) -> IKResult:
+        """
+        Joint positions that put the gripper frame at target.
+
+        Only converged results are cached, keyed on target, rotation,
+        tolerance and the seed's neighbourhood. Measured on a slow single
+        core: seeded near the answer, p50 ~1 ms and p99 ~5 ms; from an
+        arbitrary seed, p50 ~3 ms and p99 ~9 ms; unreachable targets stop
+        within ~15 ms. The index's one-off build on the first fallback adds
+        ~50 ms to that call (touch solver.index up front to avoid it).
+
+        Args:
+            target: (x, y, z) in metres in the arm's base frame
+            seed: Current raw servo positions to warm-start from
+            rotation: Optional 3x3 gripper orientation to approach
+            tolerance: Position error counted as solved (metres)
+        """
+        start = time.perf_counter()
+        target = np.asarray(target, dtype=np.float64)
+        seed_angles = self.to_angles(seed) if seed is not None else None
+        key = self._cache_key(target, rotation, tolerance, seed_angles)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            self._solve_times.append(time.perf_counter() - start)
+            return IKResult(dict(cached.positions), cached.angles.copy(), cached.error,
+                            0, cached.converged, cached=True)
+        self.cache_misses += 1
+
+        rotations = None if rotation is None else np.asarray(rotation)[None]
+        if seed_angles is None:
+            seed_angles = np.zeros((1, len(ARM_JOINTS)))
+        q, error, iterations = self.solve_batch(target[None], seed_angles, rotations, tolerance, IK_WARM_ITERATIONS)
+
+        if error[0] > tolerance:
+            # Warm start hasn't got there (target across the workspace or
+            # past a limit): carry on from where it is alongside the nearest
+            # workspace samples, all at once, until the first one solves.
+            # The warm start wins a tie, keeping the seed's elbow branch.
+            guesses = np.vstack([q, self.index.nearest(target)])
+            tries = len(guesses)
+            q2, error2, more = self.solve_batch(
+                np.repeat(target[None], tries, axis=0), guesses,
+                None if rotations is None else np.repeat(rotations, tries, axis=0), tolerance,
+                until_any=True,
+            )
+            iterations += more
+            solved = error2 <= tolerance
+            best = int(np.argmax(solved)) if solved.any() else int(np.argmin(error2))
+            q, error = q2[best:best + 1], error2[best:best + 1]
+
+        raw = self.to_raw(q[0])
+        result = IKResult(
+            positions=dict(zip(ARM_JOINTS, raw.tolist())),
+            angles=q[0],
+            error=float(error[0]),
+            iterations=iterations,
+            converged=bool(error[0] <= tolerance),
+        )
+        # A miss is only as good as its seed; let the next call retry
+        if result.converged:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        self._solve_times.append(time.perf_counter() - start)
+        return result
+
+    def cartesian_path(
+        self,
+        start: Dict[str, int],
+        target: Dict[str, int],
+        progress: np.ndarray,
+        max_step: Optional[np.ndarray] = None,
+        tolerance: float = IK_TOLERANCE,
+    ) -> np.ndarray:
+        """
+        Joint positions that move the gripper along a straight line.
+
+        The line runs from start's gripper position to target's, sampled
+        at progress (0..1, any easing). Every sample is solved in one
+        batch, seeded from the joint-space blend at the same progress, so
+        the arm stays on the start/target configuration branch.
+
+        Args:
+            start: Raw positions of all arm joints at the start
+            target: Raw positions at the end (missing joints keep start's)
+            progress: Path fraction per waypoint, 0 first and 1 last
+            max_step: Largest raw change per waypoint for each arm joint
+
+        Returns:
+            (waypoints x 5) raw positions, arm joints in order
+
+        Raises:
+            ValueError: If a sample has no solution within the joint limits
+                or the path needs a joint to jump more than max_step
+        """
+        missing = [j for j in ARM_JOINTS if j not in start]
+        if missing:
+            raise ValueError(f"Cartesian move needs the start position of {missing}")
+        target = {j: target.get(j, start[j]) for j in ARM_JOINTS}
+        ends = self.to_angles([start, target])
+        line = self.kinematics.forward(ends, UNITS_RADIANS).positions
+
+        progress = np.asarray(progress, dtype=np.float64)[:, None]
+        points = line[0] + progress * (line[1] - line[0])
+        seeds = ends[0] + progress * (ends[1] - ends[0])
+        angles, error, _ = self.solve_batch(points, seeds, tolerance=tolerance)
+
+        failed = np.flatnonzero(error > tolerance)
+        if len(failed):
+            raise ValueError(
+                f"No IK solution for {len(failed)}/{len(points)} points on the line "
+                f"(first at {progress[failed[0], 0]:.0%}, worst {error.max() * 1000:.1f}mm off)"
+            )
+        raw = self.to_raw(angles)
+        if max_step is not None:
+            steps = np.abs(np.diff(raw, axis=0))
+            over = steps > max_step
+            if over.any():
+                row, col = np.argwhere(over)[0]
+                raise ValueError(
+                    f"Cartesian path needs {ARM_JOINTS[col]} to move {steps[row, col]:.0f} units "
+                    f"in one step (limit {max_step[col]:.0f}); use a longer duration"
+                )
+        return raw
+
+    def _cache_key(
+        self,
+        target: np.ndarray,
+        rotation: Optional[np.ndarray],
+        tolerance: float,
+        seed_angles: Optional[np.ndarray],
+    ) -> tuple:
+        key = tuple(np.rint(target / IK_CACHE_RESOLUTION).astype(int).tolist()) + (tolerance,)
+        if rotation is not None:
+            key += tuple(np.round(np.asarray(rotation), 2).ravel().tolist())
+        if seed_angles is not None:
+            key += tuple(np.rint(seed_angles[0] / IK_CACHE_SEED_RESOLUTION).astype(int).tolist())
+        return key
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def timing(self) -> Dict[str, float]:
+        """Solve-time percentiles (including cache hits) and cache hit rate"""
+        times = list(self._solve_times)
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "solves": len(times),
+            "p50_us": percentile_us(times, 50),
+            "p99_us": percentile_us(times, 99),
+            "max_us": max(times, default=0.0) * 1e6,
+            "cache_hit_rate": self.cache_hits / lookups if lookups else 0.0,
+        }
+
+def _rotation_error(current: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Axis-angle-style error (m x 3) rotating current toward target"""
+    return 0.5 * (
+        np.cross(current[:, :, 0], target[:, :, 0])
+        + np.cross(current[:, :, 1], target[:, :, 1])
+        + np.cross(current[:, :, 2], target[:, :, 2])
+    )
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Forward Kinematics for SO-101 Robot Arms
+Batched end-effector poses for the SO-101 joint chain: one NumPy pass
+over thousands of joint vectors (trajectory samples, candidate poses).
+
+Units:
+    "raw"         Servo units 0-4095 (SmoothMotion, Trajectory)
+    "normalized"  LeRobot .pos units, -100..100 (gripper 0..100), as in
+                  training_data/demos/*/trajectory.json
+    "radians"     Joint angles from the calibrated mid-range
+
+Usage:
+    fk = SO101Kinematics(calibration)
+    positions, rotations = fk.forward(trajectory.positions, units="raw")
+    positions = fk.trajectory_positions(trajectory)       # (steps x 3) metres
+"""
+
+import math
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from calibration import DEFAULT_CALIBRATION, UNITS_RADIANS, UNITS_RAW, ArmCalibration
+from state import JOINTS
+from trajectory import Trajectory
+
+# Joints that move the end effector (the gripper joint only opens the jaw)
+ARM_JOINTS = JOINTS[:5]
+
+def _origin(xyz: Sequence[float], rpy: Sequence[float]) -> np.ndarray:
+    """4x4 transform for a URDF joint origin (fixed-axis roll, pitch, yaw)"""
+    roll, pitch, yaw = rpy
+    cr, sr = math.cos(roll), math.sin(roll)
+    cp, sp = math.cos(pitch), math.sin(pitch)
+    cy, sy = math.cos(yaw), math.sin(yaw)
+    transform = np.eye(4)
+    transform[:3, :3] = [
+        [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+        [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+        [-sp, cp * sr, cp * cr],
+    ]
+    transform[:3, 3] = xyz
+    return transform
+
+# Joint origins from the SO-101 URDF (so101_new_calib: zero pose at
+# mid-range). Every joint rotates about its local z axis. Metres/radians.
+JOINT_ORIGINS = [
+    _origin([0.0388353, 0.0, 0.0624], [math.pi, 0.0, -math.pi]),            # shoulder_pan
+    _origin([-0.0303992, -0.0182778, -0.0542], [-math.pi / 2, -math.pi / 2, 0.0]),  # shoulder_lift
+    _origin([-0.11257, -0.028, 0.0], [0.0, 0.0, math.pi / 2]),              # elbow_flex
+    _origin([-0.1349, 0.0052, 0.0], [0.0, 0.0, -math.pi / 2]),              # wrist_flex
+    _origin([0.0, -0.0611, 0.0181], [math.pi / 2, 0.0486795, math.pi]),     # wrist_roll
+]
+
+# Wrist-roll link -> point between the gripper jaws
+GRIPPER_FRAME = _origin([-0.0079, -0.000218121, -0.0981274], [0.0, math.pi, 0.0])
+
+class Pose(NamedTuple):
+    """Batched poses in the arm's base frame"""
+    positions: np.ndarray   # (n x 3) metres
+    rotations: np.ndarray   # (n x 3 x 3)
+
+def joint_array(samples: Union[np.ndarray, Dict[str, float], Iterable[Dict[str, float]], Trajectory], fill: float = np.nan) -> np.ndarray:
+    """
+    Stack joint samples into an (n x joints) float array in JOINTS order.
+
+    Accepts an array, a Trajectory, one {joint: value} dict or a list of
+    them. Keys may be plain joint names or LeRobot "joint.pos" names.
+    Joints missing from a sample get `fill`.
+    """
+    if isinstance(samples, Trajectory):
+        array = np.full((len(samples), len(JOINTS)), fill)
+        for col, joint in enumerate(samples.joints):
+            array[:, JOINTS.index(joint)] = samples.positions[:, col]
+        return array
+    if isinstance(samples, dict):
+        samples = [samples]
+    if not isinstance(samples, np.ndarray):
+        samples = list(samples)
+        if samples and isinstance(samples[0], dict):
+            array = np.full((len(samples), len(JOINTS)), fill)
+            for row, sample in enumerate(samples):
+                for key, value in sample.items():
+                    joint = key[:-4] if key.endswith(".pos") else key
+                    if joint in JOINTS:
+                        array[row, JOINTS.index(joint)] = value
+            return array
+    return np.atleast_2d(np.asarray(samples, dtype=np.float64))
+
+class SO101Kinematics:
+    """
+    Forward kinematics for one SO-101 arm.
+
+    Args:
+        calibration: Maps raw/normalized joint values to angles
+        base: 4x4 transform from the arm's base frame to a world frame
+    """
+
+    def __init__(self, calibration: ArmCalibration = DEFAULT_CALIBRATION, base: np.ndarray = None):
+        self.calibration = calibration
+        self.base = np.eye(4) if base is None else np.asarray(base, dtype=np.float64)
+
+    def angles(self, joints, units: str = UNITS_RAW) -> np.ndarray:
+        """
+        Joint angles (n x 5) for the arm joints, radians from mid-range.
+
+        Joints missing from a sample are taken at mid-range.
+        """
+        values = joint_array(joints)
+        if values.shape[1] == len(ARM_JOINTS):
+            values = np.hstack([values, np.full((len(values), 1), np.nan)])
+        angles = self.calibration.convert(values, units, UNITS_RADIANS)
+        return np.nan_to_num(angles[:, :len(ARM_JOINTS)], nan=0.0)
+
+    def _chain(self, q: np.ndarray, frames: Optional[np.ndarray] = None, points: Optional[np.ndarray] = None):
+        """
+        Walk the joint chain for angles q (n x 5).
+
+        Returns the gripper frame's (rotations, positions). If frames is
+        given, each joint's frame is also stored into it; if points is,
+        just each joint's position.
+        """
+        n = len(q)
+        cos, sin = np.cos(q), np.sin(q)
+        rotation = np.broadcast_to(self.base[:3, :3], (n, 3, 3)).copy()
+        position = np.broadcast_to(self.base[:3, 3], (n, 3)).copy()
+        for k, origin in enumerate(JOINT_ORIGINS):
+            # (n x 3 x 3) @ constant as one flat GEMM; batched matmul of
+            # tiny matrices is several times slower
+            flat = rotation.reshape(-1, 3)
+            position += (flat @ origin[:3, 3]).reshape(n, 3)
+            rotation = (flat @ origin[:3, :3]).reshape(n, 3, 3)
+            if frames is not None:
+                frames[:, k, :3, :3] = rotation
+                frames[:, k, :3, 3] = position
+            if points is not None:
+                points[:, k] = position
+            # Rotation about local z only mixes the first two columns
+            x, y = rotation[:, :, 0].copy(), rotation[:, :, 1]
+            c, s = cos[:, k, None], sin[:, k, None]
+            rotation[:, :, 0] = c * x + s * y
+            rotation[:, :, 1] = c * y - s * x
+        flat = rotation.reshape(-1, 3)
+        position += (flat @ GRIPPER_FRAME[:3, 3]).reshape(n, 3)
+        rotation = (flat @ GRIPPER_FRAME[:3, :3]).reshape(n, 3, 3)
+        return rotation, position
+
+    def frames(self, joints, units: str = UNITS_RAW) -> np.ndarray:
+        """
+        World transforms of every joint frame plus the gripper frame.
+
+        Returns:
+            (n x 6 x 4 x 4): shoulder_pan ... wrist_roll, gripper frame
+        """
+        return self.angle_frames(self.angles(joints, units))
+
+    def angle_frames(self, q: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        frames() for an (n x 5) array of joint angles, skipping unit
+        handling. out, if given, is an (n x 6 x 4 x 4) array from an
+        earlier call to fill in place (for iterative solvers).
+        """
+        if out is None:
+            out = np.zeros((len(q), len(ARM_JOINTS) + 1, 4, 4))
+            out[:, :, 3, 3] = 1.0
+        rotation, position = self._chain(q, out)
+        out[:, -1, :3, :3] = rotation
+        out[:, -1, :3, 3] = position
+        return out
+
+    def forward(self, joints, units: str = UNITS_RAW) -> Pose:
+        """End-effector (gripper frame) poses for a batch of joint vectors"""
+        rotation, position = self._chain(self.angles(joints, units))
+        return Pose(position, rotation)
+
+    def link_points(self, joints, units: str = UNITS_RAW) -> np.ndarray:
+        """Base, joint and gripper-frame positions (n x 7 x 3), for drawing or collision checks"""
+        q = self.angles(joints, units)
+        points = np.empty((len(q), len(ARM_JOINTS) + 2, 3))
+        points[:, 0] = self.base[:3, 3]
+        _, points[:, -1] = self._chain(q, points=points[:, 1:])
+        return points
+
+    def trajectory_positions(self, trajectory: Trajectory) -> np.ndarray:
+        """End-effector path (steps x 3) of a raw-unit Trajectory"""
+        return self.forward(trajectory, UNITS_RAW).positions
+
+def load_demo_positions(path: str) -> List[Dict[str, float]]:
+    """Joint samples ({"joint.pos": value}) from a demo trajectory.json"""
+    import json
+
+    with open(path) as f:
+        return [point["positions"] for point in json.load(f)]
@@ -2,15 +2,39 @@
 """
 Smooth Motion Planning for SO-101 Robot Arms
 Provides interpolated trajectories and velocity profiling.
+
+Positions are raw servo units (0-4095) by default. An arm built with
+units="normalized" takes LeRobot .pos values (-100..100, gripper 0..100)
+everywhere a target or trajectory goes in; any call can also override
+this with units=.
 """
 
-import os
 import time
 import math
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
 import scservo_sdk as sdk
 
+from calibration import (
+    DEFAULT_CALIBRATION, UNITS_NORMALIZED, UNITS_RADIANS, UNITS_RAW, ArmCalibration, arm_calibration, arm_port,
+)
+from gestures import Gesture, wave_gesture
+from grip import (
+    GRIP_CLOSE_SPEED, GRIP_CLOSED, GRIP_LOAD, GRIP_RATE_HZ, GRIP_TIMEOUT, OUTCOME_NO_REPLY,
+    GripController, GripResult,
+)
+from kinematics import ARM_JOINTS
+from planner import DEFAULT_MOTION_LIMITS, plan_optimal, plan_spline, synchronized_profile
+from safety import LEFT, RIGHT, SAFETY_LIMITS, TrajectoryValidator
+from scheduler import CONTROL_RATE_HZ, SKEW_BUS, SKEW_QUEUE, DeadlineScheduler, DualTickStats, TickStats
+from state import JOINTS, ROW_LOAD, ROW_POSITION, ROW_VELOCITY, ArmState, StateWindow
+from telemetry import TELEMETRY_CAPACITY, TELEMETRY_RATE_HZ, TelemetryPoller
+from trajectory import (
+    Trajectory, cubic_profile, interpolate, linear_profile, trapezoidal_profile,
+)
+
 # Servo control table addresses
 ADDR_TORQUE_ENABLE = 40
 ADDR_GOAL_POSITION = 42
@@ -18,9 +42,30 @@ ADDR_PRESENT_POSITION = 56
 ADDR_MOVING_SPEED = 46
 ADDR_PRESENT_SPEED = 58
 ADDR_PRESENT_LOAD = 60
+ADDR_MOVING = 66
+
+# Present position, speed and load are contiguous (56-61), so one sync read
+# fetches the whole state block for every joint.
+STATE_BLOCK_ADDR = ADDR_PRESENT_POSITION
+STATE_BLOCK_LEN = 6
+
+# Goal position (42), goal time (44) and moving speed (46) are written
+# together in one sync write packet per tick.
+GOAL_BLOCK_ADDR = ADDR_GOAL_POSITION
+GOAL_BLOCK_LEN = 6
+
+# Position through the moving flag (56-66) in one read, for settle detection
+MOTION_STATUS_LEN = ADDR_MOVING - ADDR_PRESENT_POSITION + 1
 
-# Joint configuration
-JOINTS = ["shoulder_pan", "shoulder_lift", "elbow_flex", "wrist_flex", "wrist_roll", "gripper"]
+# Sign bits for the sign-magnitude registers
+SPEED_SIGN_BIT = 15
+LOAD_SIGN_BIT = 10
+
+# Cartesian moves: a joint step over this multiple of its velocity limit
+# means the IK solution jumped (branch flip, singularity), not a fast move
+CARTESIAN_JUMP_FACTOR = 2.0
+
+# Joint configuration (JOINTS order comes from state.py)
 JOINT_IDS = {name: i+1 for i, name in enumerate(JOINTS)}
 
 # Default limits (in servo units 0-4095, ~0-360°)
@@ -36,13 +81,132 @@ DEFAULT_LIMITS = {
 # Default movement speed (0-1023, 0=max). 250 is smooth but purposeful.
 DEFAULT_SPEED = 250
 
-@dataclass
-class ArmState:
-    """Current state of all joints"""
-    positions: Dict[str, int]  # Raw servo positions (0-4095)
-    velocities: Optional[Dict[str, int]] = None
-    loads: Optional[Dict[str, int]] = None
-    timestamp: float = 0.0
+# Motion-complete detection for move_to
+SETTLE_TOLERANCE = 15      # Servo units from goal counted as arrived
+SETTLE_POLL_INTERVAL = 0.01
+SETTLE_STOPPED_POLLS = 3   # Consecutive "not moving" polls counted as stopped short
+MOVE_TIMEOUT = 15.0
+
+# Registers the servo can change on its own (overload protection clears
+# torque enable), so a cached value can't be trusted to skip a write
+VOLATILE_REGISTERS = {ADDR_TORQUE_ENABLE}
+
+def _decode_signed(value: int, sign_bit: int) -> int:
+    """Convert a sign-magnitude register value to a signed int"""
+    if value & (1 << sign_bit):
+        return -(value & ~(1 << sign_bit))
+    return value
+
+class RegisterCache:
+    """
+    Shadow copy of control-table registers written to the servos.
+    
+    Writes whose value matches the shadow are skipped. The shadow is only
+    as good as the last successful write, so it is cleared on connect and
+    on any communication error.
+    """
+    
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._values: Dict[Tuple[int, int], int] = {}
+        self.written = 0  # Register writes sent
+        self.saved = 0    # Register writes skipped as redundant
+    
+    def matches(self, servo_id: int, addr: int, value: int) -> bool:
+        """True if the servo is known to hold value"""
+        return self.enabled and self._values.get((servo_id, addr)) == value
+    
+    def is_current(self, servo_id: int, addr: int, value: int) -> bool:
+        """Like matches(), but counts a match as a saved write"""
+        if self.matches(servo_id, addr, value):
+            self.saved += 1
+            return True
+        return False
+    
+    def store(self, servo_id: int, addr: int, value: int):
+        self.written += 1
+        self._values[(servo_id, addr)] = value
+    
+    def invalidate(self, servo_id: Optional[int] = None, addr: Optional[int] = None):
+        """Forget registers for one servo/address, one servo, or everything"""
+        if servo_id is None:
+            self._values.clear()
+        elif addr is None:
+            for key in [k for k in self._values if k[0] == servo_id]:
+                del self._values[key]
+        else:
+            self._values.pop((servo_id, addr), None)
+
+def joints_settled(
+    goals: Dict[str, int],
+    status: Dict[str, Tuple[int, bool]],
+    stopped_polls: Dict[str, int],
+    tolerance: int,
+) -> bool:
+    """
+    Evaluate one settle poll; updates stopped_polls in place.
+    
+    A joint is done when within tolerance of its goal, or when its moving
+    flag has stayed clear for SETTLE_STOPPED_POLLS consecutive polls.
+    """
+    done = True
+    for joint, goal in goals.items():
+        if joint not in status:
+            done = False
+            continue
+        position, moving = status[joint]
+        stopped_polls[joint] = 0 if moving else stopped_polls[joint] + 1
+        if abs(position - goal) > tolerance and stopped_polls[joint] < SETTLE_STOPPED_POLLS:
+            done = False
+    return done
+
+def as_trajectory(trajectory: Union[Trajectory, List[Dict[str, int]]], dt: Optional[float] = None) -> Trajectory:
+    """Trajectory (re-timed to dt if given), or a list of position dicts as one"""
+    if isinstance(trajectory, Trajectory):
+        if dt and dt != trajectory.dt:
+            return Trajectory(trajectory.positions, trajectory.joints, np.arange(len(trajectory)) * dt)
+        return trajectory
+    return Trajectory.from_waypoints(list(trajectory), dt or 0.02, JOINTS)
+
+class GripSession:
+    """
+    One grip in progress on an arm, advanced a tick at a time.
+    
+    Each tick reads the gripper's position, speed and load in one
+    transaction, feeds the GripController and writes its next goal.
+    """
+    
+    def __init__(self, arm, controller: Optional[GripController], joint: str, period: float, timeout: float, target: int):
+        self.arm = arm
+        self.controller = controller  # None if the gripper didn't answer at the start
+        self.joint = joint
+        self.period = period
+        self.timeout = timeout
+        self.target = target
+        self.missed = 0
+        self.start = time.perf_counter()
+    
+    @property
+    def done(self) -> bool:
+        if self.controller is None or self.controller.done:
+            return True
+        return time.perf_counter() - self.start >= self.timeout
+    
+    def tick(self):
+        sample = self.arm.read_joint_state(self.joint)
+        if sample is None:
+            self.missed += 1  # Keep the last goal; try again next tick
+            return
+        goal = self.controller.step(time.perf_counter() - self.start, *sample)
+        self.arm._write_goal_rows((self.joint,), (goal,), 0)
+        self.controller.written(time.perf_counter() - self.start)
+    
+    def result(self, elapsed: Optional[float] = None) -> GripResult:
+        if self.controller is None:
+            return GripResult(OUTCOME_NO_REPLY, None, 0, self.target, 0, math.nan, math.nan,
+                              self.period, 0.0, 0, 1, np.zeros((0, 4)))
+        elapsed = time.perf_counter() - self.start if elapsed is None else elapsed
+        return self.controller.result(elapsed, self.period, self.missed)
 
 class SmoothMotion:
     """
@@ -50,13 +214,56 @@ class SmoothMotion:
     Implements trajectory interpolation and velocity profiling.
     """
     
-    def __init__(self, port: str, baudrate: int = 1000000):
+    # Goal writes go straight to the bus (bus_process's proxy only queues them)
+    queues_writes = False
+    
+    def __init__(
+        self,
+        port: str,
+        baudrate: int = 1000000,
+        use_sync_read: bool = True,
+        use_sync_write: bool = True,
+        calibration: Optional[ArmCalibration] = None,
+        units: str = UNITS_RAW,
+    ):
+        """
+        Args:
+            calibration: Raw <-> normalized/angle mapping (e.g.
+                calibration.arm_calibration("follower")); uncalibrated
+                full range if None
+            units: Default units of positions passed in (UNITS_RAW,
+                UNITS_NORMALIZED or UNITS_RADIANS)
+        """
+        if units not in (UNITS_RAW, UNITS_NORMALIZED, UNITS_RADIANS):
+            raise ValueError(f"Unknown units: {units}")
         self.port = port
         self.baudrate = baudrate
         self.port_handler = None
         self.packet_handler = None
         self.connected = False
         self.joint_limits = DEFAULT_LIMITS.copy()
+        self.motion_limits = DEFAULT_MOTION_LIMITS.copy()
+        # What the validator rejects; planning stays within motion_limits
+        self.safety_limits = SAFETY_LIMITS.copy()
+        self.use_sync_read = use_sync_read
+        self.use_sync_write = use_sync_write
+        # Joints whose servos don't accept sync write get per-ID writes instead
+        self.sync_write_unsupported = set()
+        self._sync_reader = None
+        self._sync_writer = None
+        self.last_tick_stats: Optional[TickStats] = None
+        # Serializes bus access between the command path and telemetry
+        self.bus_lock = threading.RLock()
+        self.telemetry: Optional[TelemetryPoller] = None
+        self.register_cache = RegisterCache()
+        # Raw units <-> normalized units and joint angles
+        self.calibration: ArmCalibration = calibration or DEFAULT_CALIBRATION
+        self.units = units
+        self._ik = None
+        # Every trajectory is validated before streaming; mount (safety.LEFT
+        # or safety.RIGHT) also enables the body collision check
+        self.safety_checks = True
+        self.mount: Optional[int] = None
         
     def connect(self) -> bool:
         """Connect to the arm"""
@@ -68,43 +275,232 @@ class SmoothMotion:
             return False
         
         self.port_handler.setBaudRate(self.baudrate)
+        # Fresh connection: nothing is known about the servos' registers
+        self.register_cache.invalidate()
+        
+        # One sync read packet covers position, speed and load of all joints
+        self._sync_reader = sdk.GroupSyncRead(
+            self.port_handler, self.packet_handler, STATE_BLOCK_ADDR, STATE_BLOCK_LEN
+        )
+        for servo_id in JOINT_IDS.values():
+            self._sync_reader.addParam(servo_id)
+        
+        # Goal position + moving speed for all joints in one broadcast packet
+        self._sync_writer = sdk.GroupSyncWrite(
+            self.port_handler, self.packet_handler, GOAL_BLOCK_ADDR, GOAL_BLOCK_LEN
+        )
+        
         self.connected = True
         return True
     
     def disconnect(self):
         """Disconnect from the arm"""
+        self.stop_telemetry()
         if self.port_handler:
             self.port_handler.closePort()
+        self.register_cache.invalidate()
         self.connected = False
     
+    # ==================== UNITS ====================
+    
+    def to_raw(
+        self,
+        positions: Union[Dict[str, float], List[Dict[str, float]], Trajectory],
+        units: Optional[str] = None,
+    ):
+        """
+        Positions in `units` (default self.units) as raw servo units.
+        
+        Takes a {joint: value} dict, a list of them or a Trajectory and
+        returns the same kind, converted in one vectorized call.
+        """
+        units = units or self.units
+        if units == UNITS_RAW:
+            return positions
+        if isinstance(positions, Trajectory):
+            raw = self.calibration.convert(positions.positions, units, UNITS_RAW, positions.joints)
+            return Trajectory(np.rint(raw), positions.joints, positions.times)
+        if isinstance(positions, dict):
+            joints = list(positions)
+            raw = self.calibration.convert(list(positions.values()), units, UNITS_RAW, joints)
+            return dict(zip(joints, np.rint(raw).astype(int).tolist()))
+        positions = list(positions)
+        joints = list(positions[0]) if positions else []
+        if any(list(p) != joints for p in positions):
+            return [self.to_raw(p, units) for p in positions]
+        values = [[p[j] for j in joints] for p in positions]
+        raw = np.rint(self.calibration.convert(values, units, UNITS_RAW, joints)).astype(int).tolist()
+        return [dict(zip(joints, row)) for row in raw]
+    
+    def from_raw(self, positions: Dict[str, int], units: Optional[str] = None) -> Dict[str, float]:
+        """Raw {joint: value} positions in `units` (default self.units)"""
+        units = units or self.units
+        if units == UNITS_RAW:
+            return positions
+        joints = list(positions)
+        values = self.calibration.convert(list(positions.values()), UNITS_RAW, units, joints)
+        return dict(zip(joints, values.tolist()))
+    
+    def read_positions(self, units: Optional[str] = None) -> Dict[str, float]:
+        """Current joint positions in `units` (default self.units)"""
+        return self.from_raw(self.read_state().positions, units)
+    
     def read_state(self) -> ArmState:
-        """Read current state of all joints"""
-        positions = {}
+        """
+        Current state of all joints.
+        
+        With telemetry running this returns the latest background sample
+        without touching the bus; otherwise it reads the bus directly.
+        """
+        if self.telemetry is not None and self.telemetry.running:
+            latest = self.telemetry.latest()
+            if latest is not None:
+                return latest
+        return self.read_bus_state()
+    
+    def read_bus_state(self) -> ArmState:
+        """
+        Read current state of all joints from the bus.
+        
+        Uses a single sync read for position, speed and load when available,
+        falling back to per-joint position reads if the sync read fails.
+        """
+        with self.bus_lock:
+            start = time.perf_counter()
+            state = None
+            if self.use_sync_read and self._sync_reader is not None:
+                state = self._sync_read_state()
+            if state is None:
+                state = self._read_state_per_joint()
+            state.read_us = (time.perf_counter() - start) * 1e6
+        return state
+    
+    # ==================== TELEMETRY ====================
+    
+    def start_telemetry(self, rate: float = TELEMETRY_RATE_HZ, capacity: int = TELEMETRY_CAPACITY):
+        """
+        Start sampling state in the background.
+        
+        Args:
+            rate: Polling rate (Hz)
+            capacity: Number of samples kept in the history ring buffer
+        """
+        if self.telemetry is not None and self.telemetry.running:
+            return
+        self.telemetry = TelemetryPoller(self, rate=rate, capacity=capacity)
+        self.telemetry.start()
+    
+    def stop_telemetry(self):
+        """Stop background sampling"""
+        if self.telemetry is not None:
+            self.telemetry.stop()
+            self.telemetry = None
+    
+    def state_history(self, window_ms: float) -> List[ArmState]:
+        """Telemetry samples from the last window_ms milliseconds, oldest first"""
+        if self.telemetry is None:
+            return []
+        return self.telemetry.history(window_ms)
+    
+    def state_window(self, window_ms: float) -> Optional[StateWindow]:
+        """Telemetry from the last window_ms as (samples x joints) arrays"""
+        if self.telemetry is None:
+            return None
+        return self.telemetry.window(window_ms)
+    
+    def _sync_read_state(self) -> Optional[ArmState]:
+        """Read position, speed and load of all joints in one transaction"""
+        reader = self._sync_reader
+        result = reader.txRxPacket()
+        if result != sdk.COMM_SUCCESS:
+            # A servo that stopped answering may have browned out and reset
+            self.register_cache.invalidate()
+            return None
+        
+        # Fill the state arrays directly; no per-sample dicts
+        state = ArmState(timestamp=time.time(), transactions=1)
+        data, valid = state.data, state.valid
+        for i, servo_id in enumerate(JOINT_IDS.values()):
+            if not reader.isAvailable(servo_id, STATE_BLOCK_ADDR, STATE_BLOCK_LEN):
+                continue
+            data[ROW_POSITION, i] = reader.getData(servo_id, ADDR_PRESENT_POSITION, 2)
+            data[ROW_VELOCITY, i] = _decode_signed(
+                reader.getData(servo_id, ADDR_PRESENT_SPEED, 2), SPEED_SIGN_BIT
+            )
+            data[ROW_LOAD, i] = _decode_signed(
+                reader.getData(servo_id, ADDR_PRESENT_LOAD, 2), LOAD_SIGN_BIT
+            )
+            valid[:, i] = True
+        return state
+    
+    def _read_state_per_joint(self) -> ArmState:
+        """Read joint positions one servo at a time (legacy path)"""
+        state = ArmState(timestamp=time.time(), transactions=len(JOINT_IDS))
         for name, servo_id in JOINT_IDS.items():
             pos, result, _ = self.packet_handler.read2ByteTxRx(
                 self.port_handler, servo_id, ADDR_PRESENT_POSITION
             )
             if result == sdk.COMM_SUCCESS:
-                positions[name] = pos
+                state.set(ROW_POSITION, name, pos)
+        return state
+    
+    def read_joint_state(self, joint: str) -> Optional[Tuple[int, int, int]]:
+        """
+        Position, speed and load of one joint in a single read, for loops
+        that only watch one servo (e.g. grip).
         
-        return ArmState(positions=positions, timestamp=time.time())
+        Returns:
+            (position, velocity, load), or None if the servo didn't answer
+        """
+        with self.bus_lock:
+            data, result, _ = self.packet_handler.readTxRx(
+                self.port_handler, JOINT_IDS[joint], STATE_BLOCK_ADDR, STATE_BLOCK_LEN
+            )
+        if result != sdk.COMM_SUCCESS:
+            return None
+        return (
+            sdk.SCS_MAKEWORD(data[0], data[1]),
+            _decode_signed(sdk.SCS_MAKEWORD(data[2], data[3]), SPEED_SIGN_BIT),
+            _decode_signed(sdk.SCS_MAKEWORD(data[4], data[5]), LOAD_SIGN_BIT),
+        )
     
     def set_torque(self, enable: bool, joints: List[str] = None):
         """Enable/disable torque on joints"""
         joints = joints or JOINTS
         value = 1 if enable else 0
-        for name in joints:
-            self.packet_handler.write1ByteTxRx(
-                self.port_handler, JOINT_IDS[name], ADDR_TORQUE_ENABLE, value
-            )
+        with self.bus_lock:
+            for name in joints:
+                servo_id = JOINT_IDS[name]
+                if self._write_register(servo_id, ADDR_TORQUE_ENABLE, value, 1):
+                    # Torque changes can move the servo's internal goal
+                    self.register_cache.invalidate(servo_id, ADDR_GOAL_POSITION)
     
     def set_speed(self, speed: int, joints: List[str] = None):
         """Set movement speed for joints (0-1023, 0=max)"""
         joints = joints or JOINTS
-        for name in joints:
-            self.packet_handler.write2ByteTxRx(
-                self.port_handler, JOINT_IDS[name], ADDR_MOVING_SPEED, speed
-            )
+        with self.bus_lock:
+            for name in joints:
+                self._write_register(JOINT_IDS[name], ADDR_MOVING_SPEED, speed, 2)
+    
+    def _write_register(self, servo_id: int, addr: int, value: int, size: int) -> bool:
+        """
+        Write one register unless the cache says it already holds value
+        (VOLATILE_REGISTERS are always written).
+        
+        Returns:
+            True if a write was sent
+        """
+        if addr not in VOLATILE_REGISTERS and self.register_cache.is_current(servo_id, addr, value):
+            return False
+        if size == 1:
+            result, _ = self.packet_handler.write1ByteTxRx(self.port_handler, servo_id, addr, value)
+        else:
+            result, _ = self.packet_handler.write2ByteTxRx(self.port_handler, servo_id, addr, value)
+        if result == sdk.COMM_SUCCESS:
+            self.register_cache.store(servo_id, addr, value)
+        else:
+            self.register_cache.invalidate(servo_id)
+        return True
     
     def _clamp_position(self, joint: str, position: int) -> int:
         """Clamp position to joint limits"""
@@ -116,52 +512,187 @@ class SmoothMotion:
         position = self._clamp_position(joint, position)
         servo_id = JOINT_IDS[joint]
         
-        self.packet_handler.write2ByteTxRx(
-            self.port_handler, servo_id, ADDR_MOVING_SPEED, speed
-        )
-        self.packet_handler.write2ByteTxRx(
-            self.port_handler, servo_id, ADDR_GOAL_POSITION, position
-        )
+        with self.bus_lock:
+            self._write_register(servo_id, ADDR_MOVING_SPEED, speed, 2)
+            self._write_register(servo_id, ADDR_GOAL_POSITION, position, 2)
     
-    def move_joints(self, positions: Dict[str, int], speed: int = 300):
-        """Move multiple joints simultaneously"""
-        for joint, position in positions.items():
-            self.move_joint(joint, position, speed)
+    def move_joints(self, positions: Dict[str, int], speed: int = 300, units: Optional[str] = None):
+        """Move multiple joints simultaneously (positions in units, default self.units)"""
+        self.write_goals(self.to_raw(positions, units), speed)
+    
+    def write_goals(self, positions: Dict[str, int], speed: int = 0):
+        """
+        Write goal position and moving speed for several joints at once.
+        
+        Joints are packed into a single sync write packet (broadcast, no
+        status replies). Joints listed in sync_write_unsupported, or all
+        joints when use_sync_write is off, fall back to per-ID writes.
+        
+        Args:
+            positions: Goal positions for joints (servo units 0-4095)
+            speed: Moving speed for every joint (0-1023, 0=max)
+        """
+        self._write_goal_rows(positions.keys(), positions.values(), speed)
+    
+    def _write_goal_rows(self, joints: Sequence[str], positions: Sequence[int], speed: int):
+        """write_goals on parallel joint/position sequences (no dict needed)"""
+        writer = self._sync_writer
+        use_sync = self.use_sync_write and writer is not None
+        cache = self.register_cache
+        
+        with self.bus_lock:
+            if use_sync:
+                writer.clearParam()
+            
+            pending = []
+            for joint, position in zip(joints, positions):
+                if not use_sync or joint in self.sync_write_unsupported:
+                    self.move_joint(joint, position, speed)
+                    continue
+                position = self._clamp_position(joint, position)
+                servo_id = JOINT_IDS[joint]
+                # The block carries both registers, so skip only if both match
+                if (cache.matches(servo_id, ADDR_GOAL_POSITION, position)
+                        and cache.matches(servo_id, ADDR_MOVING_SPEED, speed)):
+                    cache.saved += 2
+                    continue
+                writer.addParam(servo_id, [
+                    sdk.SCS_LOBYTE(position), sdk.SCS_HIBYTE(position),
+                    0, 0,  # goal time: unused, speed governs the move
+                    sdk.SCS_LOBYTE(speed), sdk.SCS_HIBYTE(speed),
+                ])
+                pending.append((servo_id, position))
+            
+            if not pending:
+                return
+            if writer.txPacket() != sdk.COMM_SUCCESS:
+                cache.invalidate()
+                return
+            for servo_id, position in pending:
+                cache.store(servo_id, ADDR_GOAL_POSITION, position)
+                cache.store(servo_id, ADDR_MOVING_SPEED, speed)
     
     # ==================== RECOMMENDED API ====================
     
-    def move_to(self, positions: Dict[str, int], speed: int = None, wait: float = None):
+    def move_to(
+        self,
+        positions: Dict[str, int],
+        speed: int = None,
+        wait: float = None,
+        timeout: float = MOVE_TIMEOUT,
+        tolerance: int = SETTLE_TOLERANCE,
+        units: Optional[str] = None,
+    ) -> float:
         """
         Move to target positions using servo's native motion control.
         This is the recommended way to move - smooth and efficient.
         
         Args:
-            positions: Target positions for joints (servo units 0-4095)
+            positions: Target positions for joints (in units)
             speed: Movement speed (0-1023, 0=max). Default: DEFAULT_SPEED (250)
-            wait: Optional seconds to wait after sending command.
-                  If None, estimates based on distance and speed.
+            wait: Optional fixed seconds to wait after sending command.
+                  If None, waits until the motion actually completes.
+            timeout: Longest to wait for completion (seconds)
+            tolerance: Distance from goal counted as arrived (servo units)
+            units: Units of positions (default self.units)
+        
+        Returns:
+            Seconds from command to settled (or the fixed wait)
         """
         speed = speed if speed is not None else DEFAULT_SPEED
-        self.move_joints(positions, speed=speed)
+        positions = self.to_raw(positions, units)
+        self.move_joints(positions, speed=speed, units=UNITS_RAW)
         
         if wait is not None:
             time.sleep(wait)
-        else:
-            # Estimate wait time based on max distance and speed
-            current = self.read_state().positions
-            max_dist = 0
-            for joint, target in positions.items():
-                if joint in current:
-                    dist = abs(target - current[joint])
-                    max_dist = max(max_dist, dist)
-            # Rough estimate: speed 250 moves ~500 units/sec
-            estimated_time = (max_dist / 500) * (250 / max(speed, 1)) + 0.1
-            time.sleep(min(estimated_time, 3.0))  # Cap at 3 seconds
+            return wait
+        
+        settle_time, settled = self.wait_until_settled(positions, timeout, tolerance)
+        if not settled:
+            print(f"move_to: not settled after {timeout:.1f}s")
+        return settle_time
+    
+    def wait_until_settled(
+        self,
+        positions: Dict[str, int],
+        timeout: float = MOVE_TIMEOUT,
+        tolerance: int = SETTLE_TOLERANCE,
+    ) -> Tuple[float, bool]:
+        """
+        Block until the given joints finish moving toward their goals.
+        
+        A joint is done when it is within tolerance of its goal, or when its
+        moving flag has stayed clear for SETTLE_STOPPED_POLLS polls (blocked
+        or stalled short of the goal). Each poll is one bulk read of
+        position and moving flag for all joints.
+        
+        Returns:
+            (seconds waited, whether every joint settled before timeout)
+        """
+        goals = self.settle_goals(positions)
+        stopped_polls = {j: 0 for j in goals}
+        start = time.perf_counter()
+        
+        while True:
+            status = self.read_motion_status(list(goals))
+            done = joints_settled(goals, status, stopped_polls, tolerance)
+            elapsed = time.perf_counter() - start
+            if done:
+                return elapsed, True
+            if elapsed >= timeout:
+                return elapsed, False
+            time.sleep(SETTLE_POLL_INTERVAL)
+    
+    def settle_goals(self, positions: Dict[str, int]) -> Dict[str, int]:
+        """Goals as the servos will see them, i.e. after clamping"""
+        return {j: self._clamp_position(j, p) for j, p in positions.items()}
+    
+    def read_motion_status(self, joints: List[str] = None) -> Dict[str, Tuple[int, bool]]:
+        """
+        Read present position and moving flag for joints.
+        
+        Uses one sync read over 56-66 when sync reads are enabled,
+        otherwise two per-ID reads per joint.
+        
+        Returns:
+            {joint: (position, moving)} for joints that responded
+        """
+        joints = joints or JOINTS
+        status = {}
+        with self.bus_lock:
+            if self.use_sync_read and self._sync_reader is not None:
+                reader = sdk.GroupSyncRead(
+                    self.port_handler, self.packet_handler,
+                    ADDR_PRESENT_POSITION, MOTION_STATUS_LEN
+                )
+                for joint in joints:
+                    reader.addParam(JOINT_IDS[joint])
+                if reader.txRxPacket() == sdk.COMM_SUCCESS:
+                    for joint in joints:
+                        servo_id = JOINT_IDS[joint]
+                        if reader.isAvailable(servo_id, ADDR_PRESENT_POSITION, MOTION_STATUS_LEN):
+                            status[joint] = (
+                                reader.getData(servo_id, ADDR_PRESENT_POSITION, 2),
+                                bool(reader.getData(servo_id, ADDR_MOVING, 1)),
+                            )
+                    return status
+            
+            for joint in joints:
+                servo_id = JOINT_IDS[joint]
+                pos, result, _ = self.packet_handler.read2ByteTxRx(
+                    self.port_handler, servo_id, ADDR_PRESENT_POSITION
+                )
+                moving, moving_result, _ = self.packet_handler.read1ByteTxRx(
+                    self.port_handler, servo_id, ADDR_MOVING
+                )
+                if result == sdk.COMM_SUCCESS and moving_result == sdk.COMM_SUCCESS:
+                    status[joint] = (pos, bool(moving))
+        return status
     
     def go_home(self, speed: int = None):
         """Move all joints to center position (2048)"""
         home = {joint: 2048 for joint in JOINTS}
-        self.move_to(home, speed=speed)
+        self.move_to(home, speed=speed, units=UNITS_RAW)
     
     # ==================== SMOOTH MOTION (LEGACY) ====================
     
@@ -169,43 +700,53 @@ class SmoothMotion:
         self, 
         start: Dict[str, int], 
         end: Dict[str, int], 
-        steps: int
-    ) -> List[Dict[str, int]]:
+        steps: int,
+        dt: float = 0.02
+    ) -> Trajectory:
         """
         Generate linear interpolation between two positions.
-        Returns list of intermediate positions.
-        """
-        trajectory = []
-        for i in range(steps + 1):
-            t = i / steps
-            point = {}
-            for joint in JOINTS:
-                if joint in start and joint in end:
-                    point[joint] = int(start[joint] + t * (end[joint] - start[joint]))
-            trajectory.append(point)
-        return trajectory
+        Returns a (steps + 1) x joints Trajectory.
+        """
+        return interpolate(start, end, linear_profile(steps), dt, JOINTS)
     
     def cubic_interpolate(
         self,
         start: Dict[str, int],
         end: Dict[str, int],
-        steps: int
-    ) -> List[Dict[str, int]]:
+        steps: int,
+        dt: float = 0.02
+    ) -> Trajectory:
         """
         Generate cubic (ease-in-out) interpolation.
         Smoother acceleration/deceleration at endpoints.
         """
-        trajectory = []
-        for i in range(steps + 1):
-            # Cubic ease-in-out: t' = 3t² - 2t³
-            t = i / steps
-            t_smooth = 3 * t * t - 2 * t * t * t
-            
-            point = {}
-            for joint in JOINTS:
-                if joint in start and joint in end:
-                    point[joint] = int(start[joint] + t_smooth * (end[joint] - start[joint]))
-            trajectory.append(point)
+        return interpolate(start, end, cubic_profile(steps), dt, JOINTS)
+    
+    def cartesian_interpolate(
+        self,
+        start: Dict[str, int],
+        end: Dict[str, int],
+        steps: int,
+        dt: float = 0.02
+    ) -> Trajectory:
+        """
+        Generate a straight-line gripper path with cubic easing.
+        Joint-space interpolation swings the gripper through an arc; here
+        every waypoint is solved by IK in one batch instead. The gripper
+        jaw itself is blended in joint space.
+        
+        Raises:
+            ValueError: If the line leaves the reachable workspace or a
+                joint would jump between waypoints
+        """
+        progress = cubic_profile(steps)
+        max_step = np.array([self.motion_limits[j].velocity * dt for j in ARM_JOINTS]) * CARTESIAN_JUMP_FACTOR
+        arm = self.ik.cartesian_path(start, end, progress, max_step)
+        # Arm joints missing from end still move to keep the line straight
+        end = {**{j: start[j] for j in ARM_JOINTS}, **end}
+        trajectory = interpolate(start, end, progress, dt, JOINTS)
+        columns = [trajectory.joints.index(j) for j in ARM_JOINTS]
+        trajectory.positions[:, columns] = arm
         return trajectory
     
     def trapezoidal_velocity(
@@ -213,126 +754,390 @@ class SmoothMotion:
         start: Dict[str, int],
         end: Dict[str, int],
         steps: int,
-        accel_fraction: float = 0.25
-    ) -> List[Dict[str, int]]:
+        accel_fraction: float = 0.25,
+        dt: float = 0.02
+    ) -> Trajectory:
         """
         Generate trapezoidal velocity profile.
         - Accelerates for first accel_fraction of motion
         - Constant velocity in middle
         - Decelerates for last accel_fraction of motion
         """
-        trajectory = []
-        accel_steps = int(steps * accel_fraction)
-        
-        for i in range(steps + 1):
-            if i < accel_steps:
-                # Acceleration phase: quadratic ramp
-                t = 0.5 * (i / accel_steps) ** 2 * accel_fraction
-            elif i > steps - accel_steps:
-                # Deceleration phase
-                remaining = (steps - i) / accel_steps
-                t = 1.0 - 0.5 * remaining ** 2 * accel_fraction
-            else:
-                # Constant velocity phase
-                t = accel_fraction / 2 + (i - accel_steps) / (steps - 2 * accel_steps) * (1 - accel_fraction)
-            
-            point = {}
-            for joint in JOINTS:
-                if joint in start and joint in end:
-                    point[joint] = int(start[joint] + t * (end[joint] - start[joint]))
-            trajectory.append(point)
-        
-        return trajectory
+        return interpolate(start, end, trapezoidal_profile(steps, accel_fraction), dt, JOINTS)
     
     def execute_trajectory(
         self,
-        trajectory: List[Dict[str, int]],
-        dt: float = 0.02,
-        speed: int = 0  # 0 = max speed (servo handles timing)
-    ):
+        trajectory: Union[Trajectory, List[Dict[str, int]]],
+        dt: Optional[float] = None,
+        speed: int = 0,  # 0 = max speed (servo handles timing)
+        units: Optional[str] = None,
+    ) -> TickStats:
         """
         Execute a trajectory by sending waypoints at regular intervals.
         
+        Waypoint i is sent at start + i * dt on the monotonic clock, so bus
+        latency doesn't stretch the move. If a tick runs late, overdue
+        waypoints are skipped in favor of the latest due one.
+        
         Args:
-            trajectory: List of position dictionaries
-            dt: Time between waypoints (seconds)
+            trajectory: Trajectory array, or list of position dictionaries
+            dt: Time between waypoints (seconds). Defaults to the
+                Trajectory's own spacing, or 0.02 for a list.
             speed: Servo speed setting (0=max, let dt control timing)
+            units: Units of the waypoints (default self.units)
+        
+        Returns:
+            TickStats with per-tick jitter, overruns and achieved rate
         """
         self.set_torque(True)
-        self.set_speed(speed)
         
-        for waypoint in trajectory:
-            for joint, position in waypoint.items():
-                position = self._clamp_position(joint, position)
-                self.packet_handler.write2ByteTxRx(
-                    self.port_handler, 
-                    JOINT_IDS[joint], 
-                    ADDR_GOAL_POSITION, 
-                    position
-                )
-            time.sleep(dt)
+        # Each waypoint carries the speed, so no separate set_speed pass
+        dt, tick = self.trajectory_ticks(trajectory, dt, speed, units=units)
+        scheduler = DeadlineScheduler(dt)
+        stats = scheduler.run(len(trajectory), tick)
+        self.last_tick_stats = stats
+        return stats
+    
+    def validator(self):
+        """TrajectoryValidator for the current limits, calibration and mount"""
+        return TrajectoryValidator(self.joint_limits, self.safety_limits, self.calibration, self.mount)
+    
+    def validate_trajectory(
+        self,
+        trajectory: Union[Trajectory, List[Dict[str, int]]],
+        dt: Optional[float] = None,
+    ):
+        """
+        Check a whole trajectory against joint limits, velocity and
+        acceleration bounds and, with a mount set, the robot's body.
+        
+        Returns:
+            safety.SafetyReport
+        """
+        trajectory = as_trajectory(trajectory, dt)
+        return self.validator().check(trajectory, self._rest_pose(trajectory))
+    
+    def check_trajectory(
+        self,
+        trajectory: Union[Trajectory, List[Dict[str, int]]],
+        dt: Optional[float] = None,
+    ):
+        """validate_trajectory, raising ValueError if anything fails"""
+        report = self.validate_trajectory(trajectory, dt)
+        if not report.ok:
+            print(f"🛑 {report}")
+            raise ValueError(str(report))
+        return report
+    
+    def _rest_pose(self, trajectory: Trajectory) -> Optional[Dict[str, int]]:
+        """Present positions of the joints a trajectory leaves alone, if the body check needs them"""
+        if self.mount is None or all(j in trajectory.joints for j in ARM_JOINTS):
+            return None
+        return self.read_state().positions
+    
+    def prepare_trajectory(
+        self,
+        trajectory: Union[Trajectory, List[Dict[str, int]]],
+        dt: Optional[float] = None,
+        validate: bool = True,
+        units: Optional[str] = None,
+    ) -> Union[Trajectory, List[Dict[str, int]]]:
+        """Trajectory converted to raw units and, with safety_checks on, validated"""
+        trajectory = self.to_raw(trajectory, units)
+        if validate and self.safety_checks:
+            self.check_trajectory(trajectory, dt)
+        return trajectory
+    
+    def trajectory_ticks(
+        self,
+        trajectory: Union[Trajectory, List[Dict[str, int]]],
+        dt: Optional[float] = None,
+        speed: int = 0,
+        validate: bool = True,
+        units: Optional[str] = None,
+    ) -> Tuple[float, Callable[[int], None]]:
+        """
+        Resolve the tick period and per-tick write for a trajectory.
+        
+        Raises:
+            ValueError: If the trajectory fails validate_trajectory
+        
+        Returns:
+            (dt, tick) where tick(i) writes waypoint i to the bus
+        """
+        trajectory = self.prepare_trajectory(trajectory, dt, validate, units)
+        if isinstance(trajectory, Trajectory):
+            # Clamp once up front, then stream rows straight from the array
+            joints = trajectory.joints
+            rows = trajectory.clipped(self.joint_limits).positions.tolist()
+            return dt or trajectory.dt or 0.02, lambda i: self._write_goal_rows(joints, rows[i], speed)
+        return dt or 0.02, lambda i: self.write_goals(trajectory[i], speed)
     
     def smooth_move(
         self,
         target: Dict[str, int],
         duration: float = 1.0,
-        profile: str = "cubic"
-    ):
+        profile: str = "cubic",
+        rate: float = CONTROL_RATE_HZ,
+        units: Optional[str] = None,
+    ) -> TickStats:
         """
         High-level smooth move to target position.
         
         Args:
-            target: Target positions for joints
-            duration: Total movement time (seconds)
-            profile: Interpolation profile ("linear", "cubic", "trapezoidal")
+            target: Target positions for joints (in units, default self.units)
+            duration: Total movement time (seconds). Ignored by "optimal",
+                      which takes the shortest time motion_limits allow.
+            profile: Interpolation profile ("linear", "cubic", "trapezoidal",
+                     "optimal", or "cartesian" for a straight gripper path)
+            rate: Waypoint update rate (Hz)
+        
+        Returns:
+            TickStats for the executed trajectory
         """
         current = self.read_state()
+        trajectory = self.plan_move(current.positions, self.to_raw(target, units), duration, profile, rate)
+        return self.execute_trajectory(trajectory, speed=0, units=UNITS_RAW)
+    
+    def move_through(
+        self,
+        poses: List[Union[str, Dict[str, int]]],
+        named_poses: Optional[Dict[str, Dict[str, int]]] = None,
+        dwell: Optional[List[float]] = None,
+        speed_scale: float = 1.0,
+        rate: float = CONTROL_RATE_HZ,
+        units: Optional[str] = None,
+    ) -> TickStats:
+        """
+        Flow through a sequence of poses as one continuous trajectory.
+        
+        A cubic spline with continuous velocity and acceleration passes
+        through every pose without stopping, except where a dwell time is
+        given, and is streamed through execute_trajectory.
+        
+        Args:
+            poses: Ordered poses, as names in named_poses or position dicts.
+                   Partial dicts only move the joints they list.
+            named_poses: Lookup table for pose names (e.g. careful_grab.POSITIONS)
+            dwell: Optional hold time (seconds) after each pose
+            speed_scale: Fraction of motion_limits to use (0-1]
+            rate: Waypoint update rate (Hz)
+            units: Units of the poses (default self.units)
         
-        # Calculate steps based on duration (50Hz update rate)
-        steps = max(int(duration * 50), 10)
+        Returns:
+            TickStats for the executed trajectory
+        """
+        named_poses = named_poses or {}
+        resolved = [self.to_raw(named_poses[p] if isinstance(p, str) else p, units) for p in poses]
+        if dwell is not None:
+            dwell = [0.0] + list(dwell)  # Nothing to hold at the start
+        
+        current = self.read_state().positions
+        trajectory = plan_spline(
+            [current] + resolved, 1.0 / rate, JOINTS, self.motion_limits, dwell, speed_scale
+        )
+        return self.execute_trajectory(trajectory, speed=0, units=UNITS_RAW)
+    
+    def plan_move(
+        self,
+        start: Dict[str, int],
+        target: Dict[str, int],
+        duration: float = 1.0,
+        profile: str = "cubic",
+        rate: float = CONTROL_RATE_HZ,
+    ) -> Trajectory:
+        """Generate the trajectory smooth_move would execute from start"""
+        if profile == "optimal":
+            return plan_optimal(start, target, 1.0 / rate, JOINTS, self.motion_limits)
+        
+        # Calculate steps based on duration and update rate
+        steps = max(int(duration * rate), 10)
         dt = duration / steps
         
-        # Generate trajectory
         if profile == "linear":
-            trajectory = self.linear_interpolate(current.positions, target, steps)
+            return self.linear_interpolate(start, target, steps, dt=dt)
         elif profile == "cubic":
-            trajectory = self.cubic_interpolate(current.positions, target, steps)
+            return self.cubic_interpolate(start, target, steps, dt=dt)
         elif profile == "trapezoidal":
-            trajectory = self.trapezoidal_velocity(current.positions, target, steps)
-        else:
-            raise ValueError(f"Unknown profile: {profile}")
+            return self.trapezoidal_velocity(start, target, steps, dt=dt)
+        elif profile == "cartesian":
+            return self.cartesian_interpolate(start, target, steps, dt=dt)
+        raise ValueError(f"Unknown profile: {profile}")
+    
+    @property
+    def ik(self):
+        """IK solver for this arm's calibration and joint limits (built on first use)"""
+        from ik import IKSolver
+        if self._ik is None or self._ik.calibration is not self.calibration:
+            self._ik = IKSolver(self.calibration, self.joint_limits)
+        return self._ik
+    
+    def move_to_pose(
+        self,
+        position: Sequence[float],
+        rotation: Optional[np.ndarray] = None,
+        duration: float = 1.0,
+        profile: str = "cubic",
+        rate: float = CONTROL_RATE_HZ,
+    ):
+        """
+        Move the gripper to a Cartesian position (metres, arm base frame).
         
-        # Execute
-        self.execute_trajectory(trajectory, dt=dt, speed=0)
+        IK is warm-started from the current pose, so nearby targets solve
+        in a few iterations and keep the same elbow configuration. The
+        gripper jaw is left as it is. Nothing moves if IK doesn't converge.
+        
+        Args:
+            position: Target (x, y, z) of the point between the gripper jaws
+            rotation: Optional 3x3 gripper orientation to approach
+            duration: Movement time (seconds)
+            profile: Joint-space profile passed to smooth_move
+            rate: Waypoint update rate (Hz)
+        
+        Returns:
+            IKResult for the target
+        """
+        current = self.read_state().positions
+        result = self.ik.solve(position, seed=current, rotation=rotation)
+        if not result.converged:
+            print(f"⚠️  No IK solution for {[round(float(v), 3) for v in position]} "
+                  f"(closest {result.error * 1000:.1f}mm away), not moving")
+            return result
+        self.smooth_move(result.positions, duration, profile, rate, units=UNITS_RAW)
+        return result
     
-    def wave(self, joint: str = "wrist_roll", amplitude: int = 400, cycles: int = 3, period: float = 0.5):
-        """Do a wave motion on a joint"""
-        current = self.read_state()
-        center = current.positions.get(joint, 2048)
+    def grip(
+        self,
+        target: Optional[float] = None,
+        grip_load: Optional[int] = GRIP_LOAD,
+        close_speed: float = GRIP_CLOSE_SPEED,
+        rate: float = GRIP_RATE_HZ,
+        timeout: float = GRIP_TIMEOUT,
+        joint: str = "gripper",
+        units: Optional[str] = None,
+    ) -> GripResult:
+        """
+        Close the gripper until it touches something, then hold.
         
-        self.set_torque(True, [joint])
-        self.set_speed(400, [joint])
+        Each tick reads the gripper's position, speed and load in one
+        transaction, checks for contact or a stall, and writes the next
+        goal, so the close stops on the tick contact shows up rather than
+        after a fixed wait.
         
-        steps_per_cycle = int(period * 50)
+        Args:
+            target: Goal when nothing is in the way, in `units` (default
+                self.units); None for GRIP_CLOSED servo units
+            grip_load: |load| to settle at after contact, or None to hold
+                at the contact position
+            close_speed: Goal sweep speed while closing (units/s)
+            rate: Sample/command rate (Hz)
+            timeout: Longest the whole grip may take (seconds)
+            units: Units of target
         
-        for cycle in range(cycles):
-            for i in range(steps_per_cycle):
-                t = i / steps_per_cycle
-                offset = int(amplitude * math.sin(2 * math.pi * t))
-                self.move_joint(joint, center + offset)
-                time.sleep(period / steps_per_cycle)
+        Returns:
+            GripResult with the outcome and detection latencies
+        """
+        session = self.begin_grip(target, grip_load, close_speed, rate, timeout, joint, units)
+        if session.done:
+            return session.result()
+        stop = threading.Event()
         
-        # Return to center
-        self.move_joint(joint, center)
+        def tick(i):
+            session.tick()
+            if session.controller.done:
+                stop.set()
+        
+        stats = DeadlineScheduler(session.period).run(int(math.ceil(timeout * rate)) + 1, tick, stop)
+        self.last_tick_stats = stats
+        return session.result(stats.elapsed)
+    
+    def begin_grip(
+        self,
+        target: Optional[float] = None,
+        grip_load: Optional[int] = GRIP_LOAD,
+        close_speed: float = GRIP_CLOSE_SPEED,
+        rate: float = GRIP_RATE_HZ,
+        timeout: float = GRIP_TIMEOUT,
+        joint: str = "gripper",
+        units: Optional[str] = None,
+    ) -> "GripSession":
+        """
+        Start a grip without running its loop: call tick() on the returned
+        session every period until done. For loops that own the bus and
+        have other work to interleave (bus_process's worker); grip() is
+        this plus a DeadlineScheduler.
+        """
+        target = GRIP_CLOSED if target is None else self.to_raw({joint: target}, units)[joint]
+        sample = self.read_joint_state(joint)
+        if sample is None:
+            return GripSession(self, None, joint, 1.0 / rate, timeout, target)
+        controller = GripController(
+            sample[0], self._clamp_position(joint, target), close_speed, grip_load, rate=rate,
+        )
+        self.set_torque(True, [joint])
+        return GripSession(self, controller, joint, 1.0 / rate, timeout, target)
+    
+    def perform(self, gesture: Gesture, rate: float = CONTROL_RATE_HZ, speed: int = 0) -> TickStats:
+        """
+        Play a periodic gesture around the current pose.
+        
+        The gesture is slowed down if needed to stay within
+        motion_limits, sampled in one pass and streamed on the deadline
+        scheduler with one sync write per tick. Only the gesture's joints
+        are torqued and written; the arm ends back where it started.
+        
+        Returns:
+            TickStats for the run
+        """
+        gesture = gesture.within(self.motion_limits)
+        trajectory = gesture.trajectory(self.read_state().positions, rate)
+        self.set_torque(True, gesture.joints)
+        dt, tick = self.trajectory_ticks(trajectory, speed=speed, units=UNITS_RAW)
+        self.last_tick_stats = DeadlineScheduler(dt).run(len(trajectory), tick)
+        return self.last_tick_stats
+    
+    def wave(self, joint: str = "wrist_roll", amplitude: int = 150, cycles: int = 3, period: float = 1.25):
+        """Do a wave motion on a joint"""
+        self.perform(wave_gesture(joint, amplitude, cycles, period))
         time.sleep(0.3)
         self.set_torque(False, [joint])
 
 class DualArmController:
     """Controller for synchronized dual-arm movements"""
     
-    def __init__(self, leader_port: str, follower_port: str):
-        self.leader = SmoothMotion(leader_port)
-        self.follower = SmoothMotion(follower_port)
+    def __init__(
+        self,
+        leader_port: str,
+        follower_port: str,
+        processes: bool = False,
+        calibrations: Optional[Dict[str, ArmCalibration]] = None,
+        units: str = UNITS_RAW,
+    ):
+        """
+        Args:
+            processes: Run each arm's bus I/O in its own worker process
+                (bus_process.ProcessSmoothMotion)
+            calibrations: {"leader": ..., "follower": ...} calibrations
+            units: Default units of positions passed to either arm
+        """
+        if processes:
+            from bus_process import ProcessSmoothMotion as arm_class
+        else:
+            arm_class = SmoothMotion
+        calibrations = calibrations or {}
+        self.leader = arm_class(leader_port, calibration=calibrations.get("leader"), units=units)
+        self.follower = arm_class(follower_port, calibration=calibrations.get("follower"), units=units)
+        # Both arms ride on the body's mounts: leader left, follower right
+        self.leader.mount = LEFT
+        self.follower.mount = RIGHT
+    
+    @classmethod
+    def from_config(cls, processes: bool = False, units: str = UNITS_RAW) -> "DualArmController":
+        """Both arms with the ports and calibrations from the LeRobot config"""
+        return cls(
+            arm_port("leader"), arm_port("follower"), processes,
+            {role: arm_calibration(role) for role in ("leader", "follower")}, units,
+        )
     
     def connect(self) -> bool:
         return self.leader.connect() and self.follower.connect()
@@ -341,44 +1146,184 @@ class DualArmController:
         self.leader.disconnect()
         self.follower.disconnect()
     
-    def mirror_move(self, target: Dict[str, int], duration: float = 1.0):
-        """Move both arms to same position (mirrored)"""
-        import threading
+    def mirror_move(
+        self,
+        target: Dict[str, int],
+        duration: float = 1.0,
+        profile: str = "cubic",
+        rate: float = CONTROL_RATE_HZ,
+        parallel: bool = False,
+        units: Optional[str] = None,
+    ) -> DualTickStats:
+        """
+        Move both arms to same position (mirrored), in phase on one clock.
         
-        def move_arm(arm, target):
-            arm.smooth_move(target, duration=duration)
+        A normalized target is mapped through each arm's own calibration,
+        so both reach the same pose even where their raw ranges differ.
+        """
+        leader_start = self.leader.read_state().positions
+        follower_start = self.follower.read_state().positions
+        leader_target = self.leader.to_raw(target, units)
+        follower_target = self.follower.to_raw(target, units)
         
-        t1 = threading.Thread(target=move_arm, args=(self.leader, target))
-        t2 = threading.Thread(target=move_arm, args=(self.follower, target))
+        if profile == "optimal":
+            # One profile for both arms, so the slower arm sets the pace
+            start = {("leader", j): p for j, p in leader_start.items()}
+            start.update({("follower", j): p for j, p in follower_start.items()})
+            targets = {"leader": leader_target, "follower": follower_target}
+            end = {(arm, j): targets[arm][j] for arm, j in start if j in target}
+            limits = {(arm, j): self.leader.motion_limits[j] for arm, j in start
+                      if j in self.leader.motion_limits}
+            shared = synchronized_profile(start, end, limits)
+            dt = 1.0 / rate
+            steps = max(int(math.ceil(shared.duration / dt)), 1)
+            progress, _, _ = shared.sample(np.arange(steps + 1) * dt)
+            leader_traj = interpolate(leader_start, leader_target, progress, dt, JOINTS)
+            follower_traj = interpolate(follower_start, follower_target, progress, dt, JOINTS)
+        else:
+            leader_traj = self.leader.plan_move(leader_start, leader_target, duration, profile, rate)
+            follower_traj = self.follower.plan_move(follower_start, follower_target, duration, profile, rate)
         
-        t1.start()
-        t2.start()
-        t1.join()
-        t2.join()
+        return self.execute_coordinated(leader_traj, follower_traj, parallel=parallel, units=UNITS_RAW)
     
-    def synchronized_wave(self, cycles: int = 3):
-        """Both arms wave together"""
-        import threading
+    def execute_coordinated(
+        self,
+        leader_trajectory: Union[Trajectory, List[Dict[str, int]]],
+        follower_trajectory: Union[Trajectory, List[Dict[str, int]]],
+        dt: Optional[float] = None,
+        speed: int = 0,
+        parallel: bool = False,
+        units: Optional[str] = None,
+    ) -> DualTickStats:
+        """
+        Stream one trajectory per arm from a single deadline scheduler.
+        
+        Each tick writes both buses, back-to-back on this thread or, with
+        parallel=True, concurrently on two worker threads. The shorter
+        trajectory holds its last waypoint until the longer one ends.
+        
+        Returns:
+            DualTickStats with timing plus per-tick inter-arm skew
+            (follower write completion minus leader write completion)
+        """
+        leader_trajectory = self.leader.to_raw(leader_trajectory, units)
+        follower_trajectory = self.follower.to_raw(follower_trajectory, units)
+        self.leader.set_torque(True)
+        self.follower.set_torque(True)
+        return self._stream_coordinated(leader_trajectory, follower_trajectory, dt, speed, parallel)
+    
+    def _stream_coordinated(
+        self,
+        leader_trajectory: Union[Trajectory, List[Dict[str, int]]],
+        follower_trajectory: Union[Trajectory, List[Dict[str, int]]],
+        dt: Optional[float],
+        speed: int,
+        parallel: bool,
+    ) -> DualTickStats:
+        """execute_coordinated without touching torque"""
+        self.check_trajectories(leader_trajectory, follower_trajectory, dt)
+        dt, leader_tick = self.leader.trajectory_ticks(leader_trajectory, dt, speed, validate=False, units=UNITS_RAW)
+        _, follower_tick = self.follower.trajectory_ticks(follower_trajectory, dt, speed, validate=False, units=UNITS_RAW)
+        n_leader, n_follower = len(leader_trajectory), len(follower_trajectory)
+        # Worker-process arms only queue setpoints on the tick, so the skew
+        # measured there is hand-off time, not bus time
+        queued = self.leader.queues_writes or self.follower.queues_writes
+        stats = DualTickStats(period=dt, skew_basis=SKEW_QUEUE if queued else SKEW_BUS)
+        
+        def timed(tick, i):
+            tick(i)
+            return time.perf_counter()
+        
+        pool = ThreadPoolExecutor(max_workers=2) if parallel else None
+        
+        def tick(i):
+            i_leader, i_follower = min(i, n_leader - 1), min(i, n_follower - 1)
+            if pool is not None:
+                leader_done = pool.submit(timed, leader_tick, i_leader)
+                follower_done = pool.submit(timed, follower_tick, i_follower)
+                stats.skew.append(follower_done.result() - leader_done.result())
+            else:
+                t_leader = timed(leader_tick, i_leader)
+                t_follower = timed(follower_tick, i_follower)
+                stats.skew.append(t_follower - t_leader)
+        
+        try:
+            DeadlineScheduler(dt).run(max(n_leader, n_follower), tick, stats=stats)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        self.leader.last_tick_stats = self.follower.last_tick_stats = stats
+        return stats
+    
+    def check_trajectories(
+        self,
+        leader_trajectory: Union[Trajectory, List[Dict[str, int]]],
+        follower_trajectory: Union[Trajectory, List[Dict[str, int]]],
+        dt: Optional[float] = None,
+    ):
+        """
+        Validate both arms' trajectories together, including the distance
+        between the arms at every waypoint.
         
-        t1 = threading.Thread(target=self.leader.wave, kwargs={"cycles": cycles})
-        t2 = threading.Thread(target=self.follower.wave, kwargs={"cycles": cycles})
+        Raises:
+            ValueError: If either arm's trajectory fails a check
         
-        t1.start()
-        t2.start()
-        t1.join()
-        t2.join()
+        Returns:
+            safety.SafetyReport
+        """
+        leader_trajectory = as_trajectory(leader_trajectory, dt)
+        follower_trajectory = as_trajectory(follower_trajectory, dt)
+        if not (self.leader.safety_checks or self.follower.safety_checks):
+            return None
+        report = self.leader.validator().check_pair(
+            leader_trajectory, self.follower.validator(), follower_trajectory,
+            self.leader._rest_pose(leader_trajectory), self.follower._rest_pose(follower_trajectory),
+        )
+        if not report.ok:
+            print(f"🛑 {report}")
+            raise ValueError(str(report))
+        return report
+    
+    def teleoperate(self, rate: float = 200, duration: Optional[float] = None):
+        """Follower tracks the hand-moved leader; returns teleop.TeleopStats"""
+        from teleop import Teleoperator
+        
+        return Teleoperator(self.leader, self.follower, rate=rate).run(duration)
+    
+    def perform(
+        self,
+        gesture: Gesture,
+        rate: float = CONTROL_RATE_HZ,
+        phase_shift: float = 0.0,
+        parallel: bool = False,
+    ) -> DualTickStats:
+        """
+        Both arms play a gesture on one clock, each around its own pose.
+        
+        Args:
+            phase_shift: Follower lead in cycles (0.5 = arms alternate)
+        """
+        gesture = gesture.within(self.leader.motion_limits).within(self.follower.motion_limits)
+        leader_traj = gesture.trajectory(self.leader.read_state().positions, rate)
+        follower_gesture = gesture.shifted(phase_shift) if phase_shift else gesture
+        follower_traj = follower_gesture.trajectory(self.follower.read_state().positions, rate)
+        self.leader.set_torque(True, gesture.joints)
+        self.follower.set_torque(True, gesture.joints)
+        return self._stream_coordinated(leader_traj, follower_traj, None, 0, parallel)
+    
+    def synchronized_wave(self, cycles: int = 3):
+        """Both arms wave together"""
+        self.perform(wave_gesture(cycles=cycles))
+        time.sleep(0.3)
+        self.leader.set_torque(False, ["wrist_roll"])
+        self.follower.set_torque(False, ["wrist_roll"])
 
 # Example usage and testing
 if __name__ == "__main__":
-    import json
-    
-    # Load config
-    config_path = os.path.expanduser("~/.openclaw/skills/lerobot/config.json")
-    with open(config_path) as f:
-        config = json.load(f)
-    
-    leader_port = config["leader"]["port"].replace("tty.", "cu.")
-    follower_port = config["follower"]["port"].replace("tty.", "cu.")
+    # Ports from the LeRobot config
+    leader_port = arm_port("leader")
+    follower_port = arm_port("follower")
     
     print("Testing Motion Controller")
     print(f"Leader: {leader_port}")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Online Trajectory Generation for SO-101 Robot Arms
+Goals can change at any tick; motion replans from the current commanded
+position and velocity and blends into the new target without stopping.
+
+Usage:
+    online = OnlineController(arm)
+    online.start()
+    online.submit({"shoulder_pan": 2600})   # returns immediately
+    online.submit({"shoulder_pan": 2300})   # redirects mid-motion
+    online.submit({"elbow_flex": 20.0}, units="normalized")
+    online.wait_until_reached()
+    online.stop()
+"""
+
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+
+from motion import JOINTS, SmoothMotion
+from planner import DEFAULT_MOTION_LIMITS, MotionLimits
+from scheduler import DeadlineScheduler
+
+# Default generator rate (Hz)
+ONLINE_RATE_HZ = 100
+
+# Commanded position within this many servo units (and nearly still) = arrived
+ARRIVAL_TOLERANCE = 1.0
+
+class OnlineTrajectory:
+    """
+    Acceleration-limited per-tick trajectory generator.
+
+    Each step computes, per joint, the fastest velocity from which the
+    joint can still brake to the goal, v = sqrt(2·a·|error|) capped at the
+    velocity limit, and moves the commanded velocity toward it by at most
+    a·dt. Velocity is continuous across goal changes, so a new goal simply
+    bends the motion; a goal inside a joint's braking distance is
+    overshot and approached from the other side. When a goal is set, each
+    joint's limits are scaled by its share of the slowest joint's travel
+    time so all joints arrive at about the same time, but a moving joint
+    keeps enough deceleration to stop.
+
+    The commanded velocity is the change in position per tick, and no
+    step changes it by more than a_max·dt; step() raises if one would.
+    """
+
+    def __init__(
+        self,
+        start: Dict[str, int],
+        dt: float,
+        limits: Dict[str, MotionLimits] = DEFAULT_MOTION_LIMITS,
+    ):
+        self.joints = [j for j in JOINTS if j in start]
+        self.dt = dt
+        self.v_max = np.array([limits[j].velocity for j in self.joints], dtype=np.float64)
+        self.a_max = np.array([limits[j].acceleration for j in self.joints], dtype=np.float64)
+
+        self.position = np.array([start[j] for j in self.joints], dtype=np.float64)
+        self.velocity = np.zeros(len(self.joints))
+        self.goal = self.position.copy()
+        self._v_lim = self.v_max.copy()
+        self._a_lim = self.a_max.copy()
+
+    def set_goal(self, goal: Dict[str, int]):
+        """Retarget; joints not in goal keep their current target"""
+        new_goal = self.goal.copy()
+        for i, joint in enumerate(self.joints):
+            if joint in goal:
+                new_goal[i] = goal[joint]
+
+        # Synchronize arrival: slow each joint to the slowest joint's pace
+        error = new_goal - self.position
+        travel = np.abs(error) / self.v_max
+        slowest = travel.max()
+        scale = np.clip(travel / slowest, 0.05, 1.0) if slowest > 0 else np.ones_like(travel)
+        self._v_lim = self.v_max * scale
+        # ...but never below the deceleration that stops a moving joint at
+        # the new goal (or at all, if it's moving away from it)
+        toward = self.velocity * error > 0
+        stopping = np.where(
+            toward, self.velocity ** 2 / (2 * np.maximum(np.abs(error), 1e-9)), np.where(self.velocity != 0, np.inf, 0.0),
+        )
+        self._a_lim = np.minimum(self.a_max, np.maximum(self.a_max * scale, stopping))
+        self.goal = new_goal
+
+    def step(self) -> np.ndarray:
+        """Advance one tick; returns the new commanded positions"""
+        dt = self.dt
+        error = self.goal - self.position
+        # Fastest speed toward the goal that can still brake in time,
+        # using the discrete braking distance so it lands without overshoot
+        brake = self._a_lim * dt
+        v_desired = np.sign(error) * np.minimum(
+            self._v_lim,
+            -brake / 2 + np.sqrt(brake * brake / 4 + 2 * self._a_lim * np.abs(error)),
+        )
+        velocity = self.velocity + np.clip(v_desired - self.velocity, -brake, brake)
+
+        # Land on the goal when this step would reach it and both the
+        # shortened step and the stop after it are within one tick's
+        # acceleration; otherwise keep going and come back
+        landing_velocity = error / dt
+        landing = (
+            (velocity * error >= 0)
+            & (np.abs(velocity * dt) >= np.abs(error))
+            & (np.abs(landing_velocity - self.velocity) <= brake)
+            & (np.abs(landing_velocity) <= brake)
+        )
+        velocity = np.where(landing, landing_velocity, velocity)
+
+        if np.any(np.abs(velocity - self.velocity) > self.a_max * dt * (1 + 1e-9)):
+            raise RuntimeError(f"Online step exceeds the acceleration limits: dv {velocity - self.velocity}")
+        self.position = np.where(landing, self.goal, self.position + velocity * dt)
+        self.velocity = velocity
+        return self.position
+
+    @property
+    def reached(self) -> bool:
+        return bool(
+            np.all(np.abs(self.goal - self.position) <= ARRIVAL_TOLERANCE)
+            and np.all(self.velocity == 0.0)
+        )
+
+class OnlineController:
+    """
+    Runs an OnlineTrajectory against an arm on a background control thread.
+
+    submit() never blocks: it swaps the target and the control thread
+    picks it up on its next tick.
+    """
+
+    def __init__(self, arm: SmoothMotion, rate: float = ONLINE_RATE_HZ, speed: int = 0):
+        self.arm = arm
+        self.rate = rate
+        self.speed = speed
+        self.generator: Optional[OnlineTrajectory] = None
+        self._pending: Optional[Dict[str, int]] = None
+        self._goal_lock = threading.Lock()
+        self._reached = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start from the arm's present pose, holding it"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        start = self.arm.read_state().positions
+        self.generator = OnlineTrajectory(start, 1.0 / self.rate, self.arm.motion_limits)
+        self.arm.set_torque(True)
+        self._reached.set()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"online-{self.arm.port}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop streaming; the servos hold the last commanded pose"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, goal: Dict[str, float], units: Optional[str] = None):
+        """
+        Set a new target in `units` (default the arm's units); takes
+        effect on the next tick
+        """
+        goal = self.arm.settle_goals(self.arm.to_raw(goal, units))
+        # Cleared under the lock so a tick finishing the old goal can't set
+        # it again before this goal is picked up
+        with self._goal_lock:
+            self._pending = {**(self._pending or {}), **goal}
+            self._reached.clear()
+
+    def wait_until_reached(self, timeout: Optional[float] = None) -> bool:
+        """Block until the latest goal is reached; False on timeout"""
+        return self._reached.wait(timeout)
+
+    def _run(self):
+        scheduler = DeadlineScheduler(1.0 / self.rate)
+        while not self._stop.is_set():
+            # One-second batches keep the scheduler's jitter record bounded
+            scheduler.run(max(int(self.rate), 1), self._tick, stop=self._stop)
+
+    def _tick(self, _i: int):
+        generator = self.generator
+        with self._goal_lock:
+            pending, self._pending = self._pending, None
+        if pending:
+            generator.set_goal(pending)
+
+        if generator.reached:
+            with self._goal_lock:
+                if self._pending is None:
+                    self._reached.set()
+            return
+
+        positions = np.rint(generator.step()).astype(int).tolist()
+        self.arm.write_goals(dict(zip(generator.joints, positions)), self.speed)
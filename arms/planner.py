@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Time-Optimal Motion Planning for SO-101 Robot Arms
+Jerk-limited (S-curve) profiles synchronized across joints.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from trajectory import Trajectory, interpolate
+
+@dataclass
+class MotionLimits:
+    """Kinematic limits for one joint (servo units per second^n)"""
+    velocity: float
+    acceleration: float
+    jerk: float
+
+# Conservative limits the STS3215 servos on the SO-101 track cleanly.
+# 4096 units = 360°, so 1500 units/s is ~130°/s.
+DEFAULT_MOTION_LIMITS = {
+    "shoulder_pan": MotionLimits(velocity=1500, acceleration=6000, jerk=40000),
+    "shoulder_lift": MotionLimits(velocity=1200, acceleration=5000, jerk=30000),
+    "elbow_flex": MotionLimits(velocity=1200, acceleration=5000, jerk=30000),
+    "wrist_flex": MotionLimits(velocity=1800, acceleration=8000, jerk=50000),
+    "wrist_roll": MotionLimits(velocity=2000, acceleration=8000, jerk=50000),
+    "gripper": MotionLimits(velocity=1500, acceleration=8000, jerk=50000),
+}
+
+class SCurveProfile:
+    """
+    Rest-to-rest jerk-limited profile from 0 to `distance`.
+
+    Stored as piecewise-constant jerk segments (up to seven), with the
+    position/velocity/acceleration at each segment boundary precomputed so
+    sampling a whole time vector is a single vectorized evaluation.
+    """
+
+    def __init__(self, segments: List[Tuple[float, float]], distance: float):
+        self.segments = [(d, j) for d, j in segments if d > 0]
+        self.distance = distance
+
+        n = len(self.segments)
+        self._starts = np.zeros(n)
+        self._jerk = np.array([j for _, j in self.segments], dtype=np.float64)
+        self._p0 = np.zeros(n)
+        self._v0 = np.zeros(n)
+        self._a0 = np.zeros(n)
+
+        t = p = v = a = 0.0
+        for k, (d, j) in enumerate(self.segments):
+            self._starts[k], self._p0[k], self._v0[k], self._a0[k] = t, p, v, a
+            p += v * d + a * d * d / 2 + j * d ** 3 / 6
+            v += a * d + j * d * d / 2
+            a += j * d
+            t += d
+        self.duration = t
+
+    def within_limits(self, v_max: np.ndarray, a_max: np.ndarray) -> "SplinePath":
+        """
+        Stretch a rest-to-rest path uniformly until it respects the limits.
+
+        Acceleration on a cubic is linear per segment, so its extremes are at
+        the knots; velocity is checked on a dense grid.
+        """
+        times = self.times
+        probe = np.linspace(times[0], times[-1], 50 * len(times))
+        _, vel, _ = self.sample(probe)
+        eps = 1e-9
+        acc = np.concatenate([self.sample(times[:-1] + eps)[2], self.sample(times[1:] - eps)[2]])
+        ratio = max(
+            float(np.max(np.abs(vel) / v_max)),
+            float(np.sqrt(np.max(np.abs(acc) / a_max))),
+        )
+        if ratio <= 1.0:
+            return self
+        return self.scaled(ratio)
+
+    def sample(self, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Position, velocity and acceleration at times t (clamped to [0, duration])"""
+        t = np.clip(np.asarray(t, dtype=np.float64), 0.0, self.duration)
+        if not self.segments:
+            zeros = np.zeros_like(t)
+            return zeros + self.distance, zeros, zeros
+
+        k = np.clip(np.searchsorted(self._starts, t, side="right") - 1, 0, len(self.segments) - 1)
+        tau = t - self._starts[k]
+        j, a0, v0, p0 = self._jerk[k], self._a0[k], self._v0[k], self._p0[k]
+
+        pos = p0 + v0 * tau + a0 * tau ** 2 / 2 + j * tau ** 3 / 6
+        vel = v0 + a0 * tau + j * tau ** 2 / 2
+        acc = a0 + j * tau
+        # Pin the endpoint exactly so rounding never leaves the joint short
+        pos = np.where(t >= self.duration, self.distance, pos)
+        return pos, vel, acc
+
+def _accel_phase(v_peak: float, a_max: float, j_max: float) -> Tuple[float, float]:
+    """Jerk time and total time to go from rest to v_peak"""
+    if v_peak * j_max < a_max * a_max:
+        # Acceleration limit never reached: triangular acceleration
+        tj = math.sqrt(v_peak / j_max)
+        return tj, 2 * tj
+    tj = a_max / j_max
+    return tj, tj + v_peak / a_max
+
+def scurve_profile(distance: float, v_max: float, a_max: float, j_max: float) -> SCurveProfile:
+    """
+    Minimum-time rest-to-rest S-curve covering `distance`.
+
+    Args:
+        distance: Distance to travel (>= 0)
+        v_max, a_max, j_max: Velocity, acceleration and jerk limits (> 0)
+    """
+    if distance <= 0:
+        return SCurveProfile([], 0.0)
+
+    tj, ta = _accel_phase(v_max, a_max, j_max)
+    v_peak = v_max
+    if v_max * ta > distance:
+        # Too short to reach v_max: find the peak velocity that fits exactly
+        v_peak = (distance * math.sqrt(j_max) / 2) ** (2 / 3)
+        if v_peak * j_max >= a_max * a_max:
+            v_peak = (a_max / 2) * (-a_max / j_max + math.sqrt((a_max / j_max) ** 2 + 4 * distance / a_max))
+        tj, ta = _accel_phase(v_peak, a_max, j_max)
+    tv = max(distance - v_peak * ta, 0.0) / v_peak
+
+    tc = ta - 2 * tj  # Constant-acceleration time
+    segments = [
+        (tj, j_max), (tc, 0.0), (tj, -j_max),    # accelerate
+        (tv, 0.0),                               # cruise
+        (tj, -j_max), (tc, 0.0), (tj, j_max),    # decelerate
+    ]
+    return SCurveProfile(segments, distance)
+
+def synchronized_profile(
+    start: Dict[str, int],
+    end: Dict[str, int],
+    limits: Dict[str, MotionLimits],
+) -> SCurveProfile:
+    """
+    Shared unit-distance profile that all joints follow together.
+
+    Every joint moves start + s(t) * (end - start), so they start and finish
+    together. The limits on s are the tightest of each joint's limits
+    divided by its distance, which makes the slowest joint saturate and
+    keeps every other joint within its own limits.
+    """
+    v = a = j = math.inf
+    for joint in start:
+        if joint not in end or joint not in limits:
+            continue
+        dist = abs(end[joint] - start[joint])
+        if dist == 0:
+            continue
+        lim = limits[joint]
+        v = min(v, lim.velocity / dist)
+        a = min(a, lim.acceleration / dist)
+        j = min(j, lim.jerk / dist)
+
+    if v == math.inf:
+        return SCurveProfile([], 1.0)
+    return scurve_profile(1.0, v, a, j)
+
+def plan_optimal(
+    start: Dict[str, int],
+    end: Dict[str, int],
+    dt: float,
+    joints: Sequence[str],
+    limits: Dict[str, MotionLimits] = DEFAULT_MOTION_LIMITS,
+) -> Trajectory:
+    """
+    Minimum-time synchronized trajectory from start to end.
+
+    Args:
+        start, end: Joint positions (servo units)
+        dt: Waypoint spacing (seconds)
+        joints: Joint order for the trajectory columns
+        limits: Per-joint velocity/acceleration/jerk limits
+
+    Returns:
+        Trajectory sampled every dt, ending exactly on the target
+    """
+    profile = synchronized_profile(start, end, limits)
+    steps = max(int(math.ceil(profile.duration / dt)), 1)
+    progress, _, _ = profile.sample(np.arange(steps + 1) * dt)
+    return interpolate(start, end, progress, dt, joints)
+
+# ==================== MULTI-WAYPOINT SPLINES ====================
+
+def clamped_spline_velocities(times: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """
+    Knot velocities of the C2 cubic spline through points (knots x joints)
+    that starts and ends at rest.
+    """
+    n = len(times)
+    velocities = np.zeros_like(points)
+    if n < 3:
+        return velocities
+
+    h = np.diff(times)
+    slopes = np.diff(points, axis=0) / h[:, None]
+    # Tridiagonal system for interior knots 1..n-2 (continuous acceleration):
+    # h[k+1]·v[k] + 2(h[k]+h[k+1])·v[k+1] + h[k]·v[k+2] = rhs[k]
+    lower, diag, upper = h[1:], 2 * (h[:-1] + h[1:]), h[:-1]
+    rhs = 3 * (h[1:, None] * slopes[:-1] + h[:-1, None] * slopes[1:])
+
+    # Thomas algorithm: O(n) forward elimination and back substitution,
+    # every joint at once (the system is diagonally dominant, no pivoting)
+    size = n - 2
+    scale = np.empty(size)
+    solved = np.empty_like(rhs)
+    scale[0] = upper[0] / diag[0]
+    solved[0] = rhs[0] / diag[0]
+    for k in range(1, size):
+        pivot = diag[k] - lower[k] * scale[k - 1]
+        scale[k] = upper[k] / pivot
+        solved[k] = (rhs[k] - lower[k] * solved[k - 1]) / pivot
+    for k in range(size - 2, -1, -1):
+        solved[k] -= scale[k] * solved[k + 1]
+    velocities[1:-1] = solved
+    return velocities
+
+class SplinePath:
+    """
+    Piecewise cubic Hermite path through knots (knots x joints).
+
+    Sampling locates each time's segment with one searchsorted and
+    evaluates the Hermite basis for all samples and joints at once.
+    """
+
+    def __init__(self, times: np.ndarray, points: np.ndarray, velocities: np.ndarray):
+        self.times = times
+        self.points = points
+        self.velocities = velocities
+
+    @classmethod
+    def clamped(cls, times: np.ndarray, points: np.ndarray) -> "SplinePath":
+        """C2 cubic spline through points (knots x joints), at rest at both ends"""
+        return cls(times, points, clamped_spline_velocities(times, points))
+
+    @property
+    def duration(self) -> float:
+        return float(self.times[-1] - self.times[0])
+
+    def scaled(self, factor: float) -> "SplinePath":
+        """Same path slowed down by factor (velocity / factor, accel / factor²)"""
+        return SplinePath(self.times * factor, self.points, self.velocities / factor)
+
+    def within_limits(self, v_max: np.ndarray, a_max: np.ndarray) -> "SplinePath":
+        """
+        Stretch a rest-to-rest path uniformly until it respects the limits.
+
+        Acceleration on a cubic is linear per segment, so its extremes are at
+        the knots; velocity is checked on a dense grid.
+        """
+        times = self.times
+        probe = np.linspace(times[0], times[-1], 50 * len(times))
+        _, vel, _ = self.sample(probe)
+        eps = 1e-9
+        acc = np.concatenate([self.sample(times[:-1] + eps)[2], self.sample(times[1:] - eps)[2]])
+        ratio = max(
+            float(np.max(np.abs(vel) / v_max)),
+            float(np.sqrt(np.max(np.abs(acc) / a_max))),
+        )
+        if ratio <= 1.0:
+            return self
+        return self.scaled(ratio)
+
+    def sample(self, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Position, velocity and acceleration (samples x joints) at times t"""
+        t = np.clip(np.asarray(t, dtype=np.float64), self.times[0], self.times[-1])
+        k = np.clip(np.searchsorted(self.times, t, side="right") - 1, 0, len(self.times) - 2)
+        h = (self.times[k + 1] - self.times[k])[:, None]
+        u = ((t - self.times[k]) / h[:, 0])[:, None]
+        p0, p1 = self.points[k], self.points[k + 1]
+        m0, m1 = self.velocities[k] * h, self.velocities[k + 1] * h
+
+        u2, u3 = u * u, u * u * u
+        pos = ((2 * u3 - 3 * u2 + 1) * p0 + (u3 - 2 * u2 + u) * m0
+               + (-2 * u3 + 3 * u2) * p1 + (u3 - u2) * m1)
+        vel = ((6 * u2 - 6 * u) * p0 + (3 * u2 - 4 * u + 1) * m0
+               + (-6 * u2 + 6 * u) * p1 + (3 * u2 - 2 * u) * m1) / h
+        acc = ((12 * u - 6) * p0 + (6 * u - 4) * m0
+               + (-12 * u + 6) * p1 + (6 * u - 2) * m1) / (h * h)
+        return pos, vel, acc
+
+def fill_poses(poses: Sequence[Dict[str, int]], joints: Sequence[str]) -> List[Dict[str, int]]:
+    """Carry each joint forward so partial poses (e.g. just the gripper) are complete"""
+    filled = []
+    current = {}
+    for pose in poses:
+        current = {**current, **pose}
+        filled.append({j: current[j] for j in joints if j in current})
+    return filled
+
+def spline_path(
+    poses: Sequence[Dict[str, int]],
+    joints: Sequence[str],
+    limits: Dict[str, MotionLimits] = DEFAULT_MOTION_LIMITS,
+    dwell: Optional[Sequence[float]] = None,
+    speed_scale: float = 1.0,
+) -> Tuple[SplinePath, List[str]]:
+    """
+    Velocity- and acceleration-continuous path through an ordered list of poses.
+
+    The arm passes through intermediate poses without stopping, except at
+    poses with a dwell time, where it comes to rest and holds. Between
+    rests, knot times are first spaced by each segment's velocity-limited
+    travel time, then stretched uniformly until every joint is within
+    speed_scale of its velocity and acceleration limits.
+
+    Args:
+        poses: Poses to pass through; the first is the start. Joints
+               missing from a pose keep their previous value.
+        joints: Joint order for the path columns
+        limits: Per-joint velocity/acceleration limits
+        dwell: Optional hold time (seconds) after each pose
+        speed_scale: Fraction of the limits to use (0-1]
+
+    Returns:
+        (path, joints used)
+    """
+    if len(poses) < 2:
+        raise ValueError("Need at least a start pose and one target pose")
+    if dwell is not None and len(dwell) != len(poses):
+        raise ValueError(f"Got {len(dwell)} dwell times for {len(poses)} poses")
+    dwell = dwell or [0.0] * len(poses)
+
+    filled = fill_poses(poses, joints)
+    used = [j for j in joints if j in filled[0]]
+    points = np.array([[p[j] for j in used] for p in filled], dtype=np.float64)
+    v_max = np.array([limits[j].velocity for j in used]) * speed_scale
+    a_max = np.array([limits[j].acceleration for j in used]) * speed_scale
+
+    # Initial knot spacing: slowest joint at full speed (stretched below)
+    travel = np.abs(np.diff(points, axis=0)) / v_max
+    seg_times = np.maximum(travel.max(axis=1), 1e-3)
+
+    # Rest-to-rest pieces split at poses with a dwell
+    rests = [0] + [i for i in range(1, len(points) - 1) if dwell[i] > 0] + [len(points) - 1]
+
+    knot_t, knot_p, knot_v = [], [], []
+    offset = 0.0
+    for first, last in zip(rests[:-1], rests[1:]):
+        times = np.concatenate([[0.0], np.cumsum(seg_times[first:last])])
+        piece_points = points[first:last + 1]
+        piece = SplinePath.clamped(times, piece_points).within_limits(v_max, a_max)
+
+        knot_t.extend(piece.times + offset)
+        knot_p.extend(piece.points)
+        knot_v.extend(piece.velocities)
+        # Hold at the rest pose; the next piece starts after the dwell
+        offset = knot_t[-1] + dwell[last]
+
+    if dwell[-1] > 0:
+        knot_t.append(offset)
+        knot_p.append(points[-1])
+        knot_v.append(np.zeros(len(used)))
+
+    return SplinePath(np.array(knot_t), np.array(knot_p), np.array(knot_v)), used
+
+def plan_spline(
+    poses: Sequence[Dict[str, int]],
+    dt: float,
+    joints: Sequence[str],
+    limits: Dict[str, MotionLimits] = DEFAULT_MOTION_LIMITS,
+    dwell: Optional[Sequence[float]] = None,
+    speed_scale: float = 1.0,
+) -> Trajectory:
+    """
+    Sample spline_path() every dt into one continuous Trajectory.
+
+    Returns:
+        Trajectory starting at poses[0] and ending exactly on the last pose
+    """
+    path, used = spline_path(poses, joints, limits, dwell, speed_scale)
+    steps = max(int(math.ceil(path.duration / dt)), 1)
+    times = np.arange(steps + 1) * dt
+    positions, _, _ = path.sample(times)
+    positions[-1] = path.points[-1]
+    return Trajectory(np.rint(positions).astype(np.int32), used, times)
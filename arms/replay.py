@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Recorded-Demo Replay for SO-101 Arms
+------------------------------------
+Plays back training_data/demos/*/trajectory.json on the follower. The
+recording's irregular ~8.6 Hz normalized samples are mapped to servo
+units, resampled onto a uniform control-rate grid with a C2 cubic
+spline, slowed down where needed to stay within the servo limits,
+checked against the joint limits and streamed through
+SmoothMotion.execute_trajectory.
+
+The demos are recorded in LeRobot's normalized units, so replaying one
+needs the follower's LeRobot calibration file (see
+calibration.arm_calibration); without it there is nothing to map them
+with and replay refuses to start.
+
+Usage:
+    python3 replay.py                          # List recorded demos
+    python3 replay.py 20260211_190203          # Replay a demo at recorded speed
+    python3 replay.py 20260211_190203 --speed=2    # Twice as fast
+    python3 replay.py 20260211_190203 --hz=100     # Different stream rate
+    python3 replay.py 20260211_190203 --dry-run    # Plan and check only
+"""
+
+import sys
+import os
+import json
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from calibration import DEFAULT_CALIBRATION, UNITS_RAW, ArmCalibration, arm_calibration, arm_port
+from kinematics import joint_array
+from motion import SmoothMotion
+from planner import MotionLimits, SplinePath
+from scheduler import CONTROL_RATE_HZ, TickStats
+from state import JOINTS
+from trajectory import Trajectory
+
+DEMO_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "training_data", "demos")
+
+# Seconds to ease from wherever the arm is to the demo's first sample
+APPROACH_DURATION = 2.0
+
+class Demo:
+    """
+    One recorded demo: sample times and normalized joint positions.
+
+    positions is (samples x joints) in JOINTS order, NaN for joints the
+    recording doesn't have.
+    """
+
+    def __init__(self, times: np.ndarray, positions: np.ndarray, metadata: Optional[Dict] = None, name: str = ""):
+        self.times = times
+        self.positions = positions
+        self.metadata = metadata or {}
+        self.name = name
+
+    @classmethod
+    def load(cls, path: str) -> "Demo":
+        """Load a demo by directory, trajectory.json path or demo id"""
+        if not os.path.exists(path):
+            path = os.path.join(DEMO_DIR, path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "trajectory.json")
+        with open(path) as f:
+            points = json.load(f)
+
+        metadata = {}
+        metadata_path = os.path.join(os.path.dirname(path), "metadata.json")
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as f:
+                metadata = json.load(f)
+
+        times = np.array([point["time"] for point in points], dtype=np.float64)
+        positions = joint_array([point["positions"] for point in points])
+        # Drop repeated or out-of-order stamps so the spline knots increase
+        keep = np.concatenate([[True], np.diff(times) > 0])
+        name = os.path.basename(os.path.dirname(path))
+        return cls(times[keep] - times[0], positions[keep], metadata, name)
+
+    @property
+    def joints(self) -> List[str]:
+        """Joints present in every sample"""
+        return [j for i, j in enumerate(JOINTS) if not np.isnan(self.positions[:, i]).any()]
+
+    @property
+    def duration(self) -> float:
+        return float(self.times[-1]) if len(self.times) else 0.0
+
+    @property
+    def rate(self) -> float:
+        """Mean recorded sample rate (Hz)"""
+        return (len(self.times) - 1) / self.duration if self.duration > 0 else 0.0
+
+    def raw_positions(self, calibration: ArmCalibration) -> np.ndarray:
+        """Recorded samples in servo units, (samples x joints) in JOINTS order"""
+        return calibration.to_raw(self.positions)
+
+    def trajectory(
+        self,
+        calibration: ArmCalibration,
+        rate: float = CONTROL_RATE_HZ,
+        time_scale: float = 1.0,
+        limits: Optional[Dict[str, MotionLimits]] = None,
+    ) -> Trajectory:
+        """
+        Resample the demo onto a uniform grid in servo units.
+
+        Args:
+            calibration: Maps the recording's normalized units to raw
+            rate: Output waypoint rate (Hz)
+            time_scale: Playback speed (2.0 = twice as fast as recorded)
+            limits: Per-joint velocity/acceleration limits; playback is
+                slowed down further wherever the demo would exceed them
+
+        Returns:
+            Trajectory of the demo's joints, starting at t=0
+        """
+        if time_scale <= 0:
+            raise ValueError(f"Time scale must be positive, got {time_scale}")
+        joints = self.joints
+        columns = [JOINTS.index(j) for j in joints]
+        points = self.raw_positions(calibration)[:, columns]
+        times = self.times / time_scale
+
+        # C2 spline through the samples, at rest at both ends
+        path = SplinePath.clamped(times, points)
+        if limits is not None:
+            v_max = np.array([limits[j].velocity for j in joints])
+            a_max = np.array([limits[j].acceleration for j in joints])
+            path = path.within_limits(v_max, a_max)
+        dt = 1.0 / rate
+        steps = max(int(math.ceil(path.duration / dt)), 1)
+        grid = np.arange(steps + 1) * dt
+        positions, _, _ = path.sample(grid)
+        positions[-1] = points[-1]
+        # The spline can overshoot between samples; never past the calibrated range
+        positions = np.clip(positions, calibration.range_min[columns], calibration.range_max[columns])
+        return Trajectory(np.rint(positions).astype(np.int32), joints, grid)
+
+def limit_violations(trajectory: Trajectory, joint_limits: Dict[str, Tuple[int, int]]) -> Dict[str, Tuple[int, int, int]]:
+    """
+    Check every tick against joint_limits in one pass.
+
+    Returns:
+        {joint: (ticks outside, lowest, highest)} for joints that leave their limits
+    """
+    lo = np.array([joint_limits.get(j, (0, 4095))[0] for j in trajectory.joints])
+    hi = np.array([joint_limits.get(j, (0, 4095))[1] for j in trajectory.joints])
+    positions = trajectory.positions
+    outside = (positions < lo) | (positions > hi)
+    counts = outside.sum(axis=0)
+    low, high = positions.min(axis=0), positions.max(axis=0)
+    return {
+        joint: (int(counts[col]), int(low[col]), int(high[col]))
+        for col, joint in enumerate(trajectory.joints) if counts[col]
+    }
+
+def replay(
+    arm: SmoothMotion,
+    demo: Demo,
+    rate: float = CONTROL_RATE_HZ,
+    time_scale: float = 1.0,
+    approach: float = APPROACH_DURATION,
+) -> TickStats:
+    """
+    Play a demo on an arm.
+
+    The arm first eases to the demo's first sample, then the whole
+    resampled demo, slowed down where it would exceed arm.safety_limits,
+    is streamed on the deadline scheduler (which also runs the arm's
+    trajectory safety checks).
+
+    Raises:
+        ValueError: If the arm has no calibration file, or any tick falls
+            outside arm.joint_limits
+    """
+    if arm.calibration is DEFAULT_CALIBRATION:
+        raise ValueError(f"Demo {demo.name} needs the arm's LeRobot calibration file to map it to servo units")
+    trajectory = demo.trajectory(arm.calibration, rate, time_scale, arm.safety_limits)
+    violations = limit_violations(trajectory, arm.joint_limits)
+    if violations:
+        detail = ", ".join(
+            f"{joint} {count} ticks ({low}-{high} vs {arm.joint_limits[joint][0]}-{arm.joint_limits[joint][1]})"
+            for joint, (count, low, high) in violations.items()
+        )
+        raise ValueError(f"Demo {demo.name} leaves the joint limits: {detail}")
+
+    arm.set_torque(True)
+    arm.smooth_move(trajectory[0], duration=approach, units=UNITS_RAW)
+    return arm.execute_trajectory(trajectory, units=UNITS_RAW)
+
+def list_demos(root: str = DEMO_DIR) -> List[Dict]:
+    """Metadata of every recorded demo under root, oldest first"""
+    demos = []
+    for name in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+        metadata_path = os.path.join(root, name, "metadata.json")
+        if os.path.exists(metadata_path):
+            with open(metadata_path) as f:
+                demos.append(json.load(f))
+        elif os.path.exists(os.path.join(root, name, "trajectory.json")):
+            demos.append({"id": name})
+    return demos
+
+def main():
+    rate = CONTROL_RATE_HZ
+    time_scale = 1.0
+    dry_run = False
+    names = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--hz="):
+            rate = float(arg.split("=")[1])
+        elif arg.startswith("--speed="):
+            time_scale = float(arg.split("=")[1])
+        elif arg == "--dry-run":
+            dry_run = True
+        elif arg in ("-h", "--help"):
+            print(__doc__)
+            return
+        else:
+            names.append(arg)
+
+    if not names:
+        print("📼 Recorded demos:")
+        for meta in list_demos():
+            print(f"   {meta['id']}  {meta.get('duration_sec', '?')}s  {meta.get('task', '')}")
+        return
+
+    demo = Demo.load(names[0])
+    calibration = arm_calibration("follower")
+    if calibration is DEFAULT_CALIBRATION:
+        print("❌ No follower calibration file found. Demos are recorded in normalized units;")
+        print("   run LeRobot's calibration for the follower so they can be mapped to servo units.")
+        return
+    arm = SmoothMotion(arm_port("follower"), calibration=calibration)
+    trajectory = demo.trajectory(arm.calibration, rate, time_scale, arm.safety_limits)
+    print(f"📼 {demo.name}: {demo.metadata.get('task', '')}")
+    print(f"   {len(demo.times)} samples at {demo.rate:.1f} Hz -> {len(trajectory)} ticks at {rate:.0f} Hz, "
+          f"{trajectory.duration:.1f}s at {time_scale:g}x")
+    if trajectory.duration > demo.duration / time_scale + 1.0 / rate:
+        print(f"   🐢 Slowed to {demo.duration / trajectory.duration:.2g}x to stay within the servo limits")
+
+    violations = limit_violations(trajectory, arm.joint_limits)
+    for joint, (count, low, high) in violations.items():
+        print(f"   ⚠️  {joint}: {count} ticks outside limits (spans {low}-{high})")
+    report = arm.validator().check(trajectory)
+    print(f"   {'✅' if report.ok else '⚠️ '} {report}")
+    if violations:
+        print("   💡 Check the follower's calibration file matches the arm the demo was recorded with")
+    if dry_run:
+        return
+
+    if not arm.connect():
+        print(f"❌ Failed to connect to {arm.port}")
+        return
+    try:
+        stats = replay(arm, demo, rate, time_scale)
+        print(f"\n📊 {stats.summary()}")
+    except ValueError as e:
+        print(f"❌ {e}")
+    finally:
+        arm.set_torque(False)
+        arm.disconnect()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Trajectory Safety Checks for SO-101 Robot Arms
+Validates a whole trajectory array before any of it is sent: joint
+limits, per-step velocity and acceleration, collisions with the robot's
+own body, and clearance between the two arms.
+
+Usage:
+    validator = TrajectoryValidator(arm.joint_limits, SAFETY_LIMITS, mount=RIGHT)
+    report = validator.check(trajectory)
+    if not report.ok:
+        print(report)
+
+SmoothMotion runs these checks on every trajectory it executes (see
+SmoothMotion.validate_trajectory).
+"""
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from calibration import DEFAULT_CALIBRATION, ArmCalibration
+from kinematics import UNITS_RAW, SO101Kinematics, joint_array
+from planner import MotionLimits
+from state import JOINTS
+from trajectory import Trajectory
+
+# ==================== BODY GEOMETRY ====================
+# Dimensions from ren_body_blender.py (metres). World frame as in the
+# model: z up from the floor, x toward the back (the face looks along -x),
+# arms mounted either side of the spine at y = ±ARM_MOUNT_SPACING / 2.
+
+def mm(val):
+    """Convert mm to meters."""
+    return val / 1000
+
+ARM_SHOULDER_HEIGHT = mm(864)
+HEAD_HEIGHT = mm(1067)
+
+BASE_LENGTH = mm(350)
+BASE_WIDTH = mm(300)
+BASE_HEIGHT = mm(80)
+
+TORSO_WIDTH = mm(200)
+TORSO_DEPTH = mm(100)
+SPINE_HEIGHT = mm(800)
+
+ARM_MOUNT_SPACING = mm(280)
+ARM_MOUNT_THICKNESS = mm(10)
+
+HEAD_WIDTH = mm(100)
+HEAD_DEPTH = mm(80)
+HEAD_HEIGHT_SIZE = mm(70)
+NECK_RADIUS = mm(20)
+
+# Mount sides (the model's side sign: left arm at -y)
+LEFT = -1
+RIGHT = 1
+
+# Axis-aligned keep-out boxes (min corner, max corner)
+BODY_BOXES: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+    "base": (
+        np.array([-BASE_LENGTH / 2, -BASE_WIDTH / 2, 0.0]),
+        np.array([BASE_LENGTH / 2, BASE_WIDTH / 2, BASE_HEIGHT]),
+    ),
+    "torso": (
+        np.array([-TORSO_DEPTH / 2, -TORSO_WIDTH / 2, BASE_HEIGHT]),
+        np.array([TORSO_DEPTH / 2, TORSO_WIDTH / 2, BASE_HEIGHT + SPINE_HEIGHT]),
+    ),
+    "neck": (
+        np.array([-NECK_RADIUS, -NECK_RADIUS, ARM_SHOULDER_HEIGHT]),
+        np.array([NECK_RADIUS, NECK_RADIUS, HEAD_HEIGHT - HEAD_HEIGHT_SIZE]),
+    ),
+    "head": (
+        np.array([-HEAD_DEPTH / 2, -HEAD_WIDTH / 2, HEAD_HEIGHT - HEAD_HEIGHT_SIZE]),
+        np.array([HEAD_DEPTH / 2, HEAD_WIDTH / 2, HEAD_HEIGHT]),
+    ),
+}
+
+# Clearance kept around the arm links (roughly their half-width, metres)
+LINK_RADIUS = mm(25)
+
+# Closest the two arms' link centerlines may come
+ARM_CLEARANCE = 2 * LINK_RADIUS
+
+# Points sampled along each link for the collision checks
+LINK_SAMPLES = 5
+_FRACTIONS = np.linspace(0.0, 1.0, LINK_SAMPLES + 1)[1:]
+
+# Boxes grown by the link radius, stacked (3 x boxes) for one vectorized test
+_BOX_NAMES = list(BODY_BOXES)
+_BOX_LO = np.array([lo for lo, _ in BODY_BOXES.values()]).T - LINK_RADIUS
+_BOX_HI = np.array([hi for _, hi in BODY_BOXES.values()]).T + LINK_RADIUS
+
+# What the STS3215 itself can do, independent of the planner's gentler
+# motion_limits: no-load speed is 0.222 s/60° at 7.4 V (~3000 units/s),
+# and the servo's acceleration register tops out at 254 x 100 units/s².
+# A trajectory beyond these can't be tracked at all, so it is rejected.
+SERVO_MAX_VELOCITY = 3000.0
+SERVO_MAX_ACCELERATION = 25400.0
+SAFETY_LIMITS: Dict[str, MotionLimits] = {
+    joint: MotionLimits(SERVO_MAX_VELOCITY, SERVO_MAX_ACCELERATION, math.inf) for joint in JOINTS
+}
+# Acceleration is measured over this window so that one-unit rounding in
+# the waypoints doesn't read as a spike.
+ACCEL_WINDOW = 0.05  # Seconds
+
+def arm_mount(side: int) -> np.ndarray:
+    """
+    World transform of an arm's base frame on its mount.
+
+    The arm sits on top of the mount plate facing forward (-x), so its
+    own +x (the reach direction at mid-range) is turned half a turn.
+    """
+    base = np.eye(4)
+    base[:2, :2] = [[-1.0, 0.0], [0.0, -1.0]]
+    base[:3, 3] = [0.0, side * ARM_MOUNT_SPACING / 2, ARM_SHOULDER_HEIGHT + ARM_MOUNT_THICKNESS]
+    return base
+
+@dataclass
+class SafetyViolation:
+    """First waypoint that failed one check"""
+    check: str          # "limits", "velocity", "acceleration", "body", "arms"
+    index: int          # Waypoint index
+    detail: str
+
+@dataclass
+class SafetyReport:
+    """Outcome of validating one trajectory (or a pair)"""
+    violations: List[SafetyViolation] = field(default_factory=list)
+    elapsed_us: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+    def __str__(self) -> str:
+        if self.ok:
+            return f"Trajectory OK ({self.elapsed_us:.0f}us)"
+        return "Unsafe trajectory: " + "; ".join(
+            f"{v.check} at waypoint {v.index}: {v.detail}" for v in self.violations
+        )
+
+class TrajectoryValidator:
+    """
+    Whole-trajectory checks for one arm, vectorized over all waypoints.
+
+    Args:
+        joint_limits: {joint: (min, max)} in raw units
+        safety_limits: {joint: MotionLimits} velocity and acceleration
+            bounds (jerk unused); steps beyond these are rejected
+        calibration: For forward kinematics in the collision checks
+        mount: LEFT or RIGHT to check collisions with the body, or None
+            if the arm isn't mounted on the robot
+    """
+
+    def __init__(
+        self,
+        joint_limits: Dict[str, Tuple[int, int]],
+        safety_limits: Dict[str, MotionLimits] = SAFETY_LIMITS,
+        calibration: ArmCalibration = DEFAULT_CALIBRATION,
+        mount: Optional[int] = None,
+    ):
+        self.joint_limits = joint_limits
+        self.safety_limits = safety_limits
+        self.mount = mount
+        self.kinematics = SO101Kinematics(calibration, arm_mount(mount)) if mount is not None else None
+
+    def check(self, trajectory: Trajectory, rest: Optional[Dict[str, int]] = None) -> SafetyReport:
+        """
+        Validate a trajectory.
+
+        Args:
+            trajectory: Raw-unit Trajectory
+            rest: Positions of joints the trajectory doesn't move, for the
+                body check (missing joints are taken at mid-range)
+        """
+        start = time.perf_counter()
+        report = SafetyReport(self._joint_checks(trajectory))
+        if self.kinematics is not None and len(trajectory):
+            report.violations += self._body_check(self.link_samples(trajectory, rest))
+        report.elapsed_us = (time.perf_counter() - start) * 1e6
+        return report
+
+    def check_pair(
+        self,
+        trajectory: Trajectory,
+        other: "TrajectoryValidator",
+        other_trajectory: Trajectory,
+        rest: Optional[Dict[str, int]] = None,
+        other_rest: Optional[Dict[str, int]] = None,
+    ) -> SafetyReport:
+        """
+        Validate two arms' trajectories streamed on one clock: each on its
+        own, plus the distance between the arms at every waypoint. The
+        shorter trajectory holds its last waypoint.
+        """
+        start = time.perf_counter()
+        violations = self._joint_checks(trajectory) + other._joint_checks(other_trajectory)
+        if self.kinematics is not None and other.kinematics is not None and len(trajectory) and len(other_trajectory):
+            mine = self.link_samples(trajectory, rest)
+            theirs = other.link_samples(other_trajectory, other_rest)
+            violations += self._body_check(mine) + other._body_check(theirs)
+            violations += _clearance_check(mine, theirs)
+        return SafetyReport(violations, (time.perf_counter() - start) * 1e6)
+
+    # ---- Joint space ----
+
+    def _joint_checks(self, trajectory: Trajectory) -> List[SafetyViolation]:
+        violations = []
+        positions = trajectory.positions
+        joints = trajectory.joints
+        if not len(positions):
+            return violations
+
+        lo = np.array([self.joint_limits.get(j, (0, 4095))[0] for j in joints])
+        hi = np.array([self.joint_limits.get(j, (0, 4095))[1] for j in joints])
+        # An arm resting outside its limits (waypoint 0 is its present pose)
+        # may move back in, but never further out than it started
+        excess = np.maximum(np.maximum(lo - positions, positions - hi), 0)
+        outside = excess > excess[0]
+        if outside.any():
+            row, col = np.argwhere(outside)[0]
+            violations.append(SafetyViolation(
+                "limits", int(row),
+                f"{joints[col]} at {positions[row, col]} outside {lo[col]}-{hi[col]}",
+            ))
+
+        dt = trajectory.dt
+        if len(positions) < 2 or dt <= 0:
+            return violations
+        v_max = np.array([self._limit(j).velocity for j in joints])
+        a_max = np.array([self._limit(j).acceleration for j in joints])
+
+        # One unit of rounding per waypoint is allowed on top of the limit
+        velocity = np.diff(positions, axis=0) / dt
+        over = np.abs(velocity) > v_max + 1.0 / dt
+        if over.any():
+            row, col = np.argwhere(over)[0]
+            violations.append(SafetyViolation(
+                "velocity", int(row) + 1,
+                f"{joints[col]} at {abs(velocity[row, col]):.0f} units/s (limit {v_max[col]:.0f})",
+            ))
+
+        window = max(int(math.ceil(ACCEL_WINDOW / dt)), 1)
+        if len(velocity) > window:
+            span = window * dt
+            acceleration = (velocity[window:] - velocity[:-window]) / span
+            over = np.abs(acceleration) > a_max + 2.0 / (dt * span)
+            if over.any():
+                row, col = np.argwhere(over)[0]
+                violations.append(SafetyViolation(
+                    "acceleration", int(row) + 1,
+                    f"{joints[col]} at {abs(acceleration[row, col]):.0f} units/s² (limit {a_max[col]:.0f})",
+                ))
+        return violations
+
+    def _limit(self, joint: str) -> MotionLimits:
+        return self.safety_limits.get(joint, MotionLimits(math.inf, math.inf, math.inf))
+
+    # ---- Collisions ----
+
+    def link_samples(self, trajectory: Trajectory, rest: Optional[Dict[str, int]] = None) -> np.ndarray:
+        """
+        World-frame points along the arm's links at every waypoint.
+
+        Returns:
+            (3 x waypoints x links x LINK_SAMPLES), links from the shoulder
+            pan joint outward. Coordinates come first so every collision
+            test runs on contiguous rows.
+        """
+        values = joint_array(trajectory)
+        if rest:
+            for col, joint in enumerate(JOINTS):
+                if joint in rest and joint not in trajectory.joints:
+                    values[:, col] = rest[joint]
+        points = np.ascontiguousarray(self.kinematics.link_points(values, UNITS_RAW)[:, 1:].transpose(2, 0, 1))
+        start, end = points[:, :, :-1, None], points[:, :, 1:, None]
+        return start + _FRACTIONS * (end - start)
+
+    def _body_check(self, samples: np.ndarray) -> List[SafetyViolation]:
+        # The first link is fixed to the mount; check from the upper arm on
+        steps = samples.shape[1]
+        points = samples[:, :, 1:].reshape(3, 1, -1)
+        inside = (points > _BOX_LO[:, :, None]) & (points < _BOX_HI[:, :, None])
+        inside = (inside[0] & inside[1] & inside[2]).reshape(len(_BOX_NAMES), steps, -1).any(axis=2)
+        violations = []
+        for box in np.flatnonzero(inside.any(axis=1)):
+            row = int(np.argmax(inside[box]))
+            violations.append(SafetyViolation(
+                "body", row, f"arm within {LINK_RADIUS * 1000:.0f}mm of the {_BOX_NAMES[box]}",
+            ))
+        return violations
+
+def _clearance_check(samples: np.ndarray, other: np.ndarray) -> List[SafetyViolation]:
+    """Closest approach between two arms' link samples at each waypoint"""
+    steps = max(samples.shape[1], other.shape[1])
+    a = samples[:, np.minimum(np.arange(steps), samples.shape[1] - 1)].reshape(3, steps, -1)
+    b = other[:, np.minimum(np.arange(steps), other.shape[1] - 1)].reshape(3, steps, -1)
+
+    # Broad phase: only waypoints where the arms' bounding boxes come
+    # within the clearance need the pairwise distances
+    gap = np.maximum(a.min(axis=2) - b.max(axis=2), b.min(axis=2) - a.max(axis=2)).max(axis=0)
+    near = np.flatnonzero(gap < ARM_CLEARANCE)
+    if not len(near):
+        return []
+    difference = a[:, near, :, None] - b[:, near, None, :]
+    squared = (difference * difference).sum(axis=0)
+    closest = np.sqrt(squared.reshape(len(near), -1).min(axis=1))
+    too_close = closest < ARM_CLEARANCE
+    if not too_close.any():
+        return []
+    first = int(np.argmax(too_close))
+    row, closest = int(near[first]), closest[first]
+    return [SafetyViolation(
+        "arms", row, f"arms {closest * 1000:.0f}mm apart (minimum {ARM_CLEARANCE * 1000:.0f}mm)",
+    )]
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Deadline Scheduling for SO-101 Control Loops
+Runs periodic work against absolute monotonic deadlines and records timing.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Optional
+
+# Default control loop rate for trajectories (Hz)
+CONTROL_RATE_HZ = 50
+
+# Sleep until this close to a deadline, then spin for the rest (seconds)
+SPIN_MARGIN = 0.0005
+
+def percentile_us(values: List[float], pct: float) -> float:
+    """Percentile of a list of seconds, in microseconds (nearest rank)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[idx] * 1e6
+
+@dataclass
+class TickStats:
+    """Timing record for one scheduled run"""
+    period: float                 # Target tick period (seconds)
+    ticks: int = 0                # Ticks actually executed
+    skipped: int = 0              # Late ticks merged into a later tick
+    overruns: int = 0             # Ticks whose work ran past the next deadline
+    jitter: List[float] = field(default_factory=list)  # Start - deadline per tick (s)
+    elapsed: float = 0.0          # Wall time from first deadline to last tick end
+
+    @property
+    def achieved_hz(self) -> float:
+        """Executed tick intervals per second over the whole run"""
+        if self.elapsed <= 0 or self.ticks < 2:
+            return 0.0
+        return (self.ticks - 1) / self.elapsed
+
+    @property
+    def mean_jitter_us(self) -> float:
+        if not self.jitter:
+            return 0.0
+        return sum(self.jitter) / len(self.jitter) * 1e6
+
+    @property
+    def max_jitter_us(self) -> float:
+        if not self.jitter:
+            return 0.0
+        return max(self.jitter) * 1e6
+
+    def percentile_jitter_us(self, pct: float) -> float:
+        """Jitter percentile in microseconds (nearest rank)"""
+        return percentile_us(self.jitter, pct)
+
+    def summary(self) -> str:
+        return (
+            f"{self.ticks} ticks in {self.elapsed:.3f}s "
+            f"({self.achieved_hz:.1f} Hz, target {1 / self.period:.1f} Hz), "
+            f"jitter mean {self.mean_jitter_us:.0f}us "
+            f"p99 {self.percentile_jitter_us(99):.0f}us "
+            f"max {self.max_jitter_us:.0f}us, "
+            f"{self.overruns} overruns, {self.skipped} skipped"
+        )
+
+SKEW_BUS = "bus"
+SKEW_QUEUE = "queue hand-off"
+
+@dataclass
+class DualTickStats(TickStats):
+    """TickStats plus per-tick inter-arm skew for coordinated runs"""
+    skew: List[float] = field(default_factory=list)  # Follower - leader write completion (s)
+    # What a "write" is: SKEW_BUS when the ticks write the buses, SKEW_QUEUE
+    # when they only hand setpoints to worker processes
+    skew_basis: str = SKEW_BUS
+
+    @property
+    def mean_skew_us(self) -> float:
+        if not self.skew:
+            return 0.0
+        return sum(abs(s) for s in self.skew) / len(self.skew) * 1e6
+
+    @property
+    def max_skew_us(self) -> float:
+        if not self.skew:
+            return 0.0
+        return max(abs(s) for s in self.skew) * 1e6
+
+    def summary(self) -> str:
+        return (
+            f"{super().summary()}, skew ({self.skew_basis}) mean {self.mean_skew_us:.0f}us "
+            f"p99 {percentile_us([abs(s) for s in self.skew], 99):.0f}us "
+            f"max {self.max_skew_us:.0f}us"
+        )
+
+class DeadlineScheduler:
+    """
+    Periodic executor driven by absolute deadlines.
+
+    Tick i is due at start + i * period, so time spent doing the work
+    (bus writes, logging) never accumulates as drift. When the loop falls
+    more than a whole period behind, the overdue ticks are merged: only the
+    most recent due tick runs, and the final tick always runs.
+    """
+
+    def __init__(self, period: float, skip_late: bool = True, spin_margin: float = SPIN_MARGIN):
+        if period <= 0:
+            raise ValueError(f"Period must be positive, got {period}")
+        self.period = period
+        self.skip_late = skip_late
+        self.spin_margin = spin_margin
+
+    def wait_until(self, deadline: float, stop: Optional[threading.Event] = None):
+        """Block until perf_counter() reaches deadline (or stop is set)"""
+        remaining = deadline - time.perf_counter()
+        if remaining > self.spin_margin:
+            if stop is not None:
+                stop.wait(remaining - self.spin_margin)
+            else:
+                time.sleep(remaining - self.spin_margin)
+        while time.perf_counter() < deadline:
+            if stop is not None and stop.is_set():
+                return
+
+    def run(
+        self,
+        num_ticks: int,
+        tick: Callable[[int], None],
+        stop: Optional[threading.Event] = None,
+        stats: Optional[TickStats] = None,
+    ) -> TickStats:
+        """
+        Call tick(i) for i in range(num_ticks), each at its deadline.
+
+        Args:
+            num_ticks: Number of ticks in the run
+            tick: Work for one tick, given the tick index
+            stop: Optional event that ends the run early when set
+            stats: Optional stats record to fill (e.g. a DualTickStats the
+                   tick function also writes to)
+
+        Returns:
+            TickStats with per-tick jitter, overruns and achieved rate
+        """
+        stats = stats if stats is not None else TickStats(period=self.period)
+        period = self.period
+        start = time.perf_counter()
+
+        i = 0
+        while i < num_ticks:
+            deadline = start + i * period
+            self.wait_until(deadline, stop)
+            if stop is not None and stop.is_set():
+                break
+            now = time.perf_counter()
+            i, deadline = self._catch_up(stats, start, now, i, num_ticks)
+
+            stats.jitter.append(now - deadline)
+            tick(i)
+            stats.ticks += 1
+
+            if time.perf_counter() > deadline + period:
+                stats.overruns += 1
+            i += 1
+
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    async def run_async(
+        self,
+        num_ticks: int,
+        tick: Callable[[int], Awaitable[None]],
+    ) -> TickStats:
+        """
+        Awaitable version of run() for asyncio callers.
+
+        Waits with asyncio.sleep instead of spinning, so other tasks on the
+        loop keep running between ticks. Cancel the awaiting task to stop
+        early; the stats so far are discarded with the cancellation.
+        """
+        stats = TickStats(period=self.period)
+        period = self.period
+        start = time.perf_counter()
+
+        i = 0
+        while i < num_ticks:
+            deadline = start + i * period
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            now = time.perf_counter()
+            i, deadline = self._catch_up(stats, start, now, i, num_ticks)
+
+            stats.jitter.append(now - deadline)
+            await tick(i)
+            stats.ticks += 1
+
+            if time.perf_counter() > deadline + period:
+                stats.overruns += 1
+            i += 1
+
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    def _catch_up(self, stats: TickStats, start: float, now: float, i: int, num_ticks: int):
+        """Jump to the latest tick that is already due (never past the end)"""
+        if self.skip_late:
+            due = min(int((now - start) / self.period), num_ticks - 1)
+            if due > i:
+                stats.skipped += due - i
+                i = due
+        return i, start + i * self.period
@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+"""
+Simulated Feetech Servo Bus for SO-101 Arms
+-------------------------------------------
+A stand-in for scservo_sdk so the arm code can run without hardware.
+Models the STS control table registers motion.py uses, first-order
+position dynamics per joint, baud-rate-accurate packet timing plus USB
+turnaround latency, and injectable communication errors.
+
+Usage:
+    python3 sim_bus.py diagnose_arms.py          # Run a script on the simulator
+    python3 sim_bus.py careful_grab.py status
+    python3 sim_bus.py --latency=0.002 --error-rate=0.01 motion_script.py
+
+From code (before anything imports motion):
+    import sim_bus
+    sim_bus.install(latency=0.001)
+    from motion import SmoothMotion
+    arm = SmoothMotion("/dev/cu.usbmodem5AAF2638141")
+    sim_bus.get_bus(arm.port).servos[6].block_at(1800)   # Something in the gripper
+"""
+
+import math
+import os
+import random
+import runpy
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+# ==================== SDK CONSTANTS ====================
+# Same values as scservo_sdk so callers can't tell the difference.
+
+BROADCAST_ID = 0xFE
+COMM_SUCCESS = 0
+COMM_PORT_BUSY = -1
+COMM_TX_FAIL = -2
+COMM_RX_FAIL = -3
+COMM_TX_ERROR = -4
+COMM_RX_WAITING = -5
+COMM_RX_TIMEOUT = -6
+COMM_RX_CORRUPT = -7
+COMM_NOT_AVAILABLE = -9
+
+def SCS_LOBYTE(w):
+    return w & 0xFF
+
+def SCS_HIBYTE(w):
+    return (w >> 8) & 0xFF
+
+def SCS_MAKEWORD(a, b):
+    return (a & 0xFF) | ((b & 0xFF) << 8)
+
+def SCS_TOHOST(a, b):
+    return -(a & ~(1 << b)) if a & (1 << b) else a
+
+def SCS_TOSCS(a, b):
+    return (-a | (1 << b)) if a < 0 else a
+
+# ==================== CONTROL TABLE ====================
+
+ADDR_MODEL_NUMBER = 3
+ADDR_ID = 5
+ADDR_TORQUE_ENABLE = 40
+ADDR_GOAL_POSITION = 42
+ADDR_MOVING_SPEED = 46
+ADDR_PRESENT_POSITION = 56
+ADDR_PRESENT_SPEED = 58
+ADDR_PRESENT_LOAD = 60
+ADDR_PRESENT_VOLTAGE = 62
+ADDR_PRESENT_TEMPERATURE = 63
+ADDR_MOVING = 66
+
+STS3215_MODEL = 777
+
+# Servo dynamics
+SERVO_TIME_CONSTANT = 0.05   # First-order response (seconds)
+SERVO_MAX_SPEED = 3000       # Units/s at speed register 0 (~265°/s)
+MOVING_THRESHOLD = 2.0       # |error| above this reports moving
+LOAD_GAIN = 2.0              # Load units per unit of position error when blocked
+
+# Bus timing defaults
+DEFAULT_LATENCY = 0.001      # USB-serial turnaround per round trip (seconds)
+DEFAULT_RX_TIMEOUT = 0.034   # SDK packet timeout when a reply never comes
+BITS_PER_BYTE = 10           # 8N1
+SLEEP_MARGIN = 0.0005        # Busy-wait the last 0.5ms of a transaction
+
+class SimServo:
+    """
+    One simulated STS servo.
+
+    Position follows the goal as a first-order system whose speed is
+    capped by the moving speed register (0 = SERVO_MAX_SPEED). State is
+    advanced lazily from the wall clock whenever the registers are read.
+    """
+
+    def __init__(self, servo_id: int, position: int = 2048):
+        self.id = servo_id
+        self.registers = bytearray(256)
+        self.registers[ADDR_MODEL_NUMBER] = SCS_LOBYTE(STS3215_MODEL)
+        self.registers[ADDR_MODEL_NUMBER + 1] = SCS_HIBYTE(STS3215_MODEL)
+        self.registers[ADDR_ID] = servo_id
+        self.registers[ADDR_PRESENT_VOLTAGE] = 120
+        self.registers[ADDR_PRESENT_TEMPERATURE] = 30
+        self.position = float(position)
+        self.velocity = 0.0
+        self.block: Optional[float] = None
+        self._free_side: Optional[float] = None
+        self._set_word(ADDR_GOAL_POSITION, position)
+        self._updated = time.perf_counter()
+        self._publish()
+
+    def _word(self, addr: int) -> int:
+        return SCS_MAKEWORD(self.registers[addr], self.registers[addr + 1])
+
+    def _set_word(self, addr: int, value: int):
+        self.registers[addr] = SCS_LOBYTE(value)
+        self.registers[addr + 1] = SCS_HIBYTE(value)
+
+    @property
+    def torque(self) -> bool:
+        return bool(self.registers[ADDR_TORQUE_ENABLE])
+
+    @property
+    def goal(self) -> int:
+        return self._word(ADDR_GOAL_POSITION)
+
+    def block_at(self, position: Optional[float]):
+        """Put an obstacle at position (None removes it); the joint can't pass it"""
+        self.block = position
+        self._free_side: Optional[float] = None
+
+    def move_by_hand(self, position: float):
+        """Back-drive the joint (only sticks with torque off, like the real arm)"""
+        self.advance()
+        if not self.torque:
+            self.position = float(position)
+            self._publish()
+
+
+    def advance(self):
+        """Integrate the dynamics up to now"""
+        now = time.perf_counter()
+        dt = now - self._updated
+        self._updated = now
+        if not self.torque:
+            self.velocity = 0.0
+            self._publish()
+            return
+
+        speed = self._word(ADDR_MOVING_SPEED) or SERVO_MAX_SPEED
+        goal = float(self.goal)
+        error = abs(goal - self.position)
+        direction = 1.0 if goal >= self.position else -1.0
+        previous = self.position
+
+        # Speed-capped until the first-order response is slower than the cap
+        knee = speed * SERVO_TIME_CONSTANT
+        if error > knee:
+            run = min(dt, (error - knee) / speed)
+            error -= speed * run
+            dt -= run
+        error *= math.exp(-dt / SERVO_TIME_CONSTANT)
+        self.position = goal - direction * error
+        self.velocity = direction * min(speed, error / SERVO_TIME_CONSTANT)
+
+        # An obstacle stops the joint from whichever side it approached;
+        # the joint can always back away to that side
+        if self.block is not None:
+            if previous != self.block:
+                self._free_side = 1.0 if previous > self.block else -1.0
+            elif self._free_side is None:
+                self._free_side = direction
+            if (self.position - self.block) * self._free_side < 0:
+                self.position = float(self.block)
+                self.velocity = 0.0
+        self._publish()
+
+    @property
+    def blocked(self) -> bool:
+        return (
+            self.torque and self.block is not None
+            and self.position == self.block
+            and (self.goal - self.block) * (self._free_side or 0.0) < -MOVING_THRESHOLD
+        )
+
+    def _publish(self):
+        """Refresh the present-state registers from the model"""
+        self._set_word(ADDR_PRESENT_POSITION, int(round(min(max(self.position, 0), 4095))))
+        self._set_word(ADDR_PRESENT_SPEED, SCS_TOSCS(int(round(self.velocity)), 15))
+
+        if self.blocked:
+            # Pushing against the obstacle: load builds with the position error
+            load = LOAD_GAIN * (self.goal - self.position)
+            moving = 0
+        else:
+            load = self.velocity / 10
+            moving = int(self.torque and abs(self.goal - self.position) > MOVING_THRESHOLD)
+        load = int(round(max(-1000, min(1000, load))))
+        self._set_word(ADDR_PRESENT_LOAD, SCS_TOSCS(load, 10))
+        self.registers[ADDR_MOVING] = moving
+
+    def read(self, addr: int, length: int) -> List[int]:
+        self.advance()
+        return list(self.registers[addr:addr + length])
+
+    def write(self, addr: int, data: List[int]):
+        # Settle the old goal's motion before the new registers take effect
+        self.advance()
+        self.registers[addr:addr + len(data)] = bytes(data)
+        # STS servos switch torque on when given a goal position
+        if addr <= ADDR_GOAL_POSITION < addr + len(data) and addr != ADDR_TORQUE_ENABLE:
+            self.registers[ADDR_TORQUE_ENABLE] = 1
+        self._publish()
+
+class SimBus:
+    """
+    One simulated serial bus (one arm): servos plus wire timing.
+
+    Every transaction costs its bytes on the wire at the configured baud
+    rate (10 bits/byte), plus one USB turnaround latency when the host
+    waits for a reply. With realtime=True the caller actually blocks for
+    that long, so loop timing behaves like the real arm; otherwise the
+    time is only added to busy_time.
+
+    Errors:
+        error_rate: Probability that any status packet is lost
+        offline: Servo IDs that never answer
+    A lost reply costs rx_timeout, like the SDK's packet timeout.
+    """
+
+    def __init__(
+        self,
+        servo_ids=range(1, 7),
+        latency: float = DEFAULT_LATENCY,
+        error_rate: float = 0.0,
+        rx_timeout: float = DEFAULT_RX_TIMEOUT,
+        realtime: bool = True,
+        seed: Optional[int] = None,
+    ):
+        self.servos: Dict[int, SimServo] = {i: SimServo(i) for i in servo_ids}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rx_timeout = rx_timeout
+        self.realtime = realtime
+        self.offline = set()
+        self.baudrate = 1000000
+        self.present = True  # False = unplugged, openPort fails
+        self.lock = threading.Lock()
+        self._random = random.Random(seed)
+
+        # Counters
+        self.packets = 0
+        self.bytes = 0
+        self.errors = 0
+        self.busy_time = 0.0
+
+    def _wire(self, num_bytes: int, round_trip: bool = False) -> float:
+        seconds = num_bytes * BITS_PER_BYTE / self.baudrate
+        return seconds + (self.latency if round_trip else 0.0)
+
+    def _spend(self, seconds: float):
+        self.busy_time += seconds
+        if self.realtime and seconds > 0:
+            # Sleep most of it, spin the rest: packet times are tens of microseconds
+            deadline = time.perf_counter() + seconds
+            if seconds > SLEEP_MARGIN:
+                time.sleep(seconds - SLEEP_MARGIN)
+            while time.perf_counter() < deadline:
+                pass
+
+    def _answers(self, servo_id: int) -> bool:
+        if servo_id not in self.servos or servo_id in self.offline:
+            return False
+        return not (self.error_rate and self._random.random() < self.error_rate)
+
+    def transmit(self, num_params: int):
+        """Instruction packet with no reply expected (sync write, TxOnly)"""
+        self.packets += 1
+        self.bytes += 6 + num_params
+        self._spend(self._wire(6 + num_params))
+
+    def reply(self, servo_id: int, data_length: int, round_trip: bool) -> bool:
+        """Status packet from servo_id; False (after the timeout) if it never comes"""
+        if not self._answers(servo_id):
+            self.errors += 1
+            self._spend(self.rx_timeout)
+            return False
+        self.bytes += 6 + data_length
+        self._spend(self._wire(6 + data_length, round_trip))
+        return True
+
+    def read(self, servo_id: int, addr: int, length: int) -> Optional[List[int]]:
+        """READ instruction + status packet"""
+        with self.lock:
+            self.transmit(2)
+            if not self.reply(servo_id, length, round_trip=True):
+                return None
+            return self.servos[servo_id].read(addr, length)
+
+    def write(self, servo_id: int, addr: int, data: List[int], want_reply: bool = True) -> bool:
+        """WRITE instruction; the servo applies it even if its reply is lost"""
+        with self.lock:
+            self.transmit(1 + len(data))
+            if servo_id in self.servos and servo_id not in self.offline:
+                self.servos[servo_id].write(addr, data)
+            elif servo_id == BROADCAST_ID:
+                for servo in self.servos.values():
+                    servo.write(addr, data)
+                return True
+            return self.reply(servo_id, 0, round_trip=True) if want_reply else True
+
+    def sync_write(self, addr: int, length: int, data: Dict[int, List[int]]):
+        """SYNC WRITE broadcast; never answered"""
+        with self.lock:
+            self.transmit(2 + len(data) * (1 + length))
+            for servo_id, values in data.items():
+                if servo_id in self.servos and servo_id not in self.offline:
+                    self.servos[servo_id].write(addr, values)
+
+    def sync_read(self, addr: int, length: int, servo_ids: List[int]) -> Dict[int, Optional[List[int]]]:
+        """SYNC READ: one instruction, one status packet per servo in order"""
+        results = {}
+        with self.lock:
+            self.transmit(2 + len(servo_ids))
+            for n, servo_id in enumerate(servo_ids):
+                # Only the first reply waits out the USB turnaround
+                if self.reply(servo_id, length, round_trip=(n == 0)):
+                    results[servo_id] = self.servos[servo_id].read(addr, length)
+                else:
+                    results[servo_id] = None
+        return results
+
+# ==================== BUS REGISTRY ====================
+
+_buses: Dict[str, SimBus] = {}
+_bus_defaults: Dict = {}
+
+def get_bus(port_name: str) -> SimBus:
+    """The simulated bus behind port_name (created on first use)"""
+    if port_name not in _buses:
+        _buses[port_name] = SimBus(**_bus_defaults)
+    return _buses[port_name]
+
+def bus_defaults() -> Dict:
+    """Settings passed to install(), e.g. to replay them in a worker process"""
+    return dict(_bus_defaults)
+
+def reset():
+    """Forget every simulated bus (servos go back to their start pose)"""
+    _buses.clear()
+
+# ==================== SDK API ====================
+
+class PortHandler:
+    """Simulated scservo_sdk.PortHandler"""
+
+    def __init__(self, port_name: str):
+        self.port_name = port_name
+        self.is_open = False
+        self.baudrate = 1000000
+        self.bus = get_bus(port_name)
+
+    def openPort(self) -> bool:
+        self.is_open = self.bus.present
+        return self.is_open
+
+    def closePort(self):
+        self.is_open = False
+
+    def setBaudRate(self, baudrate: int) -> bool:
+        self.baudrate = baudrate
+        self.bus.baudrate = baudrate
+        return True
+
+    def getBaudRate(self) -> int:
+        return self.baudrate
+
+    def getPortName(self) -> str:
+        return self.port_name
+
+    def setPortName(self, port_name: str):
+        self.port_name = port_name
+        self.bus = get_bus(port_name)
+
+class PacketHandler:
+    """Simulated scservo_sdk.PacketHandler (little-endian STS protocol)"""
+
+    def __init__(self, protocol_end: int = 0):
+        self.protocol_end = protocol_end
+        self._sync_pending: Dict[int, Optional[List[int]]] = {}
+
+    def getProtocolVersion(self) -> float:
+        return 1.0
+
+    def getTxRxResult(self, result: int) -> str:
+        return _RESULT_TEXT.get(result, "")
+
+    def getRxPacketError(self, error: int) -> str:
+        return "" if not error else f"[RxPacketError] Servo error 0x{error:02x}"
+
+    # ---- Reads ----
+
+    def readTxRx(self, port: PortHandler, scs_id: int, address: int, length: int):
+        if not port.is_open:
+            return [], COMM_PORT_BUSY, 0
+        data = port.bus.read(scs_id, address, length)
+        if data is None:
+            return [], COMM_RX_TIMEOUT, 0
+        return data, COMM_SUCCESS, 0
+
+    def read1ByteTxRx(self, port, scs_id, address):
+        data, result, error = self.readTxRx(port, scs_id, address, 1)
+        return (data[0] if result == COMM_SUCCESS else 0), result, error
+
+    def read2ByteTxRx(self, port, scs_id, address):
+        data, result, error = self.readTxRx(port, scs_id, address, 2)
+        return (SCS_MAKEWORD(data[0], data[1]) if result == COMM_SUCCESS else 0), result, error
+
+    def read4ByteTxRx(self, port, scs_id, address):
+        data, result, error = self.readTxRx(port, scs_id, address, 4)
+        if result != COMM_SUCCESS:
+            return 0, result, error
+        return SCS_MAKEWORD(data[0], data[1]) | (SCS_MAKEWORD(data[2], data[3]) << 16), result, error
+
+    def ping(self, port, scs_id):
+        model, result, error = self.read2ByteTxRx(port, scs_id, ADDR_MODEL_NUMBER)
+        return model, result, error
+
+    def syncReadTx(self, port, start_address, data_length, param, param_length):
+        if not port.is_open:
+            return COMM_PORT_BUSY
+        self._sync_pending = port.bus.sync_read(start_address, data_length, list(param[:param_length]))
+        return COMM_SUCCESS
+
+    def readRx(self, port, scs_id, length):
+        data = self._sync_pending.pop(scs_id, None)
+        if data is None:
+            return [], COMM_RX_TIMEOUT, 0
+        return data[:length], COMM_SUCCESS, 0
+
+    # ---- Writes ----
+
+    def writeTxRx(self, port, scs_id, address, length, data):
+        if not port.is_open:
+            return COMM_PORT_BUSY, 0
+        ok = port.bus.write(scs_id, address, list(data[:length]))
+        return (COMM_SUCCESS if ok else COMM_RX_TIMEOUT), 0
+
+    def writeTxOnly(self, port, scs_id, address, length, data):
+        if not port.is_open:
+            return COMM_PORT_BUSY
+        port.bus.write(scs_id, address, list(data[:length]), want_reply=False)
+        return COMM_SUCCESS
+
+    def write1ByteTxRx(self, port, scs_id, address, data):
+        return self.writeTxRx(port, scs_id, address, 1, [data])
+
+    def write2ByteTxRx(self, port, scs_id, address, data):
+        return self.writeTxRx(port, scs_id, address, 2, [SCS_LOBYTE(data), SCS_HIBYTE(data)])
+
+    def write1ByteTxOnly(self, port, scs_id, address, data):
+        return self.writeTxOnly(port, scs_id, address, 1, [data])
+
+    def write2ByteTxOnly(self, port, scs_id, address, data):
+        return self.writeTxOnly(port, scs_id, address, 2, [SCS_LOBYTE(data), SCS_HIBYTE(data)])
+
+    def syncWriteTxOnly(self, port, start_address, data_length, param, param_length):
+        if not port.is_open:
+            return COMM_PORT_BUSY
+        param = list(param[:param_length])
+        stride = 1 + data_length
+        data = {param[i]: param[i + 1:i + stride] for i in range(0, len(param), stride)}
+        port.bus.sync_write(start_address, data_length, data)
+        return COMM_SUCCESS
+
+_RESULT_TEXT = {
+    COMM_SUCCESS: "[TxRxResult] Communication success!",
+    COMM_PORT_BUSY: "[TxRxResult] Port is in use!",
+    COMM_TX_FAIL: "[TxRxResult] Failed transmit instruction packet!",
+    COMM_RX_FAIL: "[TxRxResult] Failed get status packet from device!",
+    COMM_RX_TIMEOUT: "[TxRxResult] There is no status packet!",
+    COMM_NOT_AVAILABLE: "[TxRxResult] Protocol does not support this function!",
+}
+
+class GroupSyncRead:
+    """Simulated scservo_sdk.GroupSyncRead (same semantics as the SDK's)"""
+
+    def __init__(self, port, ph, start_address, data_length):
+        self.port = port
+        self.ph = ph
+        self.start_address = start_address
+        self.data_length = data_length
+        self.data_dict: Dict[int, List[int]] = {}
+        self.last_result = False
+
+    def addParam(self, scs_id) -> bool:
+        if scs_id in self.data_dict:
+            return False
+        self.data_dict[scs_id] = []
+        return True
+
+    def removeParam(self, scs_id):
+        self.data_dict.pop(scs_id, None)
+
+    def clearParam(self):
+        self.data_dict.clear()
+
+    def txPacket(self) -> int:
+        if not self.data_dict:
+            return COMM_NOT_AVAILABLE
+        ids = list(self.data_dict)
+        return self.ph.syncReadTx(self.port, self.start_address, self.data_length, ids, len(ids))
+
+    def rxPacket(self) -> int:
+        self.last_result = False
+        if not self.data_dict:
+            return COMM_NOT_AVAILABLE
+        # Like the SDK: stop at the first servo that didn't answer
+        for scs_id in self.data_dict:
+            self.data_dict[scs_id], result, _ = self.ph.readRx(self.port, scs_id, self.data_length)
+            if result != COMM_SUCCESS:
+                return result
+        self.last_result = True
+        return COMM_SUCCESS
+
+    def txRxPacket(self) -> int:
+        result = self.txPacket()
+        if result != COMM_SUCCESS:
+            return result
+        return self.rxPacket()
+
+    def isAvailable(self, scs_id, address, data_length) -> bool:
+        if scs_id not in self.data_dict:
+            return False
+        if address < self.start_address or self.start_address + self.data_length - data_length < address:
+            return False
+        return len(self.data_dict[scs_id]) >= data_length
+
+    def getData(self, scs_id, address, data_length) -> int:
+        if not self.isAvailable(scs_id, address, data_length):
+            return 0
+        data = self.data_dict[scs_id][address - self.start_address:]
+        if data_length == 1:
+            return data[0]
+        if data_length == 2:
+            return SCS_MAKEWORD(data[0], data[1])
+        if data_length == 4:
+            return SCS_MAKEWORD(data[0], data[1]) | (SCS_MAKEWORD(data[2], data[3]) << 16)
+        return 0
+
+class GroupSyncWrite:
+    """Simulated scservo_sdk.GroupSyncWrite"""
+
+    def __init__(self, port, ph, start_address, data_length):
+        self.port = port
+        self.ph = ph
+        self.start_address = start_address
+        self.data_length = data_length
+        self.data_dict: Dict[int, List[int]] = {}
+
+    def addParam(self, scs_id, data) -> bool:
+        if scs_id in self.data_dict or len(data) > self.data_length:
+            return False
+        self.data_dict[scs_id] = list(data)
+        return True
+
+    def removeParam(self, scs_id):
+        self.data_dict.pop(scs_id, None)
+
+    def changeParam(self, scs_id, data) -> bool:
+        if scs_id not in self.data_dict or len(data) > self.data_length:
+            return False
+        self.data_dict[scs_id] = list(data)
+        return True
+
+    def clearParam(self):
+        self.data_dict.clear()
+
+    def txPacket(self) -> int:
+        if not self.data_dict:
+            return COMM_NOT_AVAILABLE
+        param = []
+        for scs_id, data in self.data_dict.items():
+            param.append(scs_id)
+            param.extend(data)
+        return self.ph.syncWriteTxOnly(self.port, self.start_address, self.data_length, param, len(param))
+
+# ==================== INSTALL ====================
+
+def install(**bus_defaults):
+    """
+    Make `import scservo_sdk` return this simulator.
+
+    Call before motion (or anything else importing the SDK) is imported.
+    Keyword arguments become the defaults for every SimBus created
+    afterwards (latency, error_rate, rx_timeout, realtime, seed).
+    """
+    _bus_defaults.update(bus_defaults)
+    sys.modules["scservo_sdk"] = sys.modules[__name__]
+
+def main():
+    """python3 sim_bus.py [--latency=S] [--error-rate=P] [--fast] script.py [args...]"""
+    args = sys.argv[1:]
+    options = {}
+    while args and args[0].startswith("--"):
+        arg = args.pop(0)
+        if arg.startswith("--latency="):
+            options["latency"] = float(arg.split("=")[1])
+        elif arg.startswith("--error-rate="):
+            options["error_rate"] = float(arg.split("=")[1])
+        elif arg == "--fast":
+            options["realtime"] = False
+        elif arg in ("-h", "--help"):
+            print(__doc__)
+            return
+    if not args:
+        print(__doc__)
+        return
+
+    install(**options)
+    script = os.path.abspath(args[0])
+    sys.path.insert(0, os.path.dirname(script))
+    sys.argv = [script] + args[1:]
+    print(f"🧪 Simulated servo bus ({', '.join(f'{k}={v}' for k, v in options.items()) or 'defaults'})")
+    runpy.run_path(script, run_name="__main__")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Compact Arm State for SO-101 Robot Arms
+Array-backed state samples and a preallocated history buffer, so logging
+at 100+ Hz doesn't allocate dicts per sample.
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+# Joint order used for every state array (index = servo ID - 1)
+JOINTS = ["shoulder_pan", "shoulder_lift", "elbow_flex", "wrist_flex", "wrist_roll", "gripper"]
+JOINT_INDEX = {name: i for i, name in enumerate(JOINTS)}
+
+# Rows of ArmState.data
+ROW_POSITION = 0
+ROW_VELOCITY = 1
+ROW_LOAD = 2
+
+class ArmState:
+    """
+    One sample of all joints.
+
+    Values live in a (3 x joints) int16 array (positions, velocities,
+    loads, in JOINTS order) with a matching validity mask for joints that
+    didn't answer. positions/velocities/loads build the familiar
+    {joint: value} dicts on demand; the *_array properties are views.
+    """
+
+    __slots__ = ("data", "valid", "timestamp", "transactions", "read_us")
+
+    def __init__(
+        self,
+        positions: Optional[Dict[str, int]] = None,
+        velocities: Optional[Dict[str, int]] = None,
+        loads: Optional[Dict[str, int]] = None,
+        timestamp: float = 0.0,
+        transactions: int = 0,  # Bus round trips used to read this state
+        read_us: float = 0.0,   # Time spent on the bus (microseconds)
+    ):
+        self.data = np.zeros((3, len(JOINTS)), dtype=np.int16)
+        self.valid = np.zeros((3, len(JOINTS)), dtype=bool)
+        self.timestamp = timestamp
+        self.transactions = transactions
+        self.read_us = read_us
+        for row, values in enumerate((positions, velocities, loads)):
+            for joint, value in (values or {}).items():
+                self.set(row, joint, value)
+
+    def set(self, row: int, joint: str, value: int):
+        i = JOINT_INDEX[joint]
+        self.data[row, i] = value
+        self.valid[row, i] = True
+
+    def _as_dict(self, row: int) -> Dict[str, int]:
+        values = self.data[row].tolist()
+        return {j: values[i] for i, j in enumerate(JOINTS) if self.valid[row, i]}
+
+    @property
+    def positions(self) -> Dict[str, int]:
+        """Raw servo positions (0-4095) of joints that answered"""
+        return self._as_dict(ROW_POSITION)
+
+    @property
+    def velocities(self) -> Dict[str, int]:
+        return self._as_dict(ROW_VELOCITY)
+
+    @property
+    def loads(self) -> Dict[str, int]:
+        return self._as_dict(ROW_LOAD)
+
+    @property
+    def position_array(self) -> np.ndarray:
+        return self.data[ROW_POSITION]
+
+    @property
+    def velocity_array(self) -> np.ndarray:
+        return self.data[ROW_VELOCITY]
+
+    @property
+    def load_array(self) -> np.ndarray:
+        return self.data[ROW_LOAD]
+
+    def __repr__(self) -> str:
+        return (
+            f"ArmState(positions={self.positions}, velocities={self.velocities}, "
+            f"loads={self.loads}, timestamp={self.timestamp}, "
+            f"transactions={self.transactions}, read_us={self.read_us})"
+        )
+
+class StateWindow(NamedTuple):
+    """Samples over a time window as (samples x joints) arrays, oldest first"""
+    times: np.ndarray       # float64 timestamps
+    positions: np.ndarray   # float32, NaN where a joint didn't answer
+    velocities: np.ndarray
+    loads: np.ndarray
+
+class StateHistory:
+    """
+    Preallocated circular buffer of ArmState samples.
+
+    All samples are copied into fixed arrays, (capacity x 3 x joints)
+    float32 plus a float64 timestamp column, so appending allocates
+    nothing. Single writer, many readers: the writer fills a slot before
+    publishing the new count, so readers never need a lock.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"Capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.values = np.full((capacity, 3, len(JOINTS)), np.nan, dtype=np.float32)
+        self.transactions = np.zeros(capacity, dtype=np.int32)
+        self.read_us = np.zeros(capacity, dtype=np.float32)
+        self._count = 0  # Total samples ever written
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def append(self, state: ArmState):
+        slot = self._count % self.capacity
+        values = self.values[slot]
+        values[...] = state.data
+        values[~state.valid] = np.nan
+        self.times[slot] = state.timestamp
+        self.transactions[slot] = state.transactions
+        self.read_us[slot] = state.read_us
+        self._count += 1
+
+    def _state(self, slot: int) -> ArmState:
+        state = ArmState(
+            timestamp=float(self.times[slot]),
+            transactions=int(self.transactions[slot]),
+            read_us=float(self.read_us[slot]),
+        )
+        values = self.values[slot]
+        state.valid = ~np.isnan(values)
+        state.data = np.where(state.valid, values, 0).astype(np.int16)
+        return state
+
+    def _slots(self, n: int) -> np.ndarray:
+        """Slot indices of the n most recent samples, oldest first"""
+        count = self._count
+        n = min(n, count, self.capacity)
+        return np.arange(count - n, count) % self.capacity
+
+    def latest(self) -> Optional[ArmState]:
+        """Most recent sample, or None if empty"""
+        if self._count == 0:
+            return None
+        return self._state((self._count - 1) % self.capacity)
+
+    def last(self, n: int) -> List[ArmState]:
+        """Up to n most recent samples, oldest first"""
+        return [self._state(slot) for slot in self._slots(n)]
+
+    def since(self, timestamp: float) -> List[ArmState]:
+        """Samples with timestamp >= the given time, oldest first"""
+        slots = self._slots(self.capacity)
+        return [self._state(slot) for slot in slots[self.times[slots] >= timestamp]]
+
+    def window_since(self, timestamp: float) -> StateWindow:
+        """Vectorized samples with timestamp >= the given time"""
+        slots = self._slots(self.capacity)
+        slots = slots[self.times[slots] >= timestamp]
+        values = self.values[slots]
+        return StateWindow(
+            self.times[slots],
+            values[:, ROW_POSITION],
+            values[:, ROW_VELOCITY],
+            values[:, ROW_LOAD],
+        )
+
+    def nbytes(self) -> int:
+        """Memory held by the buffer"""
+        return self.times.nbytes + self.values.nbytes + self.transactions.nbytes + self.read_us.nbytes
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Background Telemetry for SO-101 Robot Arms
+Polls arm state on a dedicated thread into a preallocated history buffer.
+"""
+
+import threading
+import time
+from typing import List
+
+from scheduler import DeadlineScheduler
+from state import StateHistory, StateWindow
+
+# Default polling rate (Hz) and history depth (~10 s at 100 Hz)
+TELEMETRY_RATE_HZ = 100
+TELEMETRY_CAPACITY = 1024
+
+class TelemetryPoller:
+    """
+    Samples an arm's state in the background at a fixed rate.
+
+    The poller is the only thing that reads state from the bus while it
+    runs; SmoothMotion.read_state returns the latest sample instead.
+    """
+
+    def __init__(self, arm, rate: float = TELEMETRY_RATE_HZ, capacity: int = TELEMETRY_CAPACITY):
+        self.arm = arm
+        self.rate = rate
+        self.ring = StateHistory(capacity)
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start polling; blocks until the first sample is available"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"telemetry-{self.arm.port}", daemon=True)
+        self._thread.start()
+        while self.ring.latest() is None and self.running:
+            time.sleep(0.001)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        scheduler = DeadlineScheduler(1.0 / self.rate)
+        while not self._stop.is_set():
+            # One-second batches keep the scheduler's jitter record bounded
+            scheduler.run(max(int(self.rate), 1), self._poll_once, stop=self._stop)
+
+    def _poll_once(self, _tick: int):
+        try:
+            self.ring.append(self.arm.read_bus_state())
+        except Exception:
+            self.errors += 1
+
+    def latest(self):
+        return self.ring.latest()
+
+    def history(self, window_ms: float) -> List:
+        """Samples from the last window_ms milliseconds, oldest first"""
+        return self.ring.since(time.time() - window_ms / 1000.0)
+
+    def window(self, window_ms: float) -> StateWindow:
+        """Samples from the last window_ms milliseconds as arrays, oldest first"""
+        return self.ring.window_since(time.time() - window_ms / 1000.0)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Leader -> Follower Teleoperation for SO-101 Arms
+------------------------------------------------
+Move the WHITE leader arm by hand; the RED follower copies it.
+Each tick is one sync read of the leader and one sync write to the
+follower, at 100-200 Hz. Poses are matched in LeRobot's normalized units,
+so each arm's own calibration maps them to its servo range.
+
+Usage:
+    python3 teleop.py                   # 200 Hz until Ctrl-C
+    python3 teleop.py --hz=100          # Different loop rate
+    python3 teleop.py --duration=30     # Stop after 30 seconds
+"""
+
+import sys
+import os
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from calibration import arm_calibration, arm_port
+from motion import SmoothMotion
+from scheduler import DeadlineScheduler, TickStats, percentile_us
+from state import JOINTS, ROW_POSITION
+
+# Default teleop loop rate (Hz)
+TELEOP_RATE_HZ = 200
+
+@dataclass
+class TeleopStats(TickStats):
+    """TickStats plus leader-sample -> follower-command latency per tick"""
+    latency: List[float] = field(default_factory=list)  # Seconds
+    missed_reads: int = 0  # Ticks where the leader read returned no joints
+
+    @property
+    def mean_latency_us(self) -> float:
+        if not self.latency:
+            return 0.0
+        return sum(self.latency) / len(self.latency) * 1e6
+
+    def summary(self) -> str:
+        return (
+            f"{super().summary()}, latency mean {self.mean_latency_us:.0f}us "
+            f"p99 {percentile_us(self.latency, 99):.0f}us "
+            f"max {max(self.latency, default=0.0) * 1e6:.0f}us, "
+            f"{self.missed_reads} missed reads"
+        )
+
+class Teleoperator:
+    """
+    Streams the leader arm's pose to the follower at a fixed rate.
+
+    Latency is measured from issuing the leader read to the follower's
+    goal packet leaving, so it covers the whole sample -> command path.
+
+    Leader raw positions go to normalized units through the leader's
+    calibration and back to raw through the follower's, one array call
+    each, so arms with different ranges or drive modes hold the same pose.
+    """
+
+    def __init__(self, leader: SmoothMotion, follower: SmoothMotion, rate: float = TELEOP_RATE_HZ, speed: int = 0):
+        self.leader = leader
+        self.follower = follower
+        self.rate = rate
+        self.speed = speed
+
+    def run(self, duration: Optional[float] = None, stop: Optional[threading.Event] = None) -> TeleopStats:
+        """
+        Run the teleop loop.
+
+        Args:
+            duration: Seconds to run, or None to run until stop/Ctrl-C
+            stop: Optional event that ends the loop when set
+
+        Returns:
+            TeleopStats for the session
+        """
+        period = 1.0 / self.rate
+        stats = TeleopStats(period=period)
+        num_ticks = int(duration * self.rate) + 1 if duration is not None else sys.maxsize
+
+        # Leader is moved by hand; follower holds torque and tracks it
+        self.leader.set_torque(False)
+        self.follower.set_torque(True)
+
+        leader_calibration = self.leader.calibration
+        follower_calibration = self.follower.calibration
+
+        def tick(_i):
+            sampled = time.perf_counter()
+            state = self.leader.read_bus_state()
+            valid = state.valid[ROW_POSITION]
+            if not valid.any():
+                stats.missed_reads += 1
+                return
+            normalized = leader_calibration.to_normalized(state.position_array)
+            goals = np.rint(follower_calibration.to_raw(normalized)).astype(int)
+            cols = np.flatnonzero(valid)
+            self.follower._write_goal_rows([JOINTS[i] for i in cols], goals[cols].tolist(), self.speed)
+            stats.latency.append(time.perf_counter() - sampled)
+
+        start = time.perf_counter()
+        try:
+            DeadlineScheduler(period).run(num_ticks, tick, stop=stop, stats=stats)
+        except KeyboardInterrupt:
+            pass
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+def main():
+    rate = TELEOP_RATE_HZ
+    duration = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--hz="):
+            rate = float(arg.split("=")[1])
+        elif arg.startswith("--duration="):
+            duration = float(arg.split("=")[1])
+        elif arg in ("-h", "--help"):
+            print(__doc__)
+            return
+
+    leader = SmoothMotion(arm_port("leader"), calibration=arm_calibration("leader"))
+    follower = SmoothMotion(arm_port("follower"), calibration=arm_calibration("follower"))
+    if not (leader.connect() and follower.connect()):
+        print("❌ Failed to connect to both arms")
+        return
+
+    print(f"🎮 Teleop at {rate:.0f} Hz - move the leader arm (Ctrl-C to stop)")
+    stats = Teleoperator(leader, follower, rate=rate).run(duration)
+    print(f"\n📊 {stats.summary()}")
+
+    follower.set_torque(False)
+    leader.disconnect()
+    follower.disconnect()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Array-Backed Trajectories for SO-101 Robot Arms
+Vectorized waypoint generation: one (steps x joints) array per move.
+"""
+
+from typing import Callable, Dict, Iterator, List, Sequence
+
+import numpy as np
+
+class Trajectory:
+    """
+    Joint-space trajectory stored as a contiguous (steps x joints) array.
+
+    Rows are waypoints in servo units, columns follow `joints`, and `times`
+    holds each waypoint's offset from the start in seconds. Indexing or
+    iterating yields per-waypoint dicts for code that still expects the
+    old list-of-dicts form; the executor reads `positions` directly.
+    """
+
+    __slots__ = ("positions", "joints", "times")
+
+    def __init__(self, positions: np.ndarray, joints: Sequence[str], times: np.ndarray):
+        positions = np.ascontiguousarray(positions, dtype=np.int32)
+        if positions.ndim != 2 or positions.shape[1] != len(joints):
+            raise ValueError(
+                f"Positions shape {positions.shape} doesn't match {len(joints)} joints"
+            )
+        if len(times) != len(positions):
+            raise ValueError(f"Got {len(times)} timestamps for {len(positions)} waypoints")
+        self.positions = positions
+        self.joints = list(joints)
+        self.times = np.asarray(times, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, i: int) -> Dict[str, int]:
+        return dict(zip(self.joints, self.positions[i].tolist()))
+
+    def __iter__(self) -> Iterator[Dict[str, int]]:
+        for row in self.positions.tolist():
+            yield dict(zip(self.joints, row))
+
+    @property
+    def dt(self) -> float:
+        """Spacing between waypoints (seconds)"""
+        if len(self.times) < 2:
+            return 0.0
+        return float(self.times[1] - self.times[0])
+
+    @property
+    def duration(self) -> float:
+        if len(self.times) == 0:
+            return 0.0
+        return float(self.times[-1] - self.times[0])
+
+    def column(self, joint: str) -> np.ndarray:
+        """Positions of one joint over the whole trajectory"""
+        return self.positions[:, self.joints.index(joint)]
+
+    def clipped(self, limits: Dict[str, tuple]) -> "Trajectory":
+        """Copy with every joint clamped to its (min, max) limits"""
+        lo = np.array([limits.get(j, (0, 4095))[0] for j in self.joints])
+        hi = np.array([limits.get(j, (0, 4095))[1] for j in self.joints])
+        return Trajectory(np.clip(self.positions, lo, hi), self.joints, self.times)
+
+    @classmethod
+    def from_waypoints(cls, waypoints: List[Dict[str, int]], dt: float, joints: Sequence[str]) -> "Trajectory":
+        """Build from a list of position dicts (joints missing from any waypoint are dropped)"""
+        used = [j for j in joints if all(j in w for w in waypoints)]
+        positions = np.array([[w[j] for j in used] for w in waypoints], dtype=np.int32)
+        return cls(positions.reshape(len(waypoints), len(used)), used, np.arange(len(waypoints)) * dt)
+
+# ==================== PROFILES ====================
+# Each profile maps steps -> progress s in [0, 1] for waypoints 0..steps.
+
+def linear_profile(steps: int) -> np.ndarray:
+    return np.linspace(0.0, 1.0, steps + 1)
+
+def cubic_profile(steps: int) -> np.ndarray:
+    """Cubic ease-in-out: s = 3t² - 2t³"""
+    t = np.linspace(0.0, 1.0, steps + 1)
+    return t * t * (3.0 - 2.0 * t)
+
+def trapezoidal_profile(steps: int, accel_fraction: float = 0.25) -> np.ndarray:
+    """
+    Trapezoidal velocity profile.
+    - Accelerates for first accel_fraction of motion
+    - Constant velocity in middle
+    - Decelerates for last accel_fraction of motion
+    """
+    i = np.arange(steps + 1, dtype=np.float64)
+    accel_steps = int(steps * accel_fraction)
+    cruise_steps = max(steps - 2 * accel_steps, 1)
+
+    # Constant velocity phase
+    s = accel_fraction / 2 + (i - accel_steps) / cruise_steps * (1 - accel_fraction)
+    if accel_steps > 0:
+        # Quadratic ramps at each end
+        accel = 0.5 * (i / accel_steps) ** 2 * accel_fraction
+        decel = 1.0 - 0.5 * ((steps - i) / accel_steps) ** 2 * accel_fraction
+        s = np.where(i < accel_steps, accel, s)
+        s = np.where(i > steps - accel_steps, decel, s)
+    return s
+
+PROFILES: Dict[str, Callable[[int], np.ndarray]] = {
+    "linear": linear_profile,
+    "cubic": cubic_profile,
+    "trapezoidal": trapezoidal_profile,
+}
+
+def interpolate(
+    start: Dict[str, int],
+    end: Dict[str, int],
+    progress: np.ndarray,
+    dt: float,
+    joints: Sequence[str],
+) -> Trajectory:
+    """
+    Blend start -> end along a progress curve in one vectorized step.
+
+    Only joints present in both start and end are included, in `joints`
+    order. Positions are truncated to ints as the servos expect.
+    """
+    used = [j for j in joints if j in start and j in end]
+    a = np.array([start[j] for j in used], dtype=np.float64)
+    b = np.array([end[j] for j in used], dtype=np.float64)
+    positions = a + np.multiply.outer(progress, b - a)
+    times = np.arange(len(progress)) * dt
+    return Trajectory(positions.astype(np.int32), used, times)